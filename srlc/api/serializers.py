@@ -1,8 +1,11 @@
 from datetime import datetime
 from typing import Any, Union
 
-from django.db.models import Q
+from django.db.models import Count, Prefetch, Q, Sum, prefetch_related_objects
+from django.db.models.functions import Coalesce
+from django.db.models.manager import BaseManager
 from rest_framework import serializers
+from srl.leaderboard_view import counted_seats
 from srl.models import (
     Awards,
     Categories,
@@ -18,6 +21,149 @@ from srl.models import (
 )
 
 
+def player_stats(
+    seat: str = "run_players__",
+    run: str = "",
+) -> dict[str, Coalesce | Count]:
+    """Returns the expressions behind the `stats` of `PlayerSerializer`, summed by the database.
+
+    Only the seats that earn points (see `counted_seats`) are counted.
+
+    Args:
+        seat (str): `run_players__` by default. Path to the player's seat from the queried model
+            (`player_runs__` when used to annotate a `Players` queryset).
+        run (str): Empty by default. Path to the run from the queried model (`player_runs__run__`
+            when used to annotate a `Players` queryset).
+
+    Returns:
+        dict[str, Coalesce | Count]: Main points, IL points, and number of runs.
+    """
+    counted = counted_seats(seat, run)
+
+    return {
+        "main_pts": Coalesce(
+            Sum(
+                f"{run}points",
+                filter=counted
+                & Q(**{f"{run}runtype": "main", f"{run}obsolete": False}),
+            ),
+            0,
+        ),
+        "il_pts": Coalesce(
+            Sum(
+                f"{run}points",
+                filter=counted & Q(**{f"{run}runtype": "il", f"{run}obsolete": False}),
+            ),
+            0,
+        ),
+        "total_runs": Count(f"{run}id", filter=counted),
+    }
+
+
+class RunListSerializer(serializers.ListSerializer):
+    """Serializes many runs at once from a few batched queries.
+
+    Every row the runs reference (games, categories, levels, boards, platforms, seats, and
+    variables) is prefetched once for the whole list. Embeds (world records included) are then
+    serialized once per object into maps passed to `RunSerializer` through a copy of the context,
+    so the number of queries no longer grows with the number of runs.
+    """
+
+    def to_representation(
+        self,
+        data,
+    ) -> list[dict[str, Any]]:
+        """Prefetches every related row of the runs, then serializes them from memory.
+
+        Args:
+            data (QuerySet | list): Runs being serialized.
+
+        Returns:
+            list: Serialized runs, in the same order as `data`.
+        """
+        runs = list(data.all() if isinstance(data, BaseManager) else data)
+        embed = self.context.get("embed", [])
+        # The maps are kept on a copy, so the caller's context is left untouched.
+        context = dict(self.context)
+
+        players = Players.objects.select_related("countrycode")
+        if "players" in embed:
+            players = players.prefetch_related("awards").annotate(
+                **player_stats("player_runs__", "player_runs__run__")
+            )
+
+        prefetch_related_objects(
+            runs,
+            "game",
+            "category",
+            "level",
+            "board",
+            "platform",
+            Prefetch("run_players__player", queryset=players),
+            Prefetch(
+                "runvariablevalues_set",
+                queryset=RunVariableValues.objects.select_related("variable", "value"),
+            ),
+        )
+
+        if any(item in embed for item in ["games", "game"]):
+            context["games"] = self.serialize_once(
+                GameSerializer, [run.game for run in runs]
+            )
+        if "category" in embed:
+            context["categories"] = self.serialize_once(
+                CategorySerializer, [run.category for run in runs]
+            )
+        if "level" in embed:
+            context["levels"] = self.serialize_once(
+                LevelSerializer, [run.level for run in runs]
+            )
+        if "platform" in embed:
+            context["platforms"] = self.serialize_once(
+                PlatformSerializer, [run.platform for run in runs]
+            )
+        if "players" in embed:
+            context["players"] = self.serialize_once(
+                PlayerSerializer,
+                [seat.player for run in runs for seat in run.run_players.all()],
+            )
+        if "variables" in embed:
+            pairs = [pair for run in runs for pair in run.runvariablevalues_set.all()]
+            context["variables"] = self.serialize_once(
+                VariableSerializer, [pair.variable for pair in pairs]
+            )
+            context["values"] = self.serialize_once(
+                ValueSerializer, [pair.value for pair in pairs]
+            )
+        if "record" in embed:
+            # World records that are part of the list are not read again.
+            loaded = {run.id: run for run in runs}
+            records = {run.board.wr_id for run in runs if run.board and run.board.wr_id}
+            records = [loaded[record] for record in records if record in loaded] + list(
+                Runs.objects.filter(id__in=records - loaded.keys())
+            )
+            context["records"] = {
+                record["id"]: record
+                for record in RunSerializer(records, many=True).data
+            }
+
+        child = self.child.__class__(context=context)
+
+        return [child.to_representation(run) for run in runs]
+
+    @staticmethod
+    def serialize_once(
+        serializer: type[serializers.Serializer],
+        instances: list,
+    ) -> dict[Any, dict[str, Any]]:
+        """Serializes every distinct instance once, mapped by its primary key."""
+        unique = {
+            instance.pk: instance for instance in instances if instance is not None
+        }
+
+        return {pk: serializer(instance).data for pk, instance in unique.items()}
+
+
 class RunSerializer(serializers.ModelSerializer):
     """Serializer for run metadata.
 
@@ -50,15 +196,31 @@ class RunSerializer(serializers.ModelSerializer):
     videos = serializers.SerializerMethodField()
     meta = serializers.SerializerMethodField()
 
+    def embedded(
+        self,
+        name: str,
+        serializer: type[serializers.Serializer],
+        instance,
+    ) -> Union[dict[str, Any], None]:
+        """Returns an embedded object from the maps of `RunListSerializer`, or serializes it."""
+        if instance is None:
+            return None
+
+        batch = self.context.get(name, {})
+        if instance.pk in batch:
+            return batch[instance.pk]
+
+        return serializer(instance).data
+
     def get_game(
         self,
         obj: Runs,
     ) -> Union[str, int, dict[str, Any]]:
         """Serializes game information, to include optional embeds."""
         if any(item in self.context.get("embed", []) for item in ["games", "game"]):
-            return GameSerializer(Games.objects.get(id=obj.game.id)).data
+            return self.embedded("games", GameSerializer, obj.game)
         else:
-            return obj.game.id
+            return obj.game_id
 
     def get_category(
         self,
@@ -66,9 +228,9 @@ class RunSerializer(serializers.ModelSerializer):
     ) -> Union[str, int, dict[str, Any]]:
         """Serializes category information, to include optional embeds."""
         if "category" in self.context.get("embed", []):
-            return CategorySerializer(Categories.objects.get(id=obj.category.id)).data
+            return self.embedded("categories", CategorySerializer, obj.category)
         else:
-            return obj.category.id
+            return obj.category_id
 
     def get_level(
         self,
@@ -76,11 +238,9 @@ class RunSerializer(serializers.ModelSerializer):
     ) -> Union[str, int, dict[str, Any]]:
         """Serializes level information, to include optional embeds."""
         if "level" in self.context.get("embed", []):
-            return LevelSerializer(Levels.objects.get(id=obj.level.id)).data
-        elif obj.level:
-            return obj.level.id
+            return self.embedded("levels", LevelSerializer, obj.level)
         else:
-            return None
+            return obj.level_id
 
     def get_times(
         self,
@@ -103,23 +263,16 @@ class RunSerializer(serializers.ModelSerializer):
         self,
         obj: Runs,
     ) -> Union[str, int, dict[str, Any]]:
-        """Serializes the world record associated with the run's subcategory."""
-        record = (
-            Runs.objects.only("id")
-            .filter(
-                game=obj.game,
-                subcategory=obj.subcategory,
-                place=1,
-                obsolete=False,
-            )
-            .first()
-        )
+        """Serializes the world record associated with the run's board."""
+        record = obj.board.wr_id if obj.board else None
         if record:
             if "record" in self.context.get("embed", []):
-                get_record = RunSerializer(Runs.objects.get(id=record.id)).data
-                return get_record
+                if record in self.context.get("records", {}):
+                    return self.context["records"][record]
+
+                return RunSerializer(Runs.objects.get(id=record)).data
             else:
-                return record.id
+                return record
         else:
             return None
 
@@ -128,42 +281,35 @@ class RunSerializer(serializers.ModelSerializer):
         obj: Runs,
     ) -> int:
         """Serializes the number of players within a game and its subcategory."""
-        player_count = (
-            Runs.objects.only("id")
-            .filter(
-                game=obj.game,
-                subcategory=obj.subcategory,
-                obsolete=False,
-            )
-            .count()
-        )
-
-        return player_count
+        return obj.board.run_count if obj.board else 0
 
     def get_players(
         self,
         obj: Runs,
     ) -> Union[str, int, dict[str, Any]]:
-        """Serializes player information, to include optional embeds."""
-        if "players" in self.context.get("embed", []):
-            player1 = PlayerSerializer(Players.objects.get(id=obj.player.id)).data
+        """Serializes player information, to include optional embeds.
 
-            if obj.player2:
-                player2 = PlayerSerializer(Players.objects.get(id=obj.player2.id)).data
-                return player1, player2
-            else:
-                return player1
+        Co-op runs return every seat in order, with empty seats (guests, or a missing partner)
+        returned as `Anonymous`. Any other run returns its first player, along with `player2`
+        when players are embedded and the run has one.
+        """
+        embed = "players" in self.context.get("embed", [])
+        if embed:
+            seats = {
+                seat.seat: self.embedded("players", PlayerSerializer, seat.player)
+                for seat in obj.run_players.all()
+            }
         else:
-            p1 = obj.player.id if obj.player else "Anonymous"
+            seats = {seat.seat: seat.player_id for seat in obj.run_players.all()}
 
-            if obj.player2 and "co-op" in obj.subcategory.lower():
-                p2 = obj.player2.id
-            elif "co-op" in obj.subcategory.lower():
-                p2 = "Anonymous"
-            else:
-                return p1
+        if "co-op" in obj.subcategory.lower():
+            count = max([*seats, 2])
+            return tuple(seats.get(seat, "Anonymous") for seat in range(1, count + 1))
+
+        if embed and 2 in seats:
+            return seats.get(1, "Anonymous"), seats[2]
 
-            return p1, p2
+        return seats.get(1, "Anonymous")
 
     def get_system(
         self,
@@ -171,9 +317,9 @@ class RunSerializer(serializers.ModelSerializer):
     ) -> dict[dict, str]:
         """Serializes platform information, to include optional embeds."""
         if "platform" in self.context.get("embed", []):
-            plat = PlatformSerializer(Platforms.objects.get(id=obj.platform.id)).data
+            plat = self.embedded("platforms", PlatformSerializer, obj.platform)
         else:
-            plat = obj.platform.id
+            plat = obj.platform_id
 
         return {
             "platform": plat,
@@ -187,7 +333,7 @@ class RunSerializer(serializers.ModelSerializer):
         """Serializes run status information."""
         return {
             "vid_status": obj.vid_status,
-            "approver": obj.approver.id if obj.approver else None,
+            "approver": obj.approver_id,
             "v_date": obj.v_date,
             "obsolete": obj.obsolete,
         }
@@ -207,27 +353,16 @@ class RunSerializer(serializers.ModelSerializer):
         obj: Runs,
     ) -> Union[str, int, dict[str, Any]]:
         """Serializes variable information, to include optional embeds."""
-
-        variable_list = (
-            RunVariableValues.objects.only("variable_id", "value_id")
-            .filter(run=obj.id)
-            .values("variable_id", "value_id")
-        )
-
         output = {}
 
         if "variables" in self.context.get("embed", []):
-            for variable in variable_list:
-                var = VariableSerializer(
-                    Variables.objects.only("id").get(id=variable["variable_id"])
-                ).data
-
-                val = ValueSerializer(
-                    VariableValues.objects.only("value").get(value=variable["value_id"])
-                ).data
+            for pair in obj.runvariablevalues_set.all():
+                var = dict(
+                    self.embedded("variables", VariableSerializer, pair.variable)
+                )
+                val = self.embedded("values", ValueSerializer, pair.value)
 
-                var_id = var["id"]
-                var.pop("id", None)
+                var_id = var.pop("id", None)
 
                 output.update(
                     {
@@ -238,9 +373,8 @@ class RunSerializer(serializers.ModelSerializer):
                     }
                 )
         else:
-            if len(variable_list) > 0:
-                for variable in variable_list:
-                    output.update({variable["variable_id"]: variable["value_id"]})
+            for pair in obj.runvariablevalues_set.all():
+                output.update({pair.variable_id: pair.value_id})
 
         return output
 
@@ -299,6 +433,7 @@ class RunSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Runs
+        list_serializer_class = RunListSerializer
         fields = [
             "id",
             "runtype",
@@ -408,27 +543,19 @@ class PlayerSerializer(serializers.ModelSerializer):
         obj: Runs,
     ) -> dict[dict, str]:
         """Serializes basic stats for the player, including rankings and points."""
-        main_runs = (
-            Runs.objects.only("points", "obsolete")
-            .filter(runtype="main")
-            .filter(Q(player=obj.id) | Q(player2=obj.id))
-        )
-
-        il_runs = Runs.objects.only("points", "obsolete").filter(
-            runtype="il", player=obj.id
-        )
-
-        main_points = sum(run.points for run in main_runs.filter(obsolete=False))
-        il_points = sum(run.points for run in il_runs.filter(obsolete=False))
-        total_pts = main_points + il_points
-
-        total_runs = len(main_runs) + len(il_runs)
+        if hasattr(obj, "total_runs"):
+            # Annotated by `RunListSerializer` for embedded players.
+            stats = {name: getattr(obj, name) for name in player_stats()}
+        else:
+            stats = Runs.objects.filter(run_players__player_id=obj.id).aggregate(
+                **player_stats()
+            )
 
         return {
-            "total_pts": total_pts,
-            "main_pts": main_points,
-            "il_pts": il_points,
-            "total_runs": total_runs,
+            "total_pts": stats["main_pts"] + stats["il_pts"],
+            "main_pts": stats["main_pts"],
+            "il_pts": stats["il_pts"],
+            "total_runs": stats["total_runs"],
         }
 
     def get_country(
@@ -843,9 +970,9 @@ class ValueSerializer(serializers.ModelSerializer):
     ) -> Union[str, int, dict[str, Any]]:
         """Serializes variable information, to include optional embeds."""
         if "variable" in self.context.get("embed", []):
-            return VariableSerializer(Variables.objects.get(id=obj.var.id)).data
+            return VariableSerializer(Variables.objects.get(id=obj.var_id)).data
         else:
-            return obj.var.id
+            return obj.var_id
 
     def to_representation(
         self,
@@ -1,11 +1,21 @@
+from itertools import groupby
+from operator import itemgetter
 from types import SimpleNamespace
 from typing import Any
 
 from celery import chain, shared_task
 from django.db import transaction
-from django.db.models import Count
-from srl.m_tasks import convert_time, points_formula, src_api, time_conversion
+from django.db.models import Min
+from srl.m_tasks import (
+    convert_time,
+    get_board,
+    points_formula,
+    rank_times,
+    src_api,
+    time_conversion,
+)
 from srl.models import (
+    Boards,
     Categories,
     Games,
     Levels,
@@ -259,6 +269,7 @@ def invoke_single_run(
 
     Called Functions:
         - `convert_time`
+        - `get_board`
         - `points_formula`
         - `remove_obsolete`
         - `update_points`
@@ -275,19 +286,15 @@ def invoke_single_run(
 
         place = 0
 
+    game_get = Games.objects.only(
+        "id", "name", "pointsmax", "ipointsmax", "defaulttime", "idefaulttime"
+    ).get(id=game_id)
+
     lrt_fix = False
     if run["run"]["level"] is not None:
-        game_get = Games.objects.only("id", "idefaulttime", "ipointsmax").get(
-            id=game_id
-        )
-        max_points = game_get.ipointsmax
-
         if game_get.idefaulttime == "realtime_noloads":
             lrt_fix = True
     else:
-        game_get = Games.objects.only("id", "defaulttime", "pointsmax").get(id=game_id)
-        max_points = game_get.pointsmax
-
         if game_get.defaulttime == "realtime_noloads":
             lrt_fix = True
 
@@ -333,11 +340,26 @@ def invoke_single_run(
 
         c_rta, c_nl, c_igt = time_conversion(run_times)
 
+        category_get = Categories.objects.only("id").get(id=category["id"])
+        level_get = (
+            Levels.objects.only("id").get(id=run["run"]["level"])
+            if run["run"]["level"]
+            else None
+        )
+
+        board = get_board(
+            game_get, category_get, level_get, run["run"]["values"], var_name
+        )
+        max_points = board.max_points
+        defaulttime = board.defaulttime
+        wr_pull = board.wr
+
         default = {
             "runtype": "main" if category["type"] == "per-game" else "il",
             "game": game_get,
-            "category": Categories.objects.only("id").get(id=category["id"]),
+            "category": category_get,
             "subcategory": var_name,
+            "board": board,
             "place": place,
             "url": run["run"]["weblink"],
             "video": run_video,
@@ -366,29 +388,6 @@ def invoke_single_run(
             default["timenl"] = convert_time(run["run"]["times"]["realtime_t"])
             default["timenl_secs"] = run["run"]["times"]["realtime_t"]
 
-        if category["type"] == "per-game":
-            reset_points = "Main"
-            wr_pull = Runs.objects.filter(
-                runtype="main",
-                game=game_id,
-                subcategory=var_name,
-                obsolete=False,
-                place=1,
-            ).first()
-
-            defaulttime = Games.objects.only("defaulttime").get(id=game_id).defaulttime
-        else:
-            reset_points = "IL"
-            wr_pull = Runs.objects.filter(
-                runtype="il",
-                game=game_id,
-                subcategory=var_name,
-                obsolete=False,
-                place=1,
-            ).first()
-
-            defaulttime = Games.objects.only("defaulttime").get(id=game_id).idefaulttime
-
         if not obsolete:
             if run["place"] == 1:
                 points = max_points
@@ -440,17 +439,28 @@ def invoke_single_run(
 
             default["player2"] = player2
 
-        if run.get("run").get("level"):
-            default["level"] = Levels.objects.only("id").get(id=run["run"]["level"])
+        # Players after the first two are only seated through `RunPlayers`.
+        for player in players[2:]:
+            if player["rel"] == "user":
+                chain(update_player.s(player["id"], download_pfp))()
+
+        if level_get:
+            default["level"] = level_get
 
         if point_reset:
             default["points"] = points
 
         with transaction.atomic():
-            run_obj, _ = Runs.objects.update_or_create(
+            run_obj, created = Runs.objects.update_or_create(
                 id=run_id,
                 defaults=default,
             )
+            run_obj.set_extra_players(
+                [
+                    player.get("id") if player["rel"] == "user" else None
+                    for player in players
+                ]
+            )
 
         if len(run["run"]["values"]) > 0:
             for var_id, val_id in run["run"]["values"].items():
@@ -461,39 +471,124 @@ def invoke_single_run(
                     run=run_obj, variable=variable, value=value
                 )
 
-        if point_reset:
-            chain(update_points.s(game_id, var_name, max_points, reset_points))()
+        # Slower runs from the same player have to be marked obsolete before the board is
+        # re-ranked, so both tasks are chained together. Brand new runs are placed into the board
+        # incrementally; updated runs could have moved anywhere, so the board is fully re-ranked.
+        if point_reset and not obsolete:
+            chain(
+                remove_obsolete.si(board.id, players),
+                update_points.si(board.id, run_id if created else None),
+            )()
+        elif point_reset:
+            chain(update_points.s(board.id))()
+        elif not obsolete:
+            chain(remove_obsolete.s(board.id, players))()
+        else:
+            board.refresh()
 
-        if not obsolete:
-            chain(remove_obsolete.s(game_id, var_name, players, reset_points))()
+
+def insert_run(
+    board: Boards,
+    run_id: str,
+) -> bool:
+    """Places a newly imported speedrun into its board without re-ranking the entire board.
+
+    The new run's place is found by counting the faster runs within the board. Only the slower runs
+    whose place actually changes are updated (everything between the new time and the player's old
+    personal best); their points only depend on the world record, so they are left alone.
+
+    Args:
+        board (Boards): The board the speedrun was imported into.
+        run_id (str): ID of the newly imported speedrun.
+
+    Returns:
+        bool: False if the speedrun cannot be placed incrementally (e.g. it is a new world record)
+            and the entire board has to be re-ranked.
+    """
+    time_columns = {
+        "realtime": "time_secs",
+        "realtime_noloads": "timenl_secs",
+        "ingame": "timeigt_secs",
+    }
+
+    column = time_columns[board.defaulttime]
+    run = Runs.objects.only("id", "obsolete", "place", "points", column).get(id=run_id)
+
+    # The run was slower than the player's personal best, so nothing on the board moved.
+    if run.obsolete:
+        return True
+
+    run_time = getattr(run, column)
+    live_runs = Runs.objects.filter(board=board.id, obsolete=False).exclude(id=run.id)
+    wr_time = live_runs.aggregate(wr_time=Min(column))["wr_time"]
+
+    # New world records change the points of every run, and missing times (see THPS4_TEMP_FIX in
+    # `update_points`) need the full fallback logic.
+    if not run_time or not wr_time or run_time < wr_time:
+        return False
+
+    run.place = live_runs.filter(**{f"{column}__lt": run_time}).count() + 1
+    run.points = (
+        board.max_points
+        if run_time == wr_time
+        else points_formula(wr_time, run_time, board.max_points)
+    )
+    run.save(update_fields=["place", "points"])
+
+    # Walks through the slower runs (fastest first) until one already has the correct place; every
+    # run after it was not affected by the new run.
+    seen = live_runs.filter(**{f"{column}__lte": run_time}).count() + 1
+    old_time = None
+    place = None
+    shifted: list[Runs] = []
+
+    slower_runs = (
+        live_runs.only("id", "place", column)
+        .filter(**{f"{column}__gt": run_time})
+        .order_by(column, "id")
+    )
+
+    for slower in slower_runs.iterator(chunk_size=25):
+        slower_time = getattr(slower, column)
+        if slower_time != old_time:
+            place = seen + 1
+            old_time = slower_time
+
+        seen += 1
+
+        if slower.place == place:
+            break
+
+        slower.place = place
+        shifted.append(slower)
+
+    Runs.objects.bulk_update(shifted, ["place"])
+    Runs.invalidate([slower.id for slower in shifted])
+
+    return True
 
 
 @shared_task
 def update_points(
-    game_id,
-    subcategory,
-    max_points,
-    reset_points,
+    board_id,
+    run_id=None,
 ) -> None:
-    """Retrieves all speedruns within a game and subcategory and resets placings and points.
+    """Retrieves all speedruns within a board and resets placings and points.
 
-    Retrieves all speedruns within a game's subcateogyr and resets the `place` field for that run,
-    and updates their point totals whenever a new world record is achieved.
+    Retrieves all speedruns within a board (a game's category and subcategory) and resets the
+    `place` field for that run, and updates their point totals whenever a new world record is
+    achieved.
 
     Args:
-        game_id (str): Speedrun.com ID for the game that `subcategory` belongs to.
-        subcategory (str): Full category and subcategory name (e.g. `Any% (Beginner)` or `Any% No
-            Warp Normal`).
-        max_points (int): Maximum point total for a speedrun (usually 1000 for full-game and 100 for
-            individual levels).
-        reset_points (str): Can be `Main` or `IL`. This assists in determining type of query to be
-            ran.
-    """
-    place = 1
-    old_time = 0
-    old_points = 0
-    rank_count = 0
+        board_id (int): ID of the `Boards` object (e.g. `Any% (Beginner)` or `Any% No Warp
+            Normal`) being reset.
+        run_id (str): None by default. When given, this is a newly imported speedrun that is placed
+            into the board incrementally; the board is only fully re-ranked if that is not possible.
 
+    Called Functions:
+        - `insert_run`
+        - `rank_times`
+    """
     # Dictionary to map default timing methods to the type of seconds used.
     time_columns = {
         "realtime": "time_secs",
@@ -501,38 +596,28 @@ def update_points(
         "ingame": "timeigt_secs",
     }
 
-    if reset_points == "Main":
-        all_runs = Runs.objects.only(
-            "place",
-            "points",
-            "time_secs",
-            "timenl_secs",
-            "timeigt_secs",
-        ).filter(
-            runtype="main",
-            game=game_id,
-            subcategory=subcategory,
-            obsolete=False,
-        )
+    board = Boards.objects.only(
+        "id", "runtype", "game", "defaulttime", "max_points"
+    ).get(id=board_id)
 
-        default_time = Games.objects.only("defaulttime").get(id=game_id).defaulttime
-    else:
-        all_runs = Runs.objects.only(
-            "place",
-            "points",
-            "time_secs",
-            "timenl_secs",
-            "timeigt_secs",
-        ).filter(
-            runtype="il",
-            game=game_id,
-            subcategory=subcategory,
-            obsolete=False,
-        )
+    if run_id and insert_run(board, run_id):
+        board.refresh()
+        return
+
+    default_time = board.defaulttime
 
-        default_time = Games.objects.only("idefaulttime").get(id=game_id).idefaulttime
+    all_runs = Runs.objects.only(
+        "place",
+        "points",
+        "time_secs",
+        "timenl_secs",
+        "timeigt_secs",
+    ).filter(
+        board=board_id,
+        obsolete=False,
+    )
 
-    runs = all_runs.order_by(time_columns[default_time])
+    runs = list(all_runs.order_by(time_columns[default_time]))
     wr_time = runs[0].__getattribute__(time_columns[default_time])
 
     # THPS4_TEMP_FIX
@@ -542,67 +627,50 @@ def update_points(
 
     if wr_time == 0:
         default_time = "realtime"
-        runs = all_runs.order_by(time_columns[default_time])
+        runs = list(all_runs.order_by(time_columns[default_time]))
         wr_time = runs[0].__getattribute__(time_columns[default_time])
 
-    # Logic here will iterate through the runs from the same subcategory that are not obsolete in
-    # the same game. If it is WR, then it gets max_points; rank is incremented.
-    # If it is not WR, then points are calculated based on the formula and the max_points of the
-    # run. The place of the run would be place + rank_count; rank_count is reset to 1. Then saved.
+    run_times = []
     for run in runs:
         run_time = run.__getattribute__(time_columns[default_time])
 
         if run_time == 0:
             run_time = run.timeigt_secs
 
-        if run_time == wr_time:
-            run.place = place
-            run.points = max_points
+        run_times.append(run_time)
 
-            old_points = max_points
-            rank_count += 1
-        elif run_time == old_time:
+    # Only runs whose place or points changed are saved.
+    changed: list[Runs] = []
+    for run, (place, points) in zip(
+        runs, rank_times(run_times, wr_time, board.max_points)
+    ):
+        if (run.place, run.points) != (place, points):
             run.place = place
-            run.points = old_points
-
-            rank_count += 1
-        else:
-            points = points_formula(wr_time, run_time, max_points)
             run.points = points
+            changed.append(run)
 
-            if rank_count > 0:
-                run.place = place + rank_count
-                place += rank_count
-
-                rank_count = 1
-            else:
-                place += 1
-                run.place = place
-
-            old_time = run_time
-            old_points = points
+    Runs.objects.bulk_update(changed, ["place", "points"])
+    Runs.invalidate([run.id for run in changed])
 
-        run.save(update_fields=["place", "points"])
+    board.refresh()
 
 
 @shared_task
 def remove_obsolete(
-    game_id,
-    subcategory,
+    board_id,
     players,
-    run_type,
 ) -> None:
     """Updates speedrun entries that should be obsolete.
 
-    Retrieves all current runs by the player (depending on `game_id`, `subcategory`, and `run_type`)
-    and marks all slower runs as obsolete.
+    Retrieves all current runs submitted by the player within the board (where they are in the
+    first seat) and marks all slower runs as obsolete. Runs where the player is in another seat
+    are left alone: on a co-op board, a faster run by one partner with someone else must not hide
+    the only run of the other partner. `counted_runs` keeps only the best of the remaining runs
+    of each player, whatever their seat.
 
     Args:
-        game_id (str): Speedrun.com ID for the game that `subcategory` belongs to.
-        subcategory (str): Full category and subcategory name (e.g. `Any% (Beginner)` or `Any% No
-            Warp Normal`).
+        board_id (int): ID of the `Boards` object the speedruns belong to.
         players (dict): Player(s) who are having their speedruns marked as obsolete.
-        run_type (str): Can be `Main` or `IL`. This assists in determining type of query to be ran.
     """
     time_columns = {
         "realtime": "time_secs",
@@ -610,75 +678,197 @@ def remove_obsolete(
         "ingame": "timeigt_secs",
     }
 
+    board = Boards.objects.only("id", "runtype", "game", "defaulttime").get(id=board_id)
+
     for player in players:
         if player is not None and player["rel"] != "guest":
-            # Checks the defaulttime from the Games model.
-            # Once found, it will set the slowest_runs variable based on the game ID, whether it
-            # is already obsolete, from the same player, in the same category.
-            if run_type == "Main":
-                default_time = (
-                    Games.objects.only("defaulttime").get(id=game_id).defaulttime
-                )
-                all_runs = (
-                    Runs.objects.prefetch_related("game", "player")
-                    .only(
-                        "id",
-                        "game__id",
-                        "player__id",
-                        "subcategory",
-                        "obsolete",
-                        "time_secs",
-                        "timenl_secs",
-                        "timeigt_secs",
-                    )
-                    .filter(
-                        runtype="main",
-                        game=game_id,
-                        player=player["id"],
-                        subcategory=subcategory,
-                        obsolete=False,
-                    )
+            # Sets the slowest_runs variable based on the board, whether it is already obsolete,
+            # and submitted by the same player; ordered by the board's timing method.
+            slowest_runs = (
+                Runs.objects.only(
+                    "id",
+                    "obsolete",
+                    "time_secs",
+                    "timenl_secs",
+                    "timeigt_secs",
                 )
-            else:
-                default_time = (
-                    Games.objects.only("idefaulttime").get(id=game_id).idefaulttime
+                .filter(
+                    board=board_id,
+                    player=player["id"],
+                    obsolete=False,
                 )
-                all_runs = (
-                    Runs.objects.prefetch_related("game", "player")
-                    .only(
-                        "id",
-                        "game__id",
-                        "player__id",
-                        "subcategory",
-                        "obsolete",
-                        "time_secs",
-                        "timenl_secs",
-                        "timeigt_secs",
-                    )
-                    .filter(
-                        runtype="il",
-                        game=game_id,
-                        player=player["id"],
-                        subcategory=subcategory,
-                        obsolete=False,
-                    )
-                )
-
-            duplicated_subcategories = (
-                all_runs.values("subcategory")
-                .annotate(count=Count("subcategory"))
-                .filter(count__gt=1)
-                .values("subcategory")
+                .order_by(f"-{time_columns[board.defaulttime]}")
             )
-
-            slowest_runs = all_runs.filter(
-                subcategory__in=duplicated_subcategories
-            ).order_by(f"-{time_columns[default_time]}")
             # Removes the newest time from the query,
             # then sets all other runs (should be one) to obsolete.
-            if len(slowest_runs) > 0:
+            if len(slowest_runs) > 1:
                 last = slowest_runs.last()
-                slowest_runs = slowest_runs.exclude(id=last)
-                for new_obsolete in slowest_runs:
-                    new_obsolete.obsolete = True
-                    new_obsolete.save(force_update=True)
+                new_obsolete = [run.id for run in slowest_runs if run.id != last.id]
+                Runs.objects.filter(id__in=new_obsolete).update(obsolete=True)
+                Runs.invalidate(new_obsolete)
+
+    board.refresh()
+
+
+@shared_task
+def audit_boards(
+    board_ids=None,
+    game_id=None,
+    fix=False,
+) -> list[dict[str, Any]]:
+    """Compares the placings, points, and obsolete flags of speedruns with the expected ranking.
+
+    When tasks are dropped or ran out of order, the `place`, `points`, and `obsolete` fields can
+    drift away from what `remove_obsolete` and `update_points` would produce. All runs are loaded
+    in a single query (ordered by board), and each board is re-ranked in memory with the same
+    rules to find the mismatched runs.
+
+    Runs that are already obsolete are never un-marked, since older runs are imported as obsolete
+    on purpose.
+
+    Args:
+        board_ids (list): None by default. When given, only these boards are audited.
+        game_id (str): None by default. When given, only the boards of this game are audited.
+        fix (bool): False by default. When True, only the mismatched runs are updated and the
+            cached world record and run count of their boards is refreshed.
+
+    Returns:
+        list: A dictionary for each board that has drifted, with the number of runs that have the
+            wrong `obsolete`, `place`, and `points` values, and if the board's cache is stale.
+
+    Called Functions:
+        - `rank_times`
+    """
+    # Maps default timing methods to their position within each row.
+    time_columns = {
+        "realtime": 4,
+        "realtime_noloads": 5,
+        "ingame": 6,
+    }
+
+    boards = Boards.objects.select_related("game").only(
+        "id",
+        "runtype",
+        "subcategory",
+        "defaulttime",
+        "max_points",
+        "wr",
+        "run_count",
+        "game__name",
+    )
+    runs = Runs.objects.filter(board__isnull=False, obsolete=False)
+
+    if board_ids:
+        boards = boards.filter(id__in=board_ids)
+        runs = runs.filter(board__in=board_ids)
+
+    if game_id:
+        boards = boards.filter(game=game_id)
+        runs = runs.filter(game=game_id)
+
+    boards = {board.id: board for board in boards}
+    runs = runs.order_by("board_id").values_list(
+        "id",
+        "board_id",
+        "player_id",
+        "points",
+        "time_secs",
+        "timenl_secs",
+        "timeigt_secs",
+        "place",
+    )
+
+    report = []
+    audited = set()
+
+    for board_id, board_runs in groupby(runs.iterator(chunk_size=2000), itemgetter(1)):
+        board = boards[board_id]
+        board_runs = list(board_runs)
+        column = time_columns[board.defaulttime]
+
+        audited.add(board_id)
+
+        # Boards with missing times can't be ranked by `update_points` either.
+        if any(None in run[4:7] for run in board_runs):
+            continue
+
+        # `remove_obsolete`: only the fastest run submitted by each player (`player`, the first
+        # seat) stays on the board.
+        seen_players = set()
+        ranked_runs = []
+        obsolete_ids = []
+
+        for run in sorted(board_runs, key=itemgetter(column, 0)):
+            if run[2] is None or run[2] not in seen_players:
+                seen_players.add(run[2])
+                ranked_runs.append(run)
+            else:
+                obsolete_ids.append(run[0])
+
+        # `update_points`, including THPS4_TEMP_FIX.
+        if ranked_runs[0][column] == 0:
+            column = time_columns["realtime"]
+            ranked_runs.sort(key=itemgetter(column, 0))
+
+        wr_time = ranked_runs[0][column]
+        run_times = [run[column] if run[column] != 0 else run[6] for run in ranked_runs]
+        ranks = rank_times(run_times, wr_time, board.max_points)
+
+        wrong_places = 0
+        wrong_points = 0
+        changed: list[Runs] = []
+
+        for run, (place, points) in zip(ranked_runs, ranks):
+            if run[7] != place:
+                wrong_places += 1
+            if run[3] != points:
+                wrong_points += 1
+            if (run[7], run[3]) != (place, points):
+                changed.append(Runs(id=run[0], place=place, points=points))
+
+        # `Boards.refresh`: the world record is the first run (by ID) in first place.
+        expected_wr = min(
+            (run[0] for run, (place, _) in zip(ranked_runs, ranks) if place == 1),
+            default=None,
+        )
+        stale = (board.wr_id, board.run_count) != (expected_wr, len(ranked_runs))
+
+        if obsolete_ids or changed or stale:
+            report.append(
+                {
+                    "board": board.id,
+                    "game": board.game.name,
+                    "subcategory": board.subcategory,
+                    "obsolete": len(obsolete_ids),
+                    "place": wrong_places,
+                    "points": wrong_points,
+                    "stale": stale,
+                }
+            )
+
+            if fix:
+                with transaction.atomic():
+                    Runs.objects.filter(id__in=obsolete_ids).update(obsolete=True)
+                    Runs.objects.bulk_update(changed, ["place", "points"])
+                    Runs.invalidate(obsolete_ids + [run.id for run in changed])
+                    board.refresh()
+
+    # Boards without any non-obsolete runs should not have a cached world record or run count.
+    for board in boards.values():
+        if board.id not in audited and (board.wr_id or board.run_count):
+            report.append(
+                {
+                    "board": board.id,
+                    "game": board.game.name,
+                    "subcategory": board.subcategory,
+                    "obsolete": 0,
+                    "place": 0,
+                    "points": 0,
+                    "stale": True,
+                }
+            )
+
+            if fix:
+                board.refresh()
+
+    return report
@@ -3,6 +3,7 @@ from django.urls import path
 from api.views import (
     API_Categories,
     API_Games,
+    API_Leaderboards,
     API_Levels,
     API_PlayerRecords,
     API_Players,
@@ -22,4 +23,10 @@ urlpatterns = [
     path("values/<str:id>", API_Values.as_view(), name="Values"),
     path("levels/<str:id>", API_Levels.as_view(), name="Levels"),
     path("live", API_Streams.as_view(), name="Streams"),
+    path("leaderboards/<str:board>", API_Leaderboards.as_view(), name="Leaderboards"),
+    path(
+        "leaderboards/<str:board>/<str:game>",
+        API_Leaderboards.as_view(),
+        name="Leaderboards",
+    ),
 ]
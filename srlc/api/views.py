@@ -1,9 +1,12 @@
 from celery import chain
 from django.db.models import Q
 from django.http import HttpRequest, HttpResponse
+from django.utils.decorators import method_decorator
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from srl.cache import conditional_page, player_scope, snapshot
+from srl.leaderboard_view import player_ids, standings_page
 from srl.models import (
     Categories,
     Games,
@@ -32,6 +35,20 @@ from api.serializers import (
 from api.tasks import normalize_src
 
 
+def player_scopes(
+    id: str,
+) -> list[str]:
+    """Returns the scopes of a player's data, for the ETags of the player endpoints."""
+    if id == "all":
+        return ["players"]
+
+    player_id = player_ids().get(id.lower())
+    if player_id is None:
+        return ["players"]
+
+    return [player_scope(player_id)]
+
+
 class API_Runs(APIView):
     """Viewset for viewing, creating, or editing speedruns.
 
@@ -130,6 +147,7 @@ class API_Runs(APIView):
         "record",
     }
 
+    @method_decorator(conditional_page(lambda id: ["main", "il", "players"]))
     def get(
         self,
         request: HttpRequest,
@@ -178,7 +196,7 @@ class API_Runs(APIView):
 
         if id == "all":
             if "status" in query_fields:
-                new_runs = Runs.objects.filter(vid_status="new")
+                new_runs = Runs.objects.select_related("board").filter(vid_status="new")
                 runs = RunSerializer(
                     new_runs, many=True, context={"embed": embed_fields}
                 ).data
@@ -194,7 +212,7 @@ class API_Runs(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
         else:
-            run = Runs.objects.filter(id__iexact=id).first()
+            run = Runs.objects.select_related("board").filter(id__iexact=id).first()
             if run:
                 return Response(
                     RunSerializer(run, context={"embed": embed_fields}).data,
@@ -339,6 +357,7 @@ class API_Players(APIView):
 
     ALLOWED_QUERIES = {"streams"}
 
+    @method_decorator(conditional_page(player_scopes))
     def get(
         self,
         request: HttpRequest,
@@ -588,6 +607,7 @@ class API_PlayerRecords(APIView):
 
     ALLOWED_EMBEDS = {"categories", "levels", "games", "platforms"}
 
+    @method_decorator(conditional_page(player_scopes))
     def get(
         self,
         request: HttpRequest,
@@ -634,14 +654,14 @@ class API_PlayerRecords(APIView):
         if player:
             player_data = PlayerSerializer(player).data
 
-            main_runs = Runs.objects.filter(
+            main_runs = Runs.objects.select_related("board").filter(
                 runtype="main",
-                player=player,
+                run_players__player=player,
                 obsolete=False,
             )
-            il_runs = Runs.objects.filter(
+            il_runs = Runs.objects.select_related("board").filter(
                 runtype="il",
-                player=player,
+                run_players__player=player,
                 obsolete=False,
             )
 
@@ -705,6 +725,7 @@ class API_Games(APIView):
 
     ALLOWED_EMBEDS = {"categories", "levels", "platforms"}
 
+    @method_decorator(conditional_page(lambda id: ["games"]))
     def get(
         self,
         request: HttpRequest,
@@ -801,6 +822,7 @@ class API_Categories(APIView):
 
     ALLOWED_EMBEDS = {"game", "variables"}
 
+    @method_decorator(conditional_page(lambda id: ["games"]))
     def get(
         self,
         request: HttpRequest,
@@ -883,6 +905,7 @@ class API_Variables(APIView):
 
     ALLOWED_EMBEDS = {"game", "values"}
 
+    @method_decorator(conditional_page(lambda id: ["games"]))
     def get(
         self,
         request: HttpRequest,
@@ -962,6 +985,7 @@ class API_Values(APIView):
 
     ALLOWED_EMBEDS = {"variable"}
 
+    @method_decorator(conditional_page(lambda id: ["games"]))
     def get(
         self,
         request: HttpRequest,
@@ -1039,6 +1063,7 @@ class API_Levels(APIView):
 
     ALLOWED_EMBEDS = {"game"}
 
+    @method_decorator(conditional_page(lambda id: ["games"]))
     def get(
         self,
         request: HttpRequest,
@@ -1128,6 +1153,7 @@ class API_Streams(APIView):
         ```
     """
 
+    @method_decorator(conditional_page(lambda: ["streams"]))
     def get(
         self,
         _,
@@ -1217,3 +1243,138 @@ class API_Streams(APIView):
                 {"ERROR": f"{request.data['streamer']} is not in the model."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+
+
+class API_Leaderboards(APIView):
+    """Viewset for viewing the points leaderboards.
+
+    This viewset returns one page of the overall, full-game, or per-game IL points leaderboard,
+    read from the precomputed standings. Pages are cached until the standings are next rebuilt, and
+    every response carries an `ETag`; a request whose `If-None-Match` still matches it gets a
+    `304 Not Modified` without the page being read at all.
+
+    Methods:
+        get:
+            Returns a page of the leaderboard.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users with a valid API key may use this endpoint.
+
+    Model: `Standings`
+
+    Query Parameters:
+        - `cursor`: Rank of the last player of the previous page (`next` of its response).
+        - `limit`: Players per page (default 50, maximum 200).
+        - `fields`: Comma-separated fields to return for every player (default: all of them).
+
+    Query Example:
+        `/leaderboards/overall?limit=100&fields=rank,player,points`
+        `/leaderboards/il/thps4?cursor=50`
+
+    Example Response (JSON):
+        ```
+        {
+            "count": 1204,
+            "next": 50,
+            "results": [
+                {
+                    "rank": 1,
+                    "player": "TH126",
+                    "nickname": null,
+                    "countrycode": "us",
+                    "points": 48211
+                }
+            ]
+        }
+        ```
+    """
+
+    ALLOWED_BOARDS = {"overall": "all", "fullgame": "main", "il": "il"}
+    ALLOWED_FIELDS = {"rank", "player", "nickname", "countrycode", "points"}
+
+    @method_decorator(conditional_page(lambda board, game=None: ["standings"]))
+    def get(
+        self,
+        request: HttpRequest,
+        board: str,
+        game: str = None,
+    ) -> HttpResponse:
+        """Returns a page of a points leaderboard.
+
+        Args:
+            request (Request): The request object containing the information, queries, or embeds.
+            board (str): `overall`, `fullgame`, or `il`.
+            game (str): ID or slug of the game; required (and only allowed) for `il`.
+
+        Returns:
+            Response: A response object containing the JSON data of the leaderboard page.
+        """
+        runtype = self.ALLOWED_BOARDS.get(board)
+        if runtype is None:
+            return Response(
+                {"ERROR": "board must be overall, fullgame, or il."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        elif (runtype == "il") != (game is not None):
+            return Response(
+                {"ERROR": "A game must be given for (and only for) il leaderboards."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        elif game and len(game) >= 15:
+            return Response(
+                {"ERROR": "game must be 15 characters or less."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            cursor = max(int(request.GET.get("cursor", 0)), 0)
+            limit = min(max(int(request.GET.get("limit", 50)), 1), 200)
+        except ValueError:
+            return Response(
+                {"ERROR": "cursor and limit must be integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fields = request.GET.get("fields", "").split(",")
+        fields = [field.strip() for field in fields if field.strip()]
+        invalid_fields = [field for field in fields if field not in self.ALLOWED_FIELDS]
+
+        if invalid_fields:
+            return Response(
+                {"ERROR": f"Invalid field(s): {', '.join(invalid_fields)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        name = f"api:leaderboards:{board}:{(game or '').lower()}:{cursor}:{limit}"
+
+        def build_page():
+            if game:
+                game_id = (
+                    Games.objects.filter(Q(id__iexact=game) | Q(slug__iexact=game))
+                    .values_list("id", flat=True)
+                    .first()
+                )
+                if game_id is None:
+                    return None
+            else:
+                game_id = None
+
+            return standings_page(runtype, game_id, cursor, limit)
+
+        page = snapshot(name, ["standings"], build_page)
+
+        if page is None:
+            return Response(
+                {"ERROR": "Game ID or slug/abbreviation does not exist"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if fields:
+            page = page | {
+                "results": [
+                    {field: entry[field] for field in fields}
+                    for entry in page["results"]
+                ]
+            }
+
+        return Response(page, status=status.HTTP_200_OK)
@@ -31,5 +31,6 @@ done
 
 python manage.py collectstatic --noinput
 python manage.py migrate
+python manage.py update_standings
 
 exec "$@"
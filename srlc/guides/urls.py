@@ -1,8 +1,11 @@
 from django.urls import path
+from srl.cache import cached_page
 
-from .views import render_guides_list, render_markdown
+from .views import DOCS_TIMEOUT, render_guides_list, render_markdown
+
+docs_page = cached_page(lambda **kwargs: ["games"], DOCS_TIMEOUT)
 
 urlpatterns = [
-    path("<str:game>/", render_guides_list, name="render_doc"),
-    path("<str:game>/<str:doc>", render_markdown, name="render_doc"),
+    path("<str:game>/", docs_page(render_guides_list), name="render_doc"),
+    path("<str:game>/<str:doc>", docs_page(render_markdown), name="render_doc"),
 ]
@@ -11,6 +11,9 @@ from srl.models import Games, Players
 from .youtube_shortcode import YTEmbedProcessor
 
 DOCS_PATH = "/srlc/docs/"
+# Guides are read from disk, so nothing bumps a version when they change; cached guide pages
+# (see `guides/urls.py`) are kept for this many seconds instead.
+DOCS_TIMEOUT = 60 * 10
 
 
 def parse_md_file(
@@ -2,21 +2,25 @@ from typing import Any
 
 from django import forms
 from django.contrib import admin
-from django.db import models
+from django.db import models, transaction
 from django.db.models import QuerySet
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
 from django.urls import URLPattern, path, reverse
 
+from .cache import bump_version
 from .models import (
     Awards,
+    Boards,
     Categories,
     CountryCodes,
+    FeaturedBoards,
     Games,
     Levels,
     NowStreaming,
     Platforms,
     Players,
+    RunPlayers,
     Runs,
     RunVariableValues,
     Series,
@@ -24,6 +28,7 @@ from .models import (
     VariableValues,
 )
 from .views import (
+    AuditBoardsView,
     ImportObsoleteView,
     RefreshGameRunsView,
     UpdateGameRunsView,
@@ -170,6 +175,69 @@ class CategoriesAdmin(admin.ModelAdmin):
     list_filter = ["game"]
 
 
+class BoardsAdmin(admin.ModelAdmin):
+    """Admin panel used with the `Boards` model.
+
+    Boards are created automatically when runs are imported, which also sets whether they are
+    co-op; the world record and run count are re-cached whenever the points of a board are updated.
+
+    Methods:
+        - audit_boards: Compares the placings, points, and obsolete flags of all runs within the
+            selected boards with the expected ranking. Any drift can then be fixed.
+    """
+
+    list_display = ["subcategory", "game", "runtype", "run_count"]
+    search_fields = ["subcategory"]
+    list_filter = ["runtype", "game"]
+    autocomplete_fields = ["values"]
+    readonly_fields = ["values_key", "coop", "wr", "run_count"]
+    actions = ["audit_boards"]
+
+    @admin.action(description="Audit Boards")
+    def audit_boards(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet["Boards"],
+    ) -> HttpResponse:
+        """Compares the selected boards with their expected ranking."""
+        board_ids = [str(obj.id) for obj in queryset]
+        return redirect(
+            reverse("admin:audit_boards") + f"?board_ids={','.join(board_ids)}"
+        )
+
+    def get_urls(self) -> list[URLPattern]:
+        """Adds all above methods to custom URLs."""
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                "audit-boards/",
+                self.admin_site.admin_view(AuditBoardsView.as_view()),
+                name="audit_boards",
+            ),
+        ]
+        return custom_urls + urls
+
+
+class FeaturedBoardsAdmin(admin.ModelAdmin):
+    """Admin panel used with the `FeaturedBoards` model.
+
+    The world records of every featured board are shown on the main page.
+    """
+
+    list_display = ["board"]
+    list_filter = ["board__game"]
+    autocomplete_fields = ["board"]
+
+    def delete_queryset(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet["FeaturedBoards"],
+    ) -> None:
+        """Deletes the selected featured boards, invalidating the main page records once."""
+        super().delete_queryset(request, queryset)
+        transaction.on_commit(lambda: bump_version("featured"))
+
+
 class RunVariableValuesInline(admin.TabularInline):
     """Admin panel used with the `RunVariableValues` model."""
 
@@ -178,6 +246,17 @@ class RunVariableValuesInline(admin.TabularInline):
     autocomplete_fields = ["variable", "value"]
 
 
+class RunPlayersInline(admin.TabularInline):
+    """Admin panel used with the `RunPlayers` model.
+
+    Seats 1 and 2 follow the `player` and `player2` fields of the run whenever it is saved.
+    """
+
+    model = RunPlayers
+    extra = 0
+    autocomplete_fields = ["player"]
+
+
 class SpeedrunAdmin(admin.ModelAdmin):
     """Admin panel used with the `Runs` model.
 
@@ -191,7 +270,7 @@ class SpeedrunAdmin(admin.ModelAdmin):
     list_display = ["id"]
     search_fields = ["id"]
     list_filter = ["runtype", "obsolete", "game", "platform"]
-    inlines = [RunVariableValuesInline]
+    inlines = [RunPlayersInline, RunVariableValuesInline]
 
     def formfield_for_foreignkey(
         self,
@@ -200,7 +279,7 @@ class SpeedrunAdmin(admin.ModelAdmin):
         **kwargs: Any,
     ) -> forms.ModelChoiceField:
         """Inlines the `RunVariableValues` model into a `Runs` object."""
-        if db_field.name in ["category", "level"]:
+        if db_field.name in ["category", "level", "board"]:
             if request.resolver_match and "object_id" in request.resolver_match.kwargs:
                 run_id = request.resolver_match.kwargs["object_id"]
                 try:
@@ -209,6 +288,8 @@ class SpeedrunAdmin(admin.ModelAdmin):
                         kwargs["queryset"] = Categories.objects.filter(game=run.game)
                     elif db_field.name == "level":
                         kwargs["queryset"] = Levels.objects.filter(game=run.game)
+                    elif db_field.name == "board":
+                        kwargs["queryset"] = Boards.objects.filter(game=run.game)
                 except Runs.DoesNotExist:
                     pass
 
@@ -283,6 +364,8 @@ admin.site.register(Levels, CategoriesAdmin)
 admin.site.register(Variables, DefaultAdmin)
 admin.site.register(VariableValues, DefaultAdmin)
 admin.site.register(Runs, SpeedrunAdmin)
+admin.site.register(Boards, BoardsAdmin)
+admin.site.register(FeaturedBoards, FeaturedBoardsAdmin)
 admin.site.register(Players, PlayersAdmin)
 admin.site.register(Platforms, DefaultAdmin)
 admin.site.register(NowStreaming)
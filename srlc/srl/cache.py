@@ -0,0 +1,242 @@
+import hashlib
+import time
+from functools import wraps
+from typing import Any, Callable
+
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+
+SNAPSHOT_TIMEOUT = 60 * 60
+
+
+def version_key(
+    scope: str,
+) -> str:
+    return f"version:{scope}"
+
+
+def game_scope(
+    game: str,
+) -> str:
+    """Returns the scope of the data of a single game (e.g. its game page payloads)."""
+    return f"game:{game}"
+
+
+def player_scope(
+    player: str,
+) -> str:
+    """Returns the scope of the data of a single player (e.g. their profile statistics)."""
+    return f"player:{player}"
+
+
+def snapshot_key(
+    name: str,
+    versions: list[int],
+) -> str:
+    return f"snapshot:{name}:{'.'.join(str(version) for version in versions)}"
+
+
+def fresh_version() -> int:
+    """Returns the first version of a scope that has none (e.g. after the cache was flushed).
+
+    Versions start from the current time in nanoseconds, so a version is never handed out twice
+    even when the cache (and every counter in it) is lost; ETags and snapshot keys built from an
+    older counter can never match the new one.
+    """
+    return time.time_ns()
+
+
+def get_versions(
+    scopes: list[str],
+) -> list[int]:
+    """Returns the current data version of each scope.
+
+    Scopes without a version (never bumped, or evicted from the cache) are given a fresh one.
+
+    Args:
+        scopes (list[str]): Scopes to look up (e.g. `["main", "il"]`).
+
+    Returns:
+        list[int]: Versions, in the same order as `scopes`.
+    """
+    keys = [version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, fresh_version(), timeout=None)
+        # Another request may have added the version first.
+        versions |= cache.get_many(missing)
+
+    return [versions[key] for key in keys]
+
+
+def bump_version(
+    *scopes: str,
+) -> None:
+    """Moves every given scope to a new data version.
+
+    Snapshots built from an older version are never read again and expire on their own.
+
+    Args:
+        scopes (str): Scopes that had their data changed (e.g. `"main"` or `"il"`).
+    """
+    for scope in scopes:
+        cache.add(version_key(scope), fresh_version(), timeout=None)
+        cache.incr(version_key(scope))
+
+
+def version_etag(
+    name: str,
+    versions: list[int],
+) -> str:
+    """Returns an ETag for `name` (e.g. a URL) at the given versions of its scopes.
+
+    Args:
+        name (str): Unique name of the resource.
+        versions (list[int]): Versions of the scopes the resource depends on.
+
+    Returns:
+        str: Quoted ETag.
+    """
+    versions = ".".join(str(version) for version in versions)
+
+    return f'"{hashlib.md5(f"{name}:{versions}".encode()).hexdigest()}"'
+
+
+def conditional_page(
+    scopes: Callable[..., list[str]],
+) -> Callable:
+    """Answers conditional GET requests of a view from the versions of its data alone.
+
+    The response carries an ETag built from the URL and the versions of `scopes`; when a client
+    sends it back (`If-None-Match`) and none of the scopes was bumped since, `304 Not Modified` is
+    returned without calling the view. Use `method_decorator` for the methods of an `APIView`.
+
+    Args:
+        scopes (Callable): Returns the scopes of a resource from the URL arguments of the view.
+
+    Returns:
+        Callable: Decorator for the view.
+    """
+
+    def decorator(
+        view: Callable[..., HttpResponse],
+    ) -> Callable[..., HttpResponse]:
+        @wraps(view)
+        def wrapper(
+            request: HttpRequest,
+            *args,
+            **kwargs,
+        ) -> HttpResponse:
+            page_scopes = scopes(*args, **kwargs)
+            etag = version_etag(request.get_full_path(), get_versions(page_scopes))
+
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified["Surrogate-Key"] = " ".join(page_scopes)
+                return not_modified
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                response["ETag"] = etag
+
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def snapshot(
+    name: str,
+    scopes: list[str],
+    builder: Callable[[], Any],
+) -> Any:
+    """Returns the cached result of `builder` for the current version of `scopes`.
+
+    The result is built (and stored) only by the first request after any of the scopes was
+    bumped; every other request is served from the cache.
+
+    Args:
+        name (str): Unique name of the snapshot (e.g. `leaderboard:1:all`).
+        scopes (list[str]): Scopes the snapshot depends on.
+        builder (Callable): Function that builds the snapshot. Its result must be picklable.
+
+    Returns:
+        Any: Result of `builder`.
+    """
+    key = snapshot_key(name, get_versions(scopes))
+
+    data = cache.get(key)
+    if data is None:
+        data = builder()
+        cache.set(key, data, SNAPSHOT_TIMEOUT)
+
+    return data
+
+
+def cached_page(
+    scopes: Callable[..., list[str]],
+    timeout: int = SNAPSHOT_TIMEOUT,
+) -> Callable:
+    """Caches the full response of a view for anonymous visitors, keyed by its URL.
+
+    Every page carries surrogate keys: the scopes its data comes from (e.g. `game:<id>`,
+    `player:<id>`, or `standings`), which are also sent in the `Surrogate-Key` header. A cached page
+    is only served while none of its scopes was bumped, so the tasks that change the data purge
+    exactly the pages built from it. Pages also carry an ETag built from the same versions (see
+    `conditional_page`), so unchanged pages are answered with `304 Not Modified`.
+
+    Args:
+        scopes (Callable): Returns the scopes of a page from the URL arguments of the view.
+        timeout (int): Seconds a page is kept for (`SNAPSHOT_TIMEOUT` by default).
+
+    Returns:
+        Callable: Decorator for the view.
+    """
+
+    def decorator(
+        view: Callable[..., HttpResponse],
+    ) -> Callable[..., HttpResponse]:
+        @wraps(view)
+        def wrapper(
+            request: HttpRequest,
+            *args,
+            **kwargs,
+        ) -> HttpResponse:
+            if request.method != "GET" or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+
+            page_scopes = scopes(*args, **kwargs)
+            versions = get_versions(page_scopes)
+            etag = version_etag(request.get_full_path(), versions)
+
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified["Surrogate-Key"] = " ".join(page_scopes)
+                return not_modified
+
+            url = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            key = snapshot_key(f"page:{url}", versions)
+
+            response = cache.get(key)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                response["Surrogate-Key"] = " ".join(page_scopes)
+
+                if (
+                    response.status_code == 200
+                    and not response.streaming
+                    and not response.cookies
+                ):
+                    response["ETag"] = etag
+                    cache.set(key, response, timeout)
+
+            return response
+
+        return wrapper
+
+    return decorator
@@ -1,14 +1,92 @@
-from collections import defaultdict
-from typing import Optional, Tuple
+import json
+from typing import Optional
 
 from django.core.paginator import Paginator
-from django.db.models import Q, Sum
-from django.db.models.functions import TruncDate
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.functions import Lower, TruncDate
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.urls import reverse
+
+from srl.cache import game_scope, get_versions, player_scope, snapshot
+from srl.leaderboard_view import (
+    HISTORY_FIELDS,
+    StandingsPaginator,
+    board_payload,
+    board_runs,
+    counted_runs,
+    country_standings,
+    featured_records,
+    history_games,
+    payload_runs,
+    player_history,
+    player_ids,
+    player_summary,
+    record_panels,
+    search_standings,
+)
+from srl.models import Games, Levels, NowStreaming, Players, Runs
+from website.template_backend import allow_queries
+
+# Seconds each section of the main page is cached for, on top of being rebuilt whenever its data
+# changes; the stream section also shows how long ago each stream started.
+HOME_TIMEOUTS = {"featured": 60 * 60, "latest": 60 * 10, "streams": 60}
+
+HISTORY_PAGE_SIZE = 100
+HISTORY_TYPES = {"fullgame": "main", "il": "il"}
+
+
+def game_page_scopes(
+    slug: str,
+    **kwargs,
+) -> list[str]:
+    """Returns the surrogate keys of a game's pages (see `cached_page`).
+
+    `update_standings` bumps the game's scope whenever its IL standings or records change, so the
+    pages do not depend on the global `standings` version. The pages also show the names and
+    flags of players, so they follow the `players` scope.
+    """
+    game_ids = snapshot(
+        "game_slugs",
+        ["games"],
+        lambda: dict(
+            Games.objects.annotate(lower_slug=Lower("slug")).values_list(
+                "lower_slug", "id"
+            )
+        ),
+    )
+
+    game_id = game_ids.get(slug.lower())
+    if game_id is None:
+        return ["games"]
 
-from srl.leaderboard_view import Leaderboard
-from srl.models import Games, NowStreaming, Players, Runs
+    return [game_scope(game_id), "players"]
+
+
+def player_page_scopes(
+    name: str,
+) -> list[str]:
+    """Returns the surrogate keys of a player's pages (see `cached_page`).
+
+    `update_standings` bumps the player's scope whenever their overall standing changes, so the
+    pages do not depend on the global `standings` version.
+    """
+    player_id = player_ids().get(name.lower())
+    if player_id is None:
+        return ["players"]
+
+    return [player_scope(player_id)]
+
+
+def player_history_scopes(
+    name: str,
+) -> list[str]:
+    """Returns the scopes of a player's JSON history (see `conditional_page`).
+
+    Besides the player's own scope, the history lists the slugs of games (`games`) and the names
+    of co-op partners (`players`).
+    """
+    return list(dict.fromkeys(player_page_scopes(name) + ["games", "players"]))
 
 
 def PlayerProfile(
@@ -29,43 +107,40 @@ def PlayerProfile(
         the context needed to dynamically generate the webpage.
     """
     try:
-        player = Players.objects.prefetch_related("awards").get(name__iexact=name)
+        player = (
+            Players.objects.select_related("countrycode")
+            .prefetch_related("awards")
+            .get(name__iexact=name)
+        )
     except Players.DoesNotExist:
         return render(request, "srl/resource_no_exist.html")
     except Exception:
         return render(request, "srl/500.html")
 
-    runs_query = (
+    # Every run of the player, from any seat, is read by a single query. For co-op categories,
+    # runners could be in any seat and it would count as different runs; `counted_runs` removes
+    # the slower ones so they do not count towards points.
+    player_runs: list[Runs] = list(
         Runs.objects.exclude(vid_status__in=["new", "rejected"])
         .select_related(
             "game",
             "player",
             "player2",
         )
-        .prefetch_related("player__awards")
         .defer(
             "variables",
             "platform",
             "description",
         )
+        .filter(run_players__player_id=player.id)
+        .filter(counted_runs(player.id), obsolete=False)
         .annotate(o_date=TruncDate("v_date"))
         .order_by("game__release", "subcategory", "-o_date")
     )
 
-    list_runs = list(runs_query.filter(player_id=player.id)) + list(
-        runs_query.filter(player2_id=player.id)
-    )
-
-    main_runs: list[Runs] = []
-    il_runs: list[Runs] = []
+    main_runs = [run for run in player_runs if run.runtype == "main"]
+    il_runs = [run for run in player_runs if run.runtype == "il"]
 
-    for run in list_runs:
-        if run.runtype == "main" and run.obsolete is False:
-            main_runs.append(run)
-        elif run.runtype == "il" and run.obsolete is False:
-            il_runs.append(run)
-
-    total_runs = len(list_runs)
     main_points = sum(run.points for run in main_runs)
     il_points = sum(run.points for run in il_runs)
     total_points = main_points + il_points
@@ -73,48 +148,11 @@ def PlayerProfile(
     # hidden_cats = VariableValues.objects.filter(hidden=True)
     # main_runs = main_runs.exclude(values__in=hidden_cats)
 
-    # For co-op categories, runners could be player 1 or player 2 and it
-    # would count as two different runs.
-    # This would remove the slower of the two and not count it towards points.
-
-    coop_runs: list[Runs] = [r for r in main_runs if "Co-Op" in r.subcategory]
-    best_coop: defaultdict[Tuple[str, int], Optional[Runs]] = defaultdict(lambda: None)
-
-    for run in coop_runs:
-        key = run.subcategory
-        if not best_coop[key] or run.points > best_coop[key].points:
-            best_coop[key] = run
-
-    best_ids = {run.id for run in best_coop.values()}
-    main_runs = [
-        r for r in main_runs if "Co-Op" not in r.subcategory or r.id in best_ids
-    ]
-
-    all_boards = Leaderboard(request, 3)
-
-    game_ids: list = [run.game.id for run in list_runs]
-    u_game_names: list[str, str] = (
-        Games.objects.only(
-            "id",
-            "name",
-            "release",
-            "slug",
-        )
-        .filter(id__in=game_ids)
-        .order_by("release")
-        .values_list(
-            "name",
-            "release",
-        )
+    u_game_names: list[tuple[str, str]] = list(
+        dict.fromkeys((run.game.name, run.game.release) for run in player_runs)
     )
 
-    player_rank = 0
-    for index, item in enumerate(all_boards):
-        if item["player"] == player.name:
-            player_rank = index + 1
-            break
-
-    player_count = len(all_boards)
+    summary = player_summary(player.id)
 
     award_set: list = []
     for award in player.awards.all():
@@ -127,24 +165,46 @@ def PlayerProfile(
         "main_points": main_points,
         "il_points": il_points,
         "total_points": total_points,
-        "total_runs": total_runs,
-        "player_rank": player_rank,
-        "player_count": player_count,
         "unique_game_names": u_game_names,
         "awards": award_set,
+        **summary,
     }
     return render(request, "srl/player_profile.html", context)
 
 
+def history_filters(
+    request: HttpRequest,
+    player: Players,
+) -> tuple[list[tuple[str, str, str]], Optional[str], Optional[str]]:
+    """Reads the game (`?game=<slug>`) and run type (`?type=fullgame|il`) filters of a history.
+
+    Args:
+        player (Players): The player whose history is being returned.
+
+    Returns:
+        tuple: Games of the player (see `history_games`), the ID of the selected game (None for
+        every game), and the selected run type (None for both).
+    """
+    games = history_games(player.id)
+
+    slug = request.GET.get("game", "").lower()
+    game_id = next((game[0] for game in games if game[1].lower() == slug), None)
+
+    runtype = HISTORY_TYPES.get(request.GET.get("type"))
+
+    return games, game_id, runtype
+
+
 def PlayerHistory(
     request: HttpRequest,
     name: str,
 ) -> HttpResponse:
     """View that gathers all of the information on a player's speedrun history.
 
-    This view processes practically all of the speedruns within the database belonging to the
-    specified player. This includes obsolete speedruns (those that are no longer ranked or have a
-    worse time versus their personal best).
+    This view processes the speedruns within the database belonging to the specified player, one
+    page at a time and newest first. This includes obsolete speedruns (those that are no longer
+    ranked or have a worse time versus their personal best). The history can be filtered by game
+    (`?game=<slug>`) and by run type (`?type=fullgame` or `?type=il`).
 
     Args:
         name (str): The display name of the player being returned.
@@ -154,86 +214,88 @@ def PlayerHistory(
         the context needed to dynamically generate the webpage.
     """
     try:
-        player = Players.objects.defer("awards").get(name__iexact=name)
+        player = (
+            Players.objects.select_related("countrycode")
+            .defer("awards")
+            .get(name__iexact=name)
+        )
     except Players.DoesNotExist:
         return render(request, "srl/resource_no_exist.html")
     except Exception:
         return render(request, "srl/500.html")
 
+    games, game_id, runtype = history_filters(request, player)
+
     runs_query = (
-        Runs.objects.exclude(vid_status__in=["new", "rejected"])
-        .select_related(
-            "game",
-            "player",
-            "player2",
-            "level",
-        )
+        player_history(player.id, game_id, runtype)
+        .select_related("game")
         .defer(
             "variables",
             "platform",
             "description",
         )
-        .filter(Q(player_id=player.id) | Q(player2_id=player.id))
         .annotate(o_date=TruncDate("date"))
-        .order_by("game__release", "subcategory", "-o_date")
     )
 
-    list_runs = list(runs_query.filter(player_id=player.id)) + list(
-        runs_query.filter(player2_id=player.id)
-    )
+    paginator = Paginator(runs_query, HISTORY_PAGE_SIZE)
+    history_page = paginator.get_page(request.GET.get("page"))
 
-    main_runs: list[Runs] = []
-    il_runs: list[Runs] = []
-
-    for run in list_runs:
-        if run.runtype == "main":
-            main_runs.append(run)
-        elif run.runtype == "il":
-            il_runs.append(run)
-
-    # For co-op categories, runners could be player 1 or player 2 and it
-    # would count as two different runs.
-    # This would remove the slower of the two and not count it towards points.
-
-    coop_runs: list[Runs] = [r for r in main_runs if "Co-Op" in r.subcategory]
-    best_coop: defaultdict[Tuple[str, int], Optional[Runs]] = defaultdict(lambda: None)
-
-    for run in coop_runs:
-        key = run.subcategory
-        if not best_coop[key] or run.points > best_coop[key].points:
-            best_coop[key] = run
-
-    best_ids = {run.id for run in best_coop.values()}
-    main_runs = [
-        r for r in main_runs if "Co-Op" not in r.subcategory or r.id in best_ids
-    ]
-
-    game_ids: list = [run.game.id for run in list_runs]
-    u_game_names: list[str, str] = (
-        Games.objects.only(
-            "id",
-            "name",
-            "release",
-            "slug",
-        )
-        .filter(id__in=game_ids)
-        .order_by("release")
-        .values_list(
-            "name",
-            "release",
-        )
+    # Within a page, runs are grouped by game (and subcategory) while staying newest first.
+    page_runs: list[Runs] = sorted(
+        history_page,
+        key=lambda run: (run.game.release, run.subcategory or ""),
     )
 
     context = {
         "player": player,
-        "main_runs": main_runs,
-        "il_runs": il_runs,
-        "unique_game_names": u_game_names,
+        "main_runs": [run for run in page_runs if run.runtype == "main"],
+        "il_runs": [run for run in page_runs if run.runtype == "il"],
+        "history_games": games,
+        "history_page": history_page,
+        "selected_game": request.GET.get("game", "") if game_id else "",
+        "selected_type": request.GET.get("type", "") if runtype else "",
     }
 
     return render(request, "srl/player_profile.html", context)
 
 
+def PlayerHistoryJSON(
+    request: HttpRequest,
+    name: str,
+) -> HttpResponse:
+    """Streams the entire speedrun history of a player as a JSON array.
+
+    Runs are read from the database in chunks and written to the response as they arrive, so the
+    full history is never held in memory. Accepts the same filters as `PlayerHistory`.
+
+    Args:
+        name (str): The display name of the player being returned.
+
+    Returns:
+        StreamingHttpResponse: JSON array of every run (as dictionaries of `HISTORY_FIELDS`).
+    """
+    try:
+        player = Players.objects.only("id").get(name__iexact=name)
+    except Players.DoesNotExist:
+        return JsonResponse({"ERROR": "Player does not exist."}, status=404)
+
+    _, game_id, runtype = history_filters(request, player)
+
+    runs = (
+        player_history(player.id, game_id, runtype)
+        .values(*HISTORY_FIELDS)
+        .iterator(chunk_size=HISTORY_PAGE_SIZE)
+    )
+
+    def stream():
+        yield "["
+        for index, run in enumerate(runs):
+            yield ("," if index else "") + json.dumps(run, cls=DjangoJSONEncoder)
+        yield "]"
+
+    return StreamingHttpResponse(stream(), content_type="application/json")
+
+
 def FG_Leaderboard(
     request: HttpRequest,
 ) -> HttpResponse:
@@ -246,22 +308,37 @@ def FG_Leaderboard(
         render (request, template, context): Request is sent to a specific template, which includes
         the context needed to dynamically generate the webpage.
     """
-    leaderboard = Leaderboard(request, 1)
-
-    paginator = Paginator(leaderboard, 50)
+    paginator = StandingsPaginator("main")
     page_number = request.GET.get("page")
     leaderboard_page = paginator.get_page(page_number)
-    rank_start = leaderboard_page.start_index()
-
-    for item in leaderboard_page:
-        item["rank"] = rank_start
-        rank_start += 1
 
     context = {"leaderboard": leaderboard_page}
 
     return render(request, "srl/leaderboard.html", context)
 
 
+def CountryLeaderboard(
+    request: HttpRequest,
+) -> HttpResponse:
+    """View that displays the combined points of every country and its best runners.
+
+    Countries are read from the materialized country standings (see `country_standings`), so the
+    page does not depend on the number of runs or players.
+
+    Returns:
+        render (request, template, context): Request is sent to a specific template, which includes
+        the context needed to dynamically generate the webpage.
+    """
+    runtype = "main" if request.GET.get("type") == "fullgame" else "all"
+
+    context = {
+        "countries": country_standings(runtype),
+        "runtype": runtype,
+    }
+
+    return render(request, "srl/country_leaderboard.html", context)
+
+
 def IL_Leaderboard(
     request: HttpRequest,
     slug: str,
@@ -285,16 +362,9 @@ def IL_Leaderboard(
     except Exception:
         return render(request, "srl/500.html")
 
-    leaderboard = Leaderboard(request, 2, slug)
-
-    paginator = Paginator(leaderboard, 50)
+    paginator = StandingsPaginator("il", game.id)
     page_number = request.GET.get("page")
     leaderboard_page = paginator.get_page(page_number)
-    rank_start = leaderboard_page.start_index()
-
-    for item in leaderboard_page:
-        item["rank"] = rank_start
-        rank_start += 1
 
     slug_map = {
         "thpsce": "THPS CE",
@@ -318,73 +388,18 @@ def IL_Leaderboard(
 def search_leaderboard(
     request: HttpRequest,
 ) -> HttpResponse:
-    """Used in cases when a leaderboard is paginated; this will allow you to look up a runner"""
-    search_query = request.GET.get("search", "")
-    players_all = (
-        Players.objects.select_related("countrycode")
-        .only(
-            "id",
-            "name",
-            "nickname",
-            "countrycode",
-        )
-        .all()
-    )
-    players = players_all.filter(name__icontains=search_query)
-
-    leaderboard_all = []
-    leaderboard = []
-
-    for player in players_all:
-        main_points = (  #
-            Runs.objects.exclude(vid_status__in=["new", "rejected"])
-            .only("points")
-            .filter(
-                runtype="main",
-                obsolete=False,
-                points__gt=0,
-            )
-            .filter(Q(player_id=player.id) | Q(player2_id=player.id))
-            .aggregate(total_points=Sum("points"))
-        )["total_points"]
-
-        il_points = (  #
-            Runs.objects.exclude(vid_status__in=["new", "rejected"])
-            .only("points")
-            .filter(
-                runtype="il",
-                obsolete=False,
-                player_id=player.id,
-                points__gt=0,
-            )
-            .aggregate(total_points=Sum("points"))
-        )["total_points"]
-
-        all_points = main_points + il_points
+    """Used in cases when a leaderboard is paginated; this will allow you to look up a runner.
 
-        leaderboard_all.append(
-            {
-                "player": player,
-                "countrycode": player.countrycode.id if player.countrycode else None,
-                "total_points": all_points,
-            }
-        )
-
-    leaderboard_all = sorted(
-        leaderboard_all, key=lambda x: x["total_points"], reverse=True
-    )
-
-    for rank, item in enumerate(leaderboard_all, start=1):
-        if item["player"].name in players.values_list("name", flat=True):
+    Returns up to `limit` (default 25, maximum 100) players whose name or nickname starts with
+    `search`, along with their overall rank.
+    """
+    search_query = request.GET.get("search", "")
+    try:
+        limit = min(int(request.GET.get("limit", 25)), 100)
+    except ValueError:
+        limit = 25
 
-            if all_points > 0:
-                leaderboard_item = {
-                    "player": item["player"].name,
-                    "total_points": item["total_points"],
-                    "countrycode": item["countrycode"],
-                    "rank": rank,
-                }
-                leaderboard.append(leaderboard_item)
+    leaderboard = search_standings(search_query, max(limit, 1))
 
     return JsonResponse(leaderboard, safe=False)
 
@@ -397,114 +412,49 @@ def ILGameLeaderboard(
     """View that displays a leaderboard for a specific game that supports individual levels.
 
     This view gathers the speedruns and players for a specified game and ranks them in a leaderboard
-    that includes their points, when they achieved the run, and other metadata.
+    that includes their points, when they achieved the run, and other metadata. The runs are read
+    from the IL payload precomputed for the game (see `board_payload`); only the runs of the
+    selected subcategory are sent with the page.
 
     Args:
         slug (str): The slug (abbreviation) for a game from the `Games` model.
-            - When set to `thps4`, it will render an "extended" leaderboard.
-        category (str): None by default. Currently unused.
+            - Games with IL record panels (`Games.il_records`) render an "extended" leaderboard.
+        category (str): None by default. Subcategory selected when the page loads (also read from
+            the `subcategory` query parameter); the first subcategory when not given.
 
     Returns:
         render (request, template, context): Request is sent to a specific template, which includes
         the context needed to dynamically generate the webpage.
     """
     try:
-        game = Games.objects.only("id").get(slug__iexact=slug)
-        ilruns = (
-            Runs.objects.exclude(vid_status__in=["new", "rejected"])
-            .select_related(
-                "game",
-                "player",
-                "player__countrycode",
-            )
-            .defer(
-                "variables",
-                "platform",
-                "description",
-            )
-            .filter(
-                runtype="il",
-                game_id=game.id,
-                points__gt=0,
-                obsolete=False,
-            )
-        )
+        game = Games.objects.only("id", "il_records").get(slug__iexact=slug)
+        payload = board_payload(game.id, "il")
     except Games.DoesNotExist:
         return render(request, "srl/resource_no_exist.html")
     except Exception:
         return render(request, "srl/500.html")
 
-    if "thps4/ils" in request.path_info:
-        lb_output = Leaderboard(request, 4, slug)
-
-        if isinstance(lb_output, tuple):
-            wr_count = lb_output[0]
-            old_runs = lb_output[1]
+    if game.il_records:
+        wr_count, old_runs = record_panels(game.id)
+        exempt_levels = list(
+            Levels.objects.filter(game=game, records_exempt=True).values_list(
+                "name", flat=True
+            )
+        )
     else:
         wr_count = None
         old_runs = None
+        exempt_levels = None
 
-    runs_list = []
+    # Only the runs of the selected (or first) subcategory are sent with the page; the others are
+    # loaded from `ILBoard` when they are selected.
+    il_categories = payload["subcategories"]
+    selected = category or request.GET.get("subcategory")
+    if selected not in il_categories:
+        selected = il_categories[0] if il_categories else None
 
-    if category is None:
-        il_categories = sorted(
-            [
-                subcategory[0]
-                for subcategory in ilruns.values_list("subcategory").distinct()
-            ]
-        )
-
-        for run in ilruns:
-            if run.player is not None:
-                defaulttime = run.game.idefaulttime
-
-                if defaulttime == "realtime":
-                    run_time = run.time
-                elif defaulttime == "realtime_noloads":
-                    run_time = run.timenl
-                elif defaulttime == "ingame":
-                    run_time = run.timeigt
-
-                # Sometimes the defaulttime of a game doesn't line up.
-                # This code will iterate through the time, timenl and timeigt variables to
-                # find one that does not equal 0.
-                # Obviously there will be niche scenarios where one is
-                # more preferred over the other, but will revist this
-                if run_time == "0":
-                    times = [
-                        (run.time, "realtime"),
-                        (run.timenl, "realtime_noloads"),
-                        (run.timeigt, "ingame"),
-                    ]
-
-                    run_time, defaulttime = next(
-                        ((time, label) for time, label in times if time != "0"),
-                        ("0", None),
-                    )
-
-                run_add = {
-                    "player": run.player.name,
-                    "nickname": run.player.nickname,
-                    "countrycode": (
-                        run.player.countrycode.id if run.player.countrycode else None
-                    ),
-                    "countryname": (
-                        run.player.countrycode.name if run.player.countrycode else None
-                    ),
-                    "place": run.place,
-                    "defaulttime": defaulttime,
-                    "time": run_time,
-                    "points": run.points,
-                    "date": run.date,
-                    "subcategory": run.subcategory,
-                    "url": run.url,
-                    "video": run.video,
-                    "other_video": run.arch_video,
-                }
-
-            runs_list.append(run_add)
-
-    leaderboard = sorted(runs_list, key=lambda x: x["place"], reverse=False)
+    leaderboard = payload_runs(payload, [selected])
+    board_url = reverse("ILBoard", args=[slug])
 
     slug_map = {
         "thpsce": "THPS CE",
@@ -522,12 +472,15 @@ def ILGameLeaderboard(
             "runs": leaderboard,
             "wr_count": wr_count,
             "old_runs": old_runs,
+            "exempt_levels": exempt_levels,
             "subcategories": il_categories,
             "game_slug": slug,
             "selected_category": category,
+            "selected_subcategory": selected,
+            "board_url": board_url,
         }
 
-        if "thps4/ils" in request.path_info:
+        if game.il_records:
             return render(request, "srl/il_leaderboard_expanded.html", context)
         else:
             return render(request, "srl/il_leaderboard.html", context)
@@ -539,6 +492,33 @@ def ILGameLeaderboard(
         return render(request, "srl/unavailable.html", context)
 
 
+def ILBoard(
+    request: HttpRequest,
+    slug: str,
+) -> HttpResponse:
+    """Returns the IL runs of a single subcategory (level) of a game, as JSON.
+
+    Used by the IL leaderboard pages to load a subcategory once it is selected.
+
+    Args:
+        slug (str): The slug (abbreviation) for a game from the `Games` model.
+
+    Returns:
+        JsonResponse: The subcategory and its runs (as dictionaries of `BOARD_FIELDS`), ordered by
+        place.
+    """
+    subcategory = request.GET.get("subcategory", "")
+
+    try:
+        game = Games.objects.only("id").get(slug__iexact=slug)
+    except Games.DoesNotExist:
+        return JsonResponse({"ERROR": "Game does not exist."}, status=404)
+
+    runs = payload_runs(board_payload(game.id, "il"), [subcategory])
+
+    return JsonResponse({"subcategory": subcategory, "runs": runs})
+
+
 def GameLeaderboard(
     request: HttpRequest,
     slug: str,
@@ -547,11 +527,12 @@ def GameLeaderboard(
     """View that displays a leaderboard for a specific game that supports full game speedruns.
 
     This view gathers the `Runs` and `Players` for a specified game and ranks them in a leaderboard
-    that includes their points, when they achieved the run, and other metadata.
+    that includes their points, when they achieved the run, and other metadata. The runs are read
+    from the full-game payload precomputed for the game (see `board_runs`).
 
     Args:
         slug (str): The slug (abbreviation) for a game from the `Games` model.
-        category (str): None by default. Currently unused.
+        category (str): None by default. Only shows the runs of this subcategory when given.
 
     Returns:
         render (request, template, context): Request is sent to a specific template, which includes
@@ -559,142 +540,12 @@ def GameLeaderboard(
     """
     try:
         game = Games.objects.only("id").get(slug__iexact=slug)
-        mainruns = (
-            Runs.objects.exclude(vid_status__in=["new", "rejected"])
-            .select_related(
-                "game",
-                "player",
-                "player__countrycode",
-                "player2",
-                "player2__countrycode",
-            )
-            .defer(
-                "variables",
-                "platform",
-                "description",
-            )
-            .filter(
-                runtype="main",
-                game_id=game.id,
-                points__gt=0,
-                obsolete=False,
-            )
-        )
-        # hidden_cats = VariableValues.objects.filter(hidden=True)
-        # mainruns = mainruns.exclude(values__in=hidden_cats)
+        categories, leaderboard = board_runs(game.id, "main", category)
     except Games.DoesNotExist:
         return render(request, "srl/resource_no_exist.html")
     except Exception:
         return render(request, "srl/500.html")
 
-    runs_list = []
-
-    if category is None:
-        categories = sorted(
-            [
-                subcategory[0]
-                for subcategory in mainruns.values_list("subcategory").distinct()
-            ]
-        )
-
-        for run in mainruns:
-            defaulttime = run.game.defaulttime
-
-            if defaulttime == "realtime":
-                run_time = run.time
-            elif defaulttime == "realtime_noloads":
-                run_time = run.timenl
-            elif defaulttime == "ingame":
-                run_time = run.timeigt
-
-            # Sometimes the defaulttime of a game doesn't line up.
-            # This code will iterate through the time, timenl and timeigt variables to
-            # find one that does not equal 0.
-            # Obviously there will be niche scenarios where one is
-            # more preferred over the other, but will revist this
-            if run_time == "0":
-                times = [
-                    (run.time, "realtime"),
-                    (run.timenl, "realtime_noloads"),
-                    (run.timeigt, "ingame"),
-                ]
-
-                run_time, defaulttime = next(
-                    ((time, label) for time, label in times if time != "0"), ("0", None)
-                )
-
-            run_add = {
-                "place": run.place,
-                "defaulttime": defaulttime,
-                "time": run_time,
-                "points": run.points,
-                "date": run.date,
-                "subcategory": run.subcategory,
-                "url": run.url,
-                "video": run.video,
-                "other_video": run.arch_video,
-            }
-
-            # This code will be cleaned up with the Players Through-Model rework.
-            if run.player:
-                run_add.update(
-                    {
-                        "player": run.player.name,
-                        "nickname": run.player.nickname,
-                        "countrycode": (
-                            run.player.countrycode.id
-                            if run.player.countrycode
-                            else None
-                        ),
-                        "countryname": (
-                            run.player.countrycode.name
-                            if run.player.countrycode
-                            else None
-                        ),
-                    }
-                )
-            else:
-                run_add.update(
-                    {
-                        "player": "Anonymous",
-                        "nickname": None,
-                        "countrycode": None,
-                        "countryname": None,
-                    }
-                )
-
-            if "co-op" in run.subcategory.lower():
-                if run.player2:
-                    run_add.update(
-                        {
-                            "player2": run.player2.name,
-                            "player2nickname": run.player2.nickname,
-                            "countrycode2": (
-                                run.player2.countrycode.id
-                                if run.player2.countrycode
-                                else None
-                            ),
-                            "countryname2": (
-                                run.player2.countrycode.name
-                                if run.player2.countrycode
-                                else None
-                            ),
-                        }
-                    )
-                else:
-                    run_add.update(
-                        {
-                            "player2": "Anonymous",
-                            "player2nickname": None,
-                            "countrycode2": None,
-                            "countryname2": None,
-                        }
-                    )
-
-            runs_list.append(run_add)
-
-        leaderboard = sorted(runs_list, key=lambda x: x["place"], reverse=False)
-
     slug_map = {
         "thpsce": "THPS CE",
         "thps4ce": "THPS4 CE",
@@ -728,112 +579,18 @@ def MainPage(
 ) -> HttpResponse:
     """View that displays the main page for the entire website/project.
 
-    This view gathers the world records, most recent speedruns/world records, and those currently
-    marked as streaming, then returns it to be dynamically rendered.
+    This view gathers the world records of the featured boards, most recent speedruns/world
+    records, and those currently marked as streaming, then returns it to be dynamically rendered.
 
     Returns:
         render (request, template, context): Request is sent to a specific template, which includes
         the context needed to dynamically generate the webpage.
     """
-    subcategories = [
-        "Any%",
-        "Any% (Console)",
-        "Any% (6th Gen)",
-        "100%",
-        "100% (Console)",
-        "Any% (No Major Glitches)",
-        "All Goals & Golds (No Major Glitches)",
-        "All Goals & Golds (All Careers)",
-        "All Goals & Golds (6th Gen)",
-        "Any% (6th Gen, Normal)",
-        "100% (Normal)",
-        "Any% (Beginner)",
-        "100% (NSR)",
-        "Story (Easy, NG+)",
-        "100% (NG)",
-        "Classic (Normal, NG+)",
-        "Story Mode (Easy, NG+)",
-        "Classic Mode (Normal)",
-        "Any% (360/PS3)",
-        "100% (360/PS3)",
-        "Any% Tour Mode (All Tours, New Game)",
-        "All Goals & Golds (All Tours, New Game)",
-    ]
-
-    exempt_games = [
-        "GBA",
-        "PSP",
-        "GBC",
-        "Category Extensions",
-        "Remix",
-        "Sk8land",
-        "HD",
-        "2x",
-    ]
-
-    exclusion_filter = Q()
-    run_list = []
-    wrs_data = []
-    runs_data = []
-
-    for game in exempt_games:
-        exclusion_filter |= Q(game__name__icontains=game)
-
     streamers = NowStreaming.objects.select_related(
         "streamer",
         "streamer__countrycode",
         "game",
     ).all()
-    runs = (
-        Runs.objects.exclude(vid_status__in=["new", "rejected"], obsolete=True)
-        .exclude(exclusion_filter)
-        .select_related(
-            "game",
-            "player",
-            "player__countrycode",
-        )
-        .defer(
-            "variables",
-            "platform",
-            "description",
-        )
-        .filter(runtype="main", place=1, subcategory__in=subcategories)
-        .order_by("-subcategory")
-        .annotate(o_date=TruncDate("date"))
-    )
-
-    # Next blocks of code are checks to group runs together within the same game and subcategory.
-    # In some circumstances, world records are ties.
-    # This makes it so it display properly on the main page (as opposed to two rows,
-    # they are on a combined row).
-    grouped_runs = []
-    seen_records = set()
-
-    for run in runs:
-        key = (run.game.slug, run.subcategory, run.time)
-        if key not in seen_records:
-            grouped_runs.append(
-                {
-                    "game": run.game,
-                    "subcategory": run.subcategory,
-                    "time": run.time,
-                    "players": [],
-                }
-            )
-            seen_records.add(key)
-
-        for record in grouped_runs:
-            if (
-                record["game"].slug == run.game.slug
-                and record["subcategory"] == run.subcategory
-                and record["time"] == run.time
-            ):
-                record["players"].append(
-                    {"player": run.player, "url": run.url, "date": run.o_date}
-                )
-
-    # Sorts runs within the run_list by the game release date, oldest first.
-    run_list = sorted(grouped_runs, key=lambda x: x["game"].release, reverse=False)
 
     # Sometimes v_date (verify_date) is null; this can happen if the runs on a leaderboard are
     # super old. Essentially grabs the newest 5 runs for WRs (place=1) and PBs (place>1).
@@ -869,17 +626,35 @@ def MainPage(
         .order_by("-v_date")
     )[:5]
 
-    for pb in pbs:
-        runs_data.append(pb)
-
-    for wr in wrs:
-        wrs_data.append(wr)
+    # Every section of the page is cached as a rendered fragment, keyed by the versions of the data
+    # it shows. Every section is only built when the template calls it, so nothing is queried for a
+    # section whose fragment is cached.
+    streams_version, featured_version, main_version, il_version = get_versions(
+        ["streams", "featured", "main", "il"]
+    )
+    fragments = {
+        "featured": {
+            "timeout": HOME_TIMEOUTS["featured"],
+            "version": f"{featured_version}.{main_version}",
+        },
+        "latest": {
+            "timeout": HOME_TIMEOUTS["latest"],
+            "version": f"{main_version}.{il_version}",
+        },
+        "streams": {
+            "timeout": HOME_TIMEOUTS["streams"],
+            "version": streams_version,
+        },
+    }
 
     context = {
-        "streamers": streamers,
-        "runs": run_list,
-        "new_runs": runs_data,
-        "new_wrs": wrs_data,
+        "streamers": allow_queries(lambda: list(streamers)),
+        "runs": allow_queries(
+            lambda: snapshot("featured", ["main", "featured"], featured_records)
+        ),
+        "new_runs": allow_queries(lambda: list(pbs)),
+        "new_wrs": allow_queries(lambda: list(wrs)),
+        "fragments": fragments,
     }
 
     return render(request, "srl/main.html", context)
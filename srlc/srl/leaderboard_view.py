@@ -1,11 +1,86 @@
 from datetime import date
 from typing import Any, Optional
 
-from django.core.paginator import Paginator
+from django.core.paginator import Page, Paginator
+from django.db.models import Count, Exists, F, OuterRef, Q, QuerySet, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
-
-from srl.models import Players, Runs
+from django.utils.functional import cached_property
+
+from srl.cache import game_scope, player_scope, snapshot
+from srl.models import (
+    CountryStandings,
+    Games,
+    Players,
+    RunPlayers,
+    Runs,
+    Standings,
+    WorldRecords,
+)
+
+RUN_FIELDS = [
+    "game_id",
+    "runtype",
+    "game__defaulttime",
+    "game__idefaulttime",
+    "place",
+    "time",
+    "timenl",
+    "timeigt",
+    "points",
+    "date",
+    "subcategory",
+    "url",
+    "video",
+    "arch_video",
+    "player__name",
+    "player__nickname",
+    "player__countrycode_id",
+    "player__countrycode__name",
+    "player2__name",
+    "player2__nickname",
+    "player2__countrycode_id",
+    "player2__countrycode__name",
+]
+BOARD_FIELDS = [
+    "place",
+    "defaulttime",
+    "time",
+    "points",
+    "date",
+    "subcategory",
+    "url",
+    "video",
+    "other_video",
+    "player",
+    "nickname",
+    "countrycode",
+    "countryname",
+    "player2",
+    "player2nickname",
+    "countrycode2",
+    "countryname2",
+]
+HISTORY_FIELDS = [
+    "id",
+    "game__slug",
+    "runtype",
+    "subcategory",
+    "place",
+    "time",
+    "timenl",
+    "timeigt",
+    "points",
+    "date",
+    "obsolete",
+    "url",
+    "video",
+    "arch_video",
+    "player__name",
+    "player2__name",
+]
+EMPTY_BOARD = {"subcategories": [], "runs": {}}
 
 
 def get_country_info(
@@ -17,35 +92,425 @@ def get_country_info(
     return None, None
 
 
-def get_main_points(
+def counted_runs(
+    player: OuterRef | str,
+    run: str = "",
+) -> Q:
+    """Returns a filter for the runs of a player that count towards their points.
+
+    A player can be in any seat of a co-op board, so they can have more than one non-obsolete
+    run on it (e.g. one in the first seat and one in the second). Only their best run (by points,
+    then by the oldest ID) on a co-op board counts; every run on any other board counts.
+
+    Args:
+        player (OuterRef | str): ID of the player, or `OuterRef("player_id")` to check every seat
+            of a `RunPlayers` queryset against its own player.
+        run (str): Empty by default. Path to the run from the filtered model (`run__` when used on
+            a `RunPlayers` queryset).
+
+    Returns:
+        Q: Filter (or annotation) to be used on a `Runs` (or `RunPlayers`) queryset.
+    """
+    better = (
+        Runs.objects.exclude(vid_status__in=["new", "rejected"])
+        .filter(
+            board_id=OuterRef(f"{run}board_id"),
+            obsolete=False,
+            run_players__player_id=player,
+        )
+        .filter(
+            Q(points__gt=OuterRef(f"{run}points"))
+            | Q(points=OuterRef(f"{run}points"), id__lt=OuterRef(f"{run}id"))
+        )
+    )
+
+    return Q(**{f"{run}board__coop": False}) | ~Exists(better)
+
+
+def counted_seats(
+    seat: str = "",
+    run: str = "run__",
+) -> Q:
+    """Returns a filter for the seats that earn the points of their run.
+
+    Every seat of a run on a co-op board counts. On any other board, only the first seat counts
+    for an IL run and the first two (`player` and `player2`) for a full-game run.
+
+    Args:
+        seat (str): Empty by default. Path to the seat from the filtered model (`run_players__`
+            when used on a `Runs` queryset).
+        run (str): `run__` by default. Path to the run from the filtered model (empty when used
+            on a `Runs` queryset).
+
+    Returns:
+        Q: Filter to be used on a `RunPlayers` (or `Runs`) queryset.
+    """
+    return (
+        Q(**{f"{run}board__coop": True})
+        | Q(**{f"{seat}seat": 1})
+        | Q(**{f"{seat}seat": 2, f"{run}runtype": "main"})
+    )
+
+
+def ranked_runs() -> QuerySet[Runs]:
+    """Returns every run that counts towards the points leaderboards."""
+    return Runs.objects.exclude(
+        vid_status__in=["new", "rejected"],
+        place=0,
+    ).filter(obsolete=False)
+
+
+def seat_points(
+    seats: QuerySet[RunPlayers],
+) -> Coalesce:
+    """Returns the sum of the points of the runs the outer player has a seat in (0 if none)."""
+    return Coalesce(
+        Subquery(
+            seats.filter(player_id=OuterRef("id"))
+            .order_by()
+            .values("player_id")
+            .annotate(total=Sum("run__points"))
+            .values("total")
+        ),
+        0,
+    )
+
+
+def player_points(
+    runs: QuerySet[Runs],
+) -> QuerySet[Players]:
+    """Annotates every player with their points from `runs`, summed by the database.
+
+    Every player is returned from a single query with `main_points` (following `counted_runs`),
+    `il_points`, and `total_points`, counting the seats that earn points (see `counted_seats`).
+
+    Args:
+        runs (QuerySet[Runs]): Runs that count towards the leaderboard.
+
+    Returns:
+        QuerySet[Players]: Annotated players, with their country joined in.
+
+    Called Functions:
+        - `counted_runs`
+        - `counted_seats`
+        - `seat_points`
+    """
+    seats = RunPlayers.objects.filter(counted_seats(), run__in=runs)
+
+    return (
+        Players.objects.only(
+            "id",
+            "name",
+            "countrycode",
+            "nickname",
+        )
+        .select_related("countrycode")
+        .annotate(
+            main_points=seat_points(
+                seats.filter(
+                    counted_runs(OuterRef("player_id"), "run__"),
+                    run__runtype="main",
+                )
+            ),
+            il_points=seat_points(seats.filter(run__runtype="il")),
+            total_points=F("main_points") + F("il_points"),
+        )
+    )
+
+
+def get_player_rank(
     player: Players,
-    runs_list: list[Runs],
-) -> int:
-    runs = [
-        run
-        for run in runs_list
-        if (run.player and run.player.id == player.id)
-        or (run.player2 and run.player2.id == player.id)
+    runtype: str = "all",
+    game: str = None,
+) -> tuple[int, int]:
+    """Returns the rank of a player and the number of ranked players on a leaderboard.
+
+    Both are read from `Standings` through its unique indexes, so the lookup does not depend on
+    the size of the community.
+
+    Args:
+        player (Players): The player being looked up.
+        runtype (str): `all` (default), `main`, or `il`.
+        game (str): None by default. ID of the game for IL leaderboards.
+
+    Returns:
+        tuple[int, int]: Rank of the player (0 if they have no points) and the player count.
+    """
+    standings = Standings.objects.filter(runtype=runtype, game_id=game)
+
+    rank = standings.filter(player=player).values_list("rank", flat=True).first()
+    count = standings.order_by("-rank").values_list("rank", flat=True).first()
+
+    return rank or 0, count or 0
+
+
+def player_ids() -> dict[str, str]:
+    """Returns the ID of every player by their lowercased ID and lowercased name.
+
+    The map is cached until a player is next saved or deleted (the `players` scope), so pages can
+    resolve their scopes without a query.
+    """
+    return snapshot(
+        "player_ids",
+        ["players"],
+        lambda: {
+            key.lower(): player
+            for player, name in Players.objects.values_list("id", "name")
+            for key in [player, name]
+        },
+    )
+
+
+def player_summary(
+    player: str,
+) -> dict[str, int]:
+    """Returns the statistics block of a player's profile.
+
+    The block is cached per player through `player_scope`, and rebuilt only after one of their
+    runs is saved or deleted or after their overall standing changes (see `update_standings`).
+
+    Args:
+        player (str): ID of the player.
+
+    Returns:
+        dict[str, int]: Number of runs, overall rank, and the number of ranked players.
+    """
+
+    def build() -> dict[str, int]:
+        rank, count = get_player_rank(player)
+
+        return {
+            "total_runs": Runs.objects.exclude(vid_status__in=["new", "rejected"])
+            .filter(run_players__player_id=player)
+            .count(),
+            "player_rank": rank,
+            "player_count": count,
+        }
+
+    return snapshot(f"profile:{player}", [player_scope(player)], build)
+
+
+def player_history(
+    player: str,
+    game: str = None,
+    runtype: str = None,
+) -> QuerySet[Runs]:
+    """Returns every run a player submitted (obsolete ones included), newest first.
+
+    Runs are read in order through the `(player, -date, -run)` index of `RunPlayers`, whatever
+    the seat of the player. Slower co-op runs that do not count towards points (see
+    `counted_runs`) are left out.
+
+    Args:
+        player (str): ID of the player.
+        game (str): None by default. Only returns the runs of this game when given.
+        runtype (str): None by default. Only returns `main` or `il` runs when given.
+
+    Returns:
+        QuerySet[Runs]: Runs of the player, ordered by their submitted date.
+    """
+    runs = (
+        Runs.objects.exclude(vid_status__in=["new", "rejected"])
+        .filter(run_players__player_id=player)
+        .filter(Q(runtype="il") | Q(obsolete=True) | counted_runs(player))
+    )
+
+    if game:
+        runs = runs.filter(game_id=game)
+    if runtype:
+        runs = runs.filter(runtype=runtype)
+
+    return runs.order_by("-run_players__date", "-run_players__run")
+
+
+def history_games(
+    player: str,
+) -> list[tuple[str, str, str]]:
+    """Returns every game a player has runs in, cached through `player_scope`.
+
+    Args:
+        player (str): ID of the player.
+
+    Returns:
+        list[tuple[str, str, str]]: ID, slug, and name of every game, by release date.
+    """
+    return snapshot(
+        f"history_games:{player}",
+        [player_scope(player)],
+        lambda: list(
+            Games.objects.filter(
+                id__in=Runs.objects.exclude(vid_status__in=["new", "rejected"])
+                .filter(run_players__player_id=player)
+                .values("game_id")
+            )
+            .order_by("release")
+            .values_list("id", "slug", "name")
+        ),
+    )
+
+
+def search_standings(
+    query: str,
+    limit: int = 25,
+    runtype: str = "all",
+    game: str = None,
+) -> list[dict[str, str | int | None]]:
+    """Returns the players whose name or nickname starts with `query`, along with their rank.
+
+    Players are matched through the prefix indexes of their name and nickname and joined to
+    `Standings` in a single query, best rank first.
+
+    Args:
+        query (str): Case-insensitive text to search for.
+        limit (int): 25 by default. Maximum number of players returned.
+        runtype (str): `all` (default), `main`, or `il`.
+        game (str): None by default. ID of the game for IL leaderboards.
+
+    Returns:
+        list[dict]: Player name, nickname, country code, total points, and rank of every match.
+    """
+    standings = (
+        Standings.objects.filter(runtype=runtype, game_id=game)
+        .filter(
+            Q(player__name__istartswith=query) | Q(player__nickname__istartswith=query)
+        )
+        .order_by("rank")
+        .values_list(
+            "player__name",
+            "player__nickname",
+            "player__countrycode_id",
+            "points",
+            "rank",
+        )[:limit]
+    )
+
+    return [
+        {
+            "player": player,
+            "nickname": nickname,
+            "countrycode": countrycode,
+            "total_points": points,
+            "rank": rank,
+        }
+        for player, nickname, countrycode, points, rank in standings
     ]
 
-    coop_runs = [run for run in runs if "Co-Op" in run.subcategory]
-    if len(coop_runs) > 1:
-        best_coop = sorted(coop_runs, key=lambda x: x.points, reverse=True)[:1]
-        best_ids = {run.id for run in best_coop}
-        runs = [
-            run for run in runs if "Co-Op" not in run.subcategory or run.id in best_ids
-        ]
 
-    return sum(run.points for run in runs)
+def standings_page(
+    runtype: str,
+    game: str = None,
+    cursor: int = 0,
+    limit: int = 50,
+) -> dict[str, Any]:
+    """Returns the players ranked right after `cursor` on one leaderboard of `Standings`.
 
+    The cursor is the rank of the last player of the previous page, so every page is an index range
+    scan of `unique_standing_rank`, however deep it is.
 
-def get_il_points(
-    player: Players,
-    runs_list: list[Runs],
-) -> int:
-    il_runs = [run for run in runs_list if (run.player and run.player.id == player.id)]
+    Args:
+        runtype (str): `all`, `main`, or `il`.
+        game (str): None by default. ID of the game for IL leaderboards.
+        cursor (int): 0 by default (first page). Rank to start after.
+        limit (int): 50 by default. Maximum number of players returned.
+
+    Returns:
+        dict: Number of ranked players (`count`), the cursor of the next page (`next`, None on the
+            last page), and the rank, name, nickname, country code, and points of every player
+            (`results`).
+    """
+    standings = Standings.objects.filter(runtype=runtype, game_id=game)
+
+    count = standings.order_by("-rank").values_list("rank", flat=True).first() or 0
+    results = [
+        {
+            "rank": rank,
+            "player": player,
+            "nickname": nickname,
+            "countrycode": countrycode,
+            "points": points,
+        }
+        for rank, player, nickname, countrycode, points in standings.filter(
+            rank__gt=cursor, rank__lte=cursor + limit
+        )
+        .order_by("rank")
+        .values_list(
+            "rank",
+            "player__name",
+            "player__nickname",
+            "player__countrycode_id",
+            "points",
+        )
+    ]
 
-    return sum(run.points for run in il_runs)
+    return {
+        "count": count,
+        "next": cursor + limit if cursor + limit < count else None,
+        "results": results,
+    }
+
+
+def country_standings(
+    runtype: str = "all",
+    game: str = None,
+    members: int = 5,
+) -> list[dict[str, Any]]:
+    """Returns every country of a leaderboard with its combined points and its best players.
+
+    Both are read from the materialized `CountryStandings` and `Standings` (two queries), so the
+    cost only depends on the number of countries and `members`.
+
+    Args:
+        runtype (str): `all` (default), `main`, or `il`.
+        game (str): None by default. ID of the game for IL leaderboards.
+        members (int): 5 by default. Number of players listed for every country.
+
+    Returns:
+        list[dict]: Country code, name, combined points, player count, rank, and its top
+            `members` (best first) of every country, best country first.
+    """
+    totals = CountryStandings.objects.filter(runtype=runtype, game_id=game).values_list(
+        "countrycode_id", "countrycode__name", "points", "players", "rank"
+    )
+    countries = {
+        countrycode: {
+            "countrycode": countrycode,
+            "countryname": countryname,
+            "total_points": points,
+            "players": players,
+            "rank": rank,
+            "members": [],
+        }
+        for countrycode, countryname, points, players, rank in totals
+    }
+
+    for countrycode, player, nickname, points, rank in (
+        Standings.objects.filter(
+            runtype=runtype,
+            game_id=game,
+            countrycode__isnull=False,
+            country_rank__lte=members,
+        )
+        .order_by("countrycode_id", "country_rank")
+        .values_list(
+            "countrycode_id",
+            "player__name",
+            "player__nickname",
+            "points",
+            "rank",
+        )
+    ):
+        # The standings may have been rebuilt between both queries.
+        if countrycode in countries:
+            countries[countrycode]["members"].append(
+                {
+                    "player": player,
+                    "nickname": nickname,
+                    "total_points": points,
+                    "rank": rank,
+                }
+            )
+
+    return list(countries.values())
 
 
 def leaderboard_entry(
@@ -67,212 +532,366 @@ def leaderboard_entry(
     return entry
 
 
-def profile_one(
-    players_all: list[Players],
-    runs_list: list[Runs],
-) -> list[dict[str, Any]]:
-    leaderboard = []
-    for player in players_all:
-        points = get_main_points(player, runs_list)
-        leaderboard.append(leaderboard_entry(player, points))
-
-    return sorted(leaderboard, key=lambda x: x["total_points"], reverse=True)
+def record_panels(
+    game: str,
+) -> tuple[list[dict[str, Any]], list[tuple[str, str, date]]]:
+    """Returns the IL record counts and the ten oldest IL records of a game from `WorldRecords`.
 
+    Args:
+        game (str): ID of the game.
 
-def profile_two(
-    players_all: list[Players],
-    runs_list: list[Runs],
-) -> list[dict[str, Any]]:
-    il_lb = []
-    for player in players_all:
-        il_points = get_il_points(player, runs_list)
-        if il_points > 0:
-            il_lb.append(leaderboard_entry(player, il_points))
-
-    return sorted(il_lb, key=lambda x: x["total_points"], reverse=True)
-
-
-def profile_three(
-    players_all: list[Players],
-    main_runs_all: list[Runs],
-    il_runs_all: list[Runs],
-) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
-    # fg_lb = []
-    # il_lb = []
-    all_lb = []
-    for player in players_all:
-        main_points = get_main_points(player, main_runs_all)
-        il_points = get_il_points(player, il_runs_all)
-        all_points = main_points + il_points
-
-        """ if main_points > 0:
-            fg_lb.append(leaderboard_entry(player, main_points))
-        if il_points > 0:
-            il_lb.append(leaderboard_entry(player, il_points)) """
-        if all_points > 0:
-            all_lb.append(leaderboard_entry(player, all_points))
-
-    # fg_lb.sort(key=lambda x: x["total_points"], reverse=True)
-    # il_lb.sort(key=lambda x: x["total_points"], reverse=True)
-    all_lb.sort(key=lambda x: x["total_points"], reverse=True)
-
-    return all_lb  # , fg_lb, il_lb
-
-
-def profile_four(
-    players_all: list[Players],
-    runs_list: list[Runs],
-) -> tuple[list[dict[str, Any]], list[tuple[str, float, date]]]:
-    il_lb = []
-    for player in players_all:
-        wr_count = sum(
-            1 for run in runs_list if run.player.id == player.id and run.place == 1
+    Returns:
+        tuple: Players with more than one record (most records first) and the subcategory, time,
+            and date of the oldest records (excluding levels exempt from them).
+    """
+    records = WorldRecords.objects.filter(game_id=game)
+
+    il_wr_counts = [
+        {
+            "player": player,
+            "nickname": nickname,
+            "countrycode": countrycode,
+            "countryname": countryname,
+            "il_wrs": il_wrs,
+        }
+        for player, nickname, countrycode, countryname, il_wrs in records.filter(
+            player__isnull=False
         )
-        if wr_count > 1:
-            countrycode, countryname = get_country_info(player)
-            il_lb.append(
-                {
-                    "player": player.name,
-                    "nickname": player.nickname,
-                    "countrycode": countrycode,
-                    "countryname": countryname,
-                    "il_wrs": wr_count,
-                }
-            )
-    il_wr_counts = sorted(il_lb, key=lambda x: x["il_wrs"], reverse=True)
+        .values_list(
+            "player__name",
+            "player__nickname",
+            "player__countrycode_id",
+            "player__countrycode__name",
+        )
+        .annotate(il_wrs=Count("id"))
+        .filter(il_wrs__gt=1)
+        .order_by("-il_wrs", "player__name")
+    ]
     il_runs_old = [
-        (run.subcategory, run.time, run.date.date())
-        for run in runs_list
-        if run.points == 100 and run.level.id != "rdnoro6w"
+        (subcategory, time, run_date.date())
+        for subcategory, time, run_date in records.filter(exempt=False)
+        .order_by("date")
+        .values_list("run__subcategory", "run__time", "date")[:10]
     ]
-    il_runs_old.sort(key=lambda x: x[2])
 
-    return il_wr_counts, il_runs_old[:10]
+    return il_wr_counts, il_runs_old
 
 
-def overall_leaderboard(
-    request: HttpRequest,
-    players_all: list[Players],
-    main_runs_all: list[Runs],
-    il_runs_all: list[Runs],
-) -> HttpResponse:
-    leaderboard = []
-    for player in players_all:
-        main_points = get_main_points(player, main_runs_all)
-        il_points = get_il_points(player, il_runs_all)
-        total_points = main_points + il_points
+def featured_records() -> list[dict[str, Any]]:
+    """Returns the world records of every `FeaturedBoards` board, for the main page.
 
-        leaderboard.append(leaderboard_entry(player, total_points))
+    Runs are read in one query and grouped in a single pass; tied world records of a board are
+    combined into one record with several players.
 
-    leaderboard.sort(key=lambda x: x["total_points"], reverse=True)
-    paginator = Paginator(leaderboard, 50)
-    page_number = request.GET.get("page")
-    leaderboard_page = paginator.get_page(page_number)
+    Returns:
+        list[dict]: Game (slug and release date), subcategory, time, and players (with the URL and
+            date of their run) of every record, ordered by the release date of the game.
+    """
+    runs = (
+        Runs.objects.exclude(vid_status__in=["new", "rejected"])
+        .filter(board__featured__isnull=False, place=1, obsolete=False)
+        .order_by("game__release", "-subcategory", "id")
+        .values_list(
+            "board_id",
+            "game__slug",
+            "game__release",
+            "subcategory",
+            "time",
+            "url",
+            "date",
+            "player__name",
+            "player__nickname",
+            "player__countrycode_id",
+            "player__countrycode__name",
+        )
+    )
 
-    for i, item in enumerate(leaderboard_page, start=leaderboard_page.start_index()):
-        item["rank"] = i
+    records = {}
+    for (
+        board_id,
+        slug,
+        release,
+        subcategory,
+        time,
+        url,
+        run_date,
+        name,
+        nickname,
+        countrycode,
+        countryname,
+    ) in runs:
+        record = records.setdefault(
+            (board_id, time),
+            {
+                "game": {"slug": slug, "release": release},
+                "subcategory": subcategory,
+                "time": time,
+                "players": [],
+            },
+        )
 
-    return render(request, "srl/leaderboard.html", {"leaderboard": leaderboard_page})
+        if name is None:
+            player = None
+        else:
+            player = {
+                "name": name,
+                "nickname": nickname,
+                "countrycode": (
+                    {"id": countrycode, "name": countryname} if countrycode else None
+                ),
+            }
+
+        record["players"].append(
+            {
+                "player": player,
+                "url": url,
+                "date": run_date.date() if run_date else None,
+            }
+        )
 
+    return list(records.values())
 
-def Leaderboard(
-    request: HttpRequest,
-    profile: int = None,
-    game: str = None,
-) -> HttpResponse:
-    """Returns information depending upon the `profile` argument to be rendered dynamically.
 
-    Simplified lookup function that takes into account different scenarios involving all `Players`
-    and `Runs`.
+def board_key(
+    game: str,
+    runtype: str,
+) -> str:
+    return f"board:{game}:{runtype}"
+
+
+def board_payloads(
+    game: Optional[str] = None,
+    runtype: Optional[str] = None,
+) -> dict[tuple[str, str], dict[str, Any]]:
+    """Builds the game page payload of every `(game, runtype)` in a single pass over `Runs`.
+
+    Each payload holds the sorted subcategories of the game and, for every subcategory, its runs as
+    tuples of `BOARD_FIELDS` (see `board_runs`), already ordered by place.
 
     Args:
-        profile (int): Used to determine which function should be utilized to return what data.
-        game (str): None by default. This is the slug for a specific `Games` model object. This
-            is usually used to filter out runs towards that specific game.
+        game (Optional[str]): ID of a single game to build. Every game is built when not given.
+        runtype (Optional[str]): `main` or `il` to only build one type. Both when not given.
 
     Returns:
-        profile: Sorted leaderboard (with additional contexts and information) is returned so it can
-            be dynamically generated on the website.
-
-    Called Functions:
-        - `profile_one`
-        - `profile_two`
-        - `profile_three`
-        - `profile_four`
-        - `overall_leaderboard`
+        dict: Payloads keyed by `(game_id, runtype)`; boards without any runs are left out.
     """
-    all_runs = (
-        Runs.objects.exclude(
-            vid_status__in=["new", "rejected"],
-            place=0,
-        )
-        .select_related(
-            "game",
-            "category",
-            "player",
-            "player__countrycode",
-            "player2",
-            "player2__countrycode",
-        )
-        .defer(
-            "variables",
-            "platform",
-            "description",
-        )
-        .filter(obsolete=False)
+    runs = (
+        Runs.objects.exclude(vid_status__in=["new", "rejected"])
+        .filter(points__gt=0, obsolete=False)
+        .order_by("game_id", "runtype", "place", "id")
     )
-
     if game:
-        all_runs = all_runs.filter(game__slug=game)
+        runs = runs.filter(game_id=game)
+    if runtype:
+        runs = runs.filter(runtype=runtype)
+
+    payloads = {}
+
+    for run in runs.values_list(*RUN_FIELDS).iterator():
+        run = dict(zip(RUN_FIELDS, run))
+
+        # Anonymous IL runs have never been shown on the IL boards.
+        if run["runtype"] == "il" and run["player__name"] is None:
+            continue
+
+        if run["runtype"] == "il":
+            defaulttime = run["game__idefaulttime"]
+        else:
+            defaulttime = run["game__defaulttime"]
+
+        times = {
+            "realtime": run["time"],
+            "realtime_noloads": run["timenl"],
+            "ingame": run["timeigt"],
+        }
+        run_time = times.get(defaulttime)
+
+        # Sometimes the defaulttime of a game doesn't line up.
+        # This code will iterate through the time, timenl and timeigt variables to
+        # find one that does not equal 0.
+        if run_time == "0":
+            run_time, defaulttime = next(
+                ((time, label) for label, time in times.items() if time != "0"),
+                ("0", None),
+            )
 
-    players_all: list[Players] = (
-        Players.objects.only(
-            "id",
-            "name",
-            "countrycode",
-            "nickname",
+        if run["player__name"] is None:
+            player = ("Anonymous", None, None, None)
+        else:
+            player = (
+                run["player__name"],
+                run["player__nickname"],
+                run["player__countrycode_id"],
+                run["player__countrycode__name"],
+            )
+
+        if run["runtype"] != "main" or "co-op" not in run["subcategory"].lower():
+            player2 = (None, None, None, None)
+        elif run["player2__name"] is None:
+            player2 = ("Anonymous", None, None, None)
+        else:
+            player2 = (
+                run["player2__name"],
+                run["player2__nickname"],
+                run["player2__countrycode_id"],
+                run["player2__countrycode__name"],
+            )
+
+        payload = payloads.setdefault(
+            (run["game_id"], run["runtype"]), {"subcategories": [], "runs": {}}
         )
-        .select_related("countrycode")
-        .all()
+        payload["runs"].setdefault(run["subcategory"], []).append(
+            (
+                run["place"],
+                defaulttime,
+                run_time,
+                run["points"],
+                run["date"],
+                run["subcategory"],
+                run["url"],
+                run["video"],
+                run["arch_video"],
+            )
+            + player
+            + player2
+        )
+
+    for payload in payloads.values():
+        payload["subcategories"] = sorted(payload["runs"])
+
+    return payloads
+
+
+def board_payload(
+    game: str,
+    runtype: str,
+) -> dict[str, Any]:
+    """Returns the full-game or IL page payload of a game (see `board_payloads`).
+
+    The payload is a snapshot of the game (see `game_scope`) and of its players' names and flags
+    (`players`), so it is only rebuilt once that game has a board refreshed or a player changed;
+    `build_boards` also stores every payload after each standings rebuild.
+
+    Args:
+        game (str): ID of the game.
+        runtype (str): `main` or `il`.
+
+    Returns:
+        dict: Sorted subcategories of the game (`subcategories`) and the runs of every subcategory
+            (`runs`).
+    """
+    return snapshot(
+        board_key(game, runtype),
+        [game_scope(game), "players"],
+        lambda: board_payloads(game, runtype).get((game, runtype), EMPTY_BOARD),
     )
 
-    if profile == 1:
-        main_runs_all: list[Runs] = list(all_runs.filter(runtype="main"))
 
-        return profile_one(
-            players_all,
-            main_runs_all,
-        )
-    elif profile == 2:
-        il_runs_all: list[Runs] = list(all_runs.filter(runtype="il"))
+def payload_runs(
+    payload: dict[str, Any],
+    subcategories: list[str],
+) -> list[dict[str, Any]]:
+    """Returns the runs of the given subcategories of a payload, as dicts of `BOARD_FIELDS`."""
+    return [
+        dict(zip(BOARD_FIELDS, run))
+        for name in subcategories
+        for run in payload["runs"].get(name, [])
+    ]
 
-        return profile_two(
-            players_all,
-            il_runs_all,
-        )
-    elif profile == 3:
-        main_runs_all: list[Runs] = list(all_runs.filter(runtype="main"))
-        il_runs_all: list[Runs] = list(all_runs.filter(runtype="il"))
-
-        return profile_three(
-            players_all,
-            main_runs_all,
-            il_runs_all,
+
+def board_runs(
+    game: str,
+    runtype: str,
+    subcategory: Optional[str] = None,
+) -> tuple[list[str], list[dict[str, Any]]]:
+    """Returns the subcategories and runs shown on the full-game or IL page of a game.
+
+    Args:
+        game (str): ID of the game.
+        runtype (str): `main` or `il`.
+        subcategory (Optional[str]): Only return the runs of this subcategory. Runs of every
+            subcategory are returned when not given.
+
+    Returns:
+        tuple: Sorted subcategories of the game, and its runs (as dictionaries of `BOARD_FIELDS`)
+            ordered by subcategory and then by place.
+
+    Called Functions:
+        - `board_payload`
+        - `payload_runs`
+    """
+    payload = board_payload(game, runtype)
+
+    if subcategory is None:
+        return payload["subcategories"], payload_runs(payload, payload["subcategories"])
+    else:
+        return payload["subcategories"], payload_runs(payload, [subcategory])
+
+
+class StandingsPaginator(Paginator):
+    """Paginator over one leaderboard of `Standings`, fetching exactly one page per request.
+
+    `Standings.rank` is the position of a player when ordered by `(-points, player_id)`, so a page
+    is the rank range `(page - 1) * per_page + 1` to `page * per_page`. It is read through the
+    `(runtype, game, rank)` index and costs the same on every page; page links and rank numbers
+    only move when the standings are rebuilt.
+
+    Args:
+        runtype (str): `all`, `main`, or `il`.
+        game (str): None by default. ID of the game for IL leaderboards.
+        per_page (int): 50 by default. Number of players on a page.
+    """
+
+    def __init__(
+        self,
+        runtype: str,
+        game: str = None,
+        per_page: int = 50,
+    ) -> None:
+        self.standings = Standings.objects.filter(runtype=runtype, game_id=game)
+        super().__init__(self.standings, per_page)
+
+    @cached_property
+    def count(self) -> int:
+        return (
+            self.standings.order_by("-rank").values_list("rank", flat=True).first() or 0
         )
-    elif profile == 4:
-        il_runs_all: list[Runs] = list(all_runs.filter(runtype="il"))
 
-        return profile_four(
-            players_all,
-            il_runs_all,
+    def page(
+        self,
+        number: int,
+    ) -> Page:
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+
+        standings = (
+            self.standings.filter(rank__gt=bottom, rank__lte=bottom + self.per_page)
+            .select_related("player__countrycode")
+            .order_by("rank")
         )
-    else:
-        main_runs_all: list[Runs] = list(all_runs.filter(runtype="main"))
-        il_runs_all: list[Runs] = list(all_runs.filter(runtype="il"))
-
-        return overall_leaderboard(
-            request,
-            players_all,
-            main_runs_all,
-            il_runs_all,
+
+        return self._get_page(
+            [
+                leaderboard_entry(standing.player, standing.points)
+                | {"rank": standing.rank}
+                for standing in standings
+            ],
+            number,
+            self,
         )
+
+
+def Leaderboard(
+    request: HttpRequest,
+) -> HttpResponse:
+    """View of the overall leaderboard, paged from `Standings` (see `StandingsPaginator`).
+
+    Returns:
+        render (request, template, context): Request is sent to a specific template, which includes
+        the context needed to dynamically generate the webpage.
+    """
+    paginator = StandingsPaginator("all")
+    page_number = request.GET.get("page")
+    leaderboard_page = paginator.get_page(page_number)
+
+    return render(request, "srl/leaderboard.html", {"leaderboard": leaderboard_page})
@@ -4,6 +4,8 @@ from typing import Any, TypedDict
 
 import requests
 
+from srl.models import Boards, Categories, Games, Levels
+
 
 def convert_time(
     secs: float,
@@ -105,6 +107,63 @@ def points_formula(
     return math.floor((0.008 * math.pow(math.e, (4.8284 * (wr / run)))) * max_points)
 
 
+def rank_times(
+    times: list[float],
+    wr_time: float,
+    max_points: int,
+) -> list[tuple[int, int]]:
+    """Processes the placings and points of every speedrun within a board.
+
+    Speedruns that tie share the same place and points; the speedrun after a tie skips the places
+    taken by the tie (e.g. 1, 2, 2, 4).
+
+    Args:
+        times (list): Times (as floats) of all non-obsolete speedruns in the board, fastest first.
+        wr_time (float): The world record time (as a float).
+        max_points (int): Maximum points of a speedrun.
+
+    Returns:
+        list: A `(place, points)` tuple for each time, in the same order as `times`.
+
+    Called Functions:
+        - `points_formula`
+    """
+    place = 1
+    old_time = 0
+    old_points = 0
+    rank_count = 0
+    ranks = []
+
+    # If it is WR, then it gets max_points; rank is incremented.
+    # If it is not WR, then points are calculated based on the formula and the max_points of the
+    # run. The place of the run would be place + rank_count; rank_count is reset to 1.
+    for run_time in times:
+        if run_time == wr_time:
+            ranks.append((place, max_points))
+
+            old_points = max_points
+            rank_count += 1
+        elif run_time == old_time:
+            ranks.append((place, old_points))
+
+            rank_count += 1
+        else:
+            points = points_formula(wr_time, run_time, max_points)
+
+            if rank_count > 0:
+                place += rank_count
+                rank_count = 1
+            else:
+                place += 1
+
+            ranks.append((place, points))
+
+            old_time = run_time
+            old_points = points
+
+    return ranks
+
+
 class TimeDict(TypedDict):
     realtime_t: int
     realtime_noloads_t: int
@@ -137,3 +196,86 @@ def time_conversion(
     igt = convert_time(ingame) if ingame > 0 else 0
 
     return rta, noloads, igt
+
+
+def board_rules(
+    game: Games,
+    runtype: str,
+) -> tuple[str, int]:
+    """Returns the timing method and WR point maximum used by a game's boards.
+
+    Args:
+        game (Games): The game that the board belongs to.
+        runtype (str): Can be `main` or `il`.
+
+    Returns:
+        tuple: A tuple containing:
+            - defaulttime (str): The timing method used to rank the board.
+            - max_points (int): Points awarded to the world record of the board.
+    """
+    if runtype == "il" and "category extension" not in game.name.lower():
+        return game.idefaulttime, game.ipointsmax
+    else:
+        return game.defaulttime, game.pointsmax
+
+
+def get_board(
+    game: Games,
+    category: Categories,
+    level: Levels | None,
+    values: dict[str, str],
+    subcategory: str,
+) -> Boards:
+    """Returns (or creates) the board that a run belongs to.
+
+    A board is the combination of a game, category, level, and the variable values of a run. Its
+    metadata (name, timing method, point maximum, and co-op flag) is refreshed every time it is
+    looked up so changes from Speedrun.com or the Admin Panel are picked up on the next import.
+
+    Args:
+        game (Games): The game that the run belongs to.
+        category (Categories): The category that the run belongs to.
+        level (Levels): The level that the run belongs to; None for full-game runs.
+        values (dict): Variable ID to value ID pairs of the run (e.g. `run["values"]` from the
+            Speedrun.com API).
+        subcategory (str): Full category and subcategory name (e.g. `Any% (Beginner)`).
+
+    Returns:
+        Boards: The board object.
+
+    Called Functions:
+        - `board_rules`
+    """
+    runtype = "il" if level else "main"
+    defaulttime, max_points = board_rules(game, runtype)
+    coop = "co-op" in subcategory.lower()
+
+    board, created = Boards.objects.get_or_create(
+        game=game,
+        category=category,
+        level=level,
+        values_key=",".join(sorted(values.values())),
+        defaults={
+            "runtype": runtype,
+            "subcategory": subcategory,
+            "defaulttime": defaulttime,
+            "max_points": max_points,
+            "coop": coop,
+        },
+    )
+
+    if created:
+        board.values.set(values.values())
+    elif (board.subcategory, board.defaulttime, board.max_points, board.coop) != (
+        subcategory,
+        defaulttime,
+        max_points,
+        coop,
+    ):
+        board.subcategory = subcategory
+        board.defaulttime = defaulttime
+        board.max_points = max_points
+        board.coop = coop
+        board.save(update_fields=["subcategory", "defaulttime", "max_points", "coop"])
+
+    return board
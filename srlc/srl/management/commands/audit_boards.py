@@ -0,0 +1,50 @@
+from typing import Any
+
+from api.tasks import audit_boards
+from django.core.management.base import BaseCommand, CommandParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the placings, points, and obsolete flags of every board with the ranking that "
+        "`update_points` and `remove_obsolete` would produce."
+    )
+
+    def add_arguments(
+        self,
+        parser: CommandParser,
+    ) -> None:
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Updates the mismatched runs and refreshes the cache of their boards.",
+        )
+        parser.add_argument(
+            "--game",
+            help="Only audits the boards of this game ID.",
+        )
+
+    def handle(
+        self,
+        *args: Any,
+        **options: Any,
+    ) -> None:
+        report = audit_boards(game_id=options["game"], fix=options["fix"])
+
+        for board in report:
+            self.stdout.write(
+                f"[{board['board']}] {board['game']}: {board['subcategory']} - "
+                f"obsolete: {board['obsolete']}, place: {board['place']}, "
+                f"points: {board['points']}, stale cache: {board['stale']}"
+            )
+
+        if not report:
+            self.stdout.write(self.style.SUCCESS("No drift found."))
+        elif options["fix"]:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(report)} board(s)."))
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{len(report)} board(s) have drifted. Run again with --fix to update them."
+                )
+            )
@@ -0,0 +1,24 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from srl.models import Standings
+from srl.tasks import update_standings
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the overall, full-game, and IL standings (used for player ranks) from the "
+        "current points of every player."
+    )
+
+    def handle(
+        self,
+        *args: Any,
+        **options: Any,
+    ) -> None:
+        update_standings()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {Standings.objects.count()} standing(s).")
+        )
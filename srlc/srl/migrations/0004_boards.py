@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0003_alter_players_pronouns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Boards',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('runtype', models.CharField(choices=[('main', 'Full Game'), ('il', 'Individual Level')], max_length=5, verbose_name='Full-Game or IL')),
+                ('values_key', models.CharField(blank=True, default='', help_text='Sorted, comma-separated list of the value IDs that make up this board. Together with the game, category, and level, this is what makes a board unique.', max_length=255, verbose_name='Variable Values Key')),
+                ('subcategory', models.CharField(max_length=100, verbose_name='Subcategory Name')),
+                ('defaulttime', models.CharField(choices=[('realtime', 'RTA'), ('realtime_noloads', 'LRT'), ('ingame', 'IGT')], default='realtime', help_text='Timing method used to rank this board. This is copied from the game whenever a run is imported into the board.', verbose_name='Default Time')),
+                ('max_points', models.IntegerField(default=0, verbose_name='WR Point Maximum')),
+                ('run_count', models.IntegerField(default=0, help_text='Number of non-obsolete runs on this board.', verbose_name='Run Count')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='srl.categories', verbose_name='Category')),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='srl.games', verbose_name='Game')),
+                ('level', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='srl.levels', verbose_name='Level')),
+                ('values', models.ManyToManyField(blank=True, to='srl.variablevalues', verbose_name='Variable Values')),
+                ('wr', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='srl.runs', verbose_name='World Record')),
+            ],
+            options={
+                'verbose_name_plural': 'Boards',
+                'ordering': ['subcategory'],
+            },
+        ),
+        migrations.AddField(
+            model_name='runs',
+            name='board',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='runs', to='srl.boards', verbose_name='Board'),
+        ),
+        migrations.AddConstraint(
+            model_name='boards',
+            constraint=models.UniqueConstraint(fields=('game', 'category', 'level', 'values_key'), name='unique_board', nulls_distinct=False),
+        ),
+    ]
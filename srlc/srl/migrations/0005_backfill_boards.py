@@ -0,0 +1,69 @@
+from collections import defaultdict
+
+from django.db import migrations
+
+
+def backfill_boards(apps, schema_editor):
+    """Creates a board for every existing game/category/level/value combination of `Runs`."""
+    Boards = apps.get_model("srl", "Boards")
+    Games = apps.get_model("srl", "Games")
+    Runs = apps.get_model("srl", "Runs")
+    RunVariableValues = apps.get_model("srl", "RunVariableValues")
+
+    games = {game.id: game for game in Games.objects.all()}
+
+    run_values = defaultdict(list)
+    for run_id, value_id in RunVariableValues.objects.values_list("run_id", "value_id"):
+        run_values[run_id].append(value_id)
+
+    boards = {}
+    board_runs = defaultdict(list)
+
+    for run in Runs.objects.only(
+        "id", "runtype", "game_id", "category_id", "level_id", "subcategory"
+    ).iterator():
+        values = sorted(run_values.get(run.id, []))
+        key = (run.game_id, run.category_id, run.level_id, ",".join(values))
+
+        if key not in boards:
+            game = games[run.game_id]
+
+            if run.runtype == "il" and "category extension" not in game.name.lower():
+                defaulttime, max_points = game.idefaulttime, game.ipointsmax
+            else:
+                defaulttime, max_points = game.defaulttime, game.pointsmax
+
+            board = Boards.objects.create(
+                runtype=run.runtype,
+                game_id=run.game_id,
+                category_id=run.category_id,
+                level_id=run.level_id,
+                values_key=key[3],
+                subcategory=run.subcategory or "",
+                defaulttime=defaulttime,
+                max_points=max_points,
+            )
+            board.values.set(values)
+            boards[key] = board
+
+        board_runs[boards[key].id].append(run.id)
+
+    for board in boards.values():
+        run_ids = board_runs[board.id]
+        Runs.objects.filter(id__in=run_ids).update(board=board)
+
+        live = Runs.objects.filter(id__in=run_ids, obsolete=False)
+        board.wr = live.filter(place=1).order_by("id").first()
+        board.run_count = live.count()
+        board.save(update_fields=["wr", "run_count"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("srl", "0004_boards"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_boards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0005_backfill_boards'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='runs',
+            index=models.Index(condition=models.Q(('obsolete', False), models.Q(('vid_status__in', ['new', 'rejected']), _negated=True)), fields=['game', 'runtype'], name='srl_runs_game_runtype_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runs',
+            index=models.Index(condition=models.Q(('obsolete', False)), fields=['board', 'place'], name='srl_runs_board_place_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runs',
+            index=models.Index(condition=models.Q(('place', 1), ('runtype', 'main')), fields=['subcategory'], name='srl_runs_main_wrs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runs',
+            index=models.Index(condition=models.Q(('obsolete', False), ('place', 1), ('v_date__isnull', False), models.Q(('vid_status__in', ['new', 'rejected']), _negated=True)), fields=['-v_date'], name='srl_runs_new_wrs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runs',
+            index=models.Index(condition=models.Q(('obsolete', False), ('place__gt', 1), ('v_date__isnull', False), models.Q(('vid_status__in', ['new', 'rejected']), _negated=True)), fields=['-v_date'], name='srl_runs_new_pbs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runs',
+            index=models.Index(condition=models.Q(('obsolete', False)), fields=['player', 'runtype', '-v_date'], name='srl_runs_player_runtype_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runs',
+            index=models.Index(condition=models.Q(('vid_status', 'new')), fields=['vid_status'], name='srl_runs_unverified_idx'),
+        ),
+    ]
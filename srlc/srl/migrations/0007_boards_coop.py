@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:05
+
+from django.db import migrations, models
+
+
+def backfill_coop(apps, schema_editor):
+    """Flags every existing board with "Co-Op" in its name as a co-op board."""
+    Boards = apps.get_model("srl", "Boards")
+    Boards.objects.filter(subcategory__icontains="co-op").update(coop=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0006_runs_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='boards',
+            name='coop',
+            field=models.BooleanField(default=False, help_text='Set by every import from the subcategory name (any name containing "Co-Op"); runs on a co-op board have two or more runners. Only the best run of a player on a co-op board (in any seat) counts towards their points.', verbose_name='Co-Op'),
+        ),
+        migrations.RunPython(backfill_coop, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0007_boards_coop'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Standings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('runtype', models.CharField(choices=[('all', 'Overall'), ('main', 'Full Game'), ('il', 'Individual Level')], max_length=5, verbose_name='Leaderboard')),
+                ('points', models.IntegerField(verbose_name='Points')),
+                ('rank', models.IntegerField(help_text='Position of the player, ordered by points and then by player ID.', verbose_name='Rank')),
+                ('game', models.ForeignKey(blank=True, help_text='Only set for the IL leaderboard of a game.', null=True, on_delete=django.db.models.deletion.CASCADE, to='srl.games', verbose_name='Game')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='srl.players', verbose_name='Player')),
+            ],
+            options={
+                'verbose_name_plural': 'Standings',
+                'ordering': ['runtype', 'game_id', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('runtype', 'game', 'player'), name='unique_standing', nulls_distinct=False), models.UniqueConstraint(fields=('runtype', 'game', 'rank'), name='unique_standing_rank', nulls_distinct=False)],
+            },
+        ),
+    ]
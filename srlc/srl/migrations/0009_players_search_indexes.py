@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:16
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0008_standings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='players',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='srl_players_name_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='players',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nickname'), name='text_pattern_ops'), name='srl_players_nick_search_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def enable_thps4_records(apps, schema_editor):
+    """Keeps the record panels of THPS4 (and its "Zoo - Feed the Hippos" exemption)."""
+    Games = apps.get_model("srl", "Games")
+    Levels = apps.get_model("srl", "Levels")
+
+    Games.objects.filter(slug="thps4").update(il_records=True)
+    Levels.objects.filter(id="rdnoro6w").update(records_exempt=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0009_players_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='games',
+            name='il_records',
+            field=models.BooleanField(default=False, help_text='When checked, the IL leaderboard of this game shows the record count of every player and its oldest records. These are rebuilt with the standings.', verbose_name='IL Record Panels'),
+        ),
+        migrations.AddField(
+            model_name='levels',
+            name='records_exempt',
+            field=models.BooleanField(default=False, help_text="When checked, records of this level are not listed in the oldest records of the game's IL leaderboard (they still count towards record counts).", verbose_name='Exempt From Oldest Records'),
+        ),
+        migrations.CreateModel(
+            name='WorldRecords',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('exempt', models.BooleanField(default=False, verbose_name='Exempt From Oldest Records')),
+                ('date', models.DateTimeField(blank=True, null=True, verbose_name='Submitted Date')),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='srl.games', verbose_name='Game')),
+                ('player', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='srl.players', verbose_name='Player')),
+                ('run', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='srl.runs', verbose_name='Run')),
+            ],
+            options={
+                'verbose_name': 'World Record',
+                'verbose_name_plural': 'World Records',
+                'ordering': ['game', 'date'],
+                'indexes': [models.Index(fields=['game', 'player'], name='srl_wrs_game_player_idx'), models.Index(fields=['game', 'date'], name='srl_wrs_game_date_idx')],
+            },
+        ),
+        migrations.RunPython(enable_thps4_records, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0010_world_records'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CountryStandings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('runtype', models.CharField(choices=[('all', 'Overall'), ('main', 'Full Game'), ('il', 'Individual Level')], max_length=5, verbose_name='Leaderboard')),
+                ('points', models.IntegerField(help_text='Combined points of every ranked player from the country.', verbose_name='Points')),
+                ('players', models.IntegerField(help_text='Number of ranked players from the country.', verbose_name='Players')),
+                ('rank', models.IntegerField(help_text='Position of the country, ordered by points and then by country code.', verbose_name='Rank')),
+            ],
+            options={
+                'verbose_name_plural': 'Country Standings',
+                'ordering': ['runtype', 'game_id', 'rank'],
+            },
+        ),
+        migrations.AddField(
+            model_name='standings',
+            name='country_rank',
+            field=models.IntegerField(blank=True, help_text='Position of the player among the players of their country.', null=True, verbose_name='Country Rank'),
+        ),
+        migrations.AddField(
+            model_name='standings',
+            name='countrycode',
+            field=models.ForeignKey(blank=True, help_text='Copy of the country of the player when the standings were built.', null=True, on_delete=django.db.models.deletion.SET_NULL, to='srl.countrycodes', verbose_name='Country'),
+        ),
+        migrations.AddIndex(
+            model_name='standings',
+            index=models.Index(fields=['runtype', 'game', 'countrycode', 'country_rank'], name='srl_standings_country_idx'),
+        ),
+        migrations.AddField(
+            model_name='countrystandings',
+            name='countrycode',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='srl.countrycodes', verbose_name='Country'),
+        ),
+        migrations.AddField(
+            model_name='countrystandings',
+            name='game',
+            field=models.ForeignKey(blank=True, help_text='Only set for the IL leaderboard of a game.', null=True, on_delete=django.db.models.deletion.CASCADE, to='srl.games', verbose_name='Game'),
+        ),
+        migrations.AddConstraint(
+            model_name='countrystandings',
+            constraint=models.UniqueConstraint(fields=('runtype', 'game', 'countrycode'), name='unique_country_standing', nulls_distinct=False),
+        ),
+        migrations.AddConstraint(
+            model_name='countrystandings',
+            constraint=models.UniqueConstraint(fields=('runtype', 'game', 'rank'), name='unique_country_standing_rank', nulls_distinct=False),
+        ),
+    ]
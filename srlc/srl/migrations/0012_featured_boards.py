@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def seed_featured_boards(apps, schema_editor):
+    """Features the boards previously hardcoded in `MainPage`."""
+    Boards = apps.get_model("srl", "Boards")
+    FeaturedBoards = apps.get_model("srl", "FeaturedBoards")
+
+    subcategories = [
+        "Any%",
+        "Any% (Console)",
+        "Any% (6th Gen)",
+        "100%",
+        "100% (Console)",
+        "Any% (No Major Glitches)",
+        "All Goals & Golds (No Major Glitches)",
+        "All Goals & Golds (All Careers)",
+        "All Goals & Golds (6th Gen)",
+        "Any% (6th Gen, Normal)",
+        "100% (Normal)",
+        "Any% (Beginner)",
+        "100% (NSR)",
+        "Story (Easy, NG+)",
+        "100% (NG)",
+        "Classic (Normal, NG+)",
+        "Story Mode (Easy, NG+)",
+        "Classic Mode (Normal)",
+        "Any% (360/PS3)",
+        "100% (360/PS3)",
+        "Any% Tour Mode (All Tours, New Game)",
+        "All Goals & Golds (All Tours, New Game)",
+    ]
+
+    exempt_games = [
+        "GBA",
+        "PSP",
+        "GBC",
+        "Category Extensions",
+        "Remix",
+        "Sk8land",
+        "HD",
+        "2x",
+    ]
+
+    exclusion_filter = Q()
+    for game in exempt_games:
+        exclusion_filter |= Q(game__name__icontains=game)
+
+    boards = Boards.objects.filter(
+        runtype="main", subcategory__in=subcategories
+    ).exclude(exclusion_filter)
+
+    FeaturedBoards.objects.bulk_create(
+        [FeaturedBoards(board=board) for board in boards]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0011_country_standings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeaturedBoards',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.OneToOneField(help_text='Board whose world record is shown on the main page.', on_delete=django.db.models.deletion.CASCADE, related_name='featured', to='srl.boards', verbose_name='Board')),
+            ],
+            options={
+                'verbose_name': 'Featured Board',
+                'verbose_name_plural': 'Featured Boards',
+            },
+        ),
+        migrations.RunPython(seed_featured_boards, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='runs',
+            name='srl_runs_main_wrs_idx',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0012_featured_boards'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='runs',
+            index=models.Index(fields=['player', '-date'], name='srl_runs_player_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='runs',
+            index=models.Index(fields=['player2', '-date'], name='srl_runs_player2_date_idx'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_run_players(apps, schema_editor):
+    """Seats the `player` and `player2` of every existing run."""
+    Runs = apps.get_model("srl", "Runs")
+    RunPlayers = apps.get_model("srl", "RunPlayers")
+
+    seats = []
+    for run, player, player2 in Runs.objects.values_list(
+        "id", "player_id", "player2_id"
+    ).iterator(chunk_size=5000):
+        for seat, seated in enumerate(dict.fromkeys((player, player2)), 1):
+            if seated is not None:
+                seats.append(RunPlayers(run_id=run, player_id=seated, seat=seat))
+
+        if len(seats) >= 5000:
+            RunPlayers.objects.bulk_create(seats)
+            seats = []
+
+    RunPlayers.objects.bulk_create(seats)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0013_player_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RunPlayers',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seat', models.PositiveSmallIntegerField(help_text='Position of the player in the run, starting from 1 (`player`).', verbose_name='Seat')),
+            ],
+            options={
+                'verbose_name_plural': 'Run Players',
+                'ordering': ['run', 'seat'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='runs',
+            name='srl_runs_player_runtype_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='runs',
+            name='srl_runs_player_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='runs',
+            name='srl_runs_player2_date_idx',
+        ),
+        migrations.AddField(
+            model_name='runplayers',
+            name='player',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='player_runs', to='srl.players', verbose_name='Player'),
+        ),
+        migrations.AddField(
+            model_name='runplayers',
+            name='run',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='run_players', to='srl.runs', verbose_name='Run'),
+        ),
+        migrations.AddIndex(
+            model_name='runplayers',
+            index=models.Index(fields=['player', 'run'], include=('seat',), name='srl_runplayers_player_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='runplayers',
+            constraint=models.UniqueConstraint(fields=('run', 'seat'), name='unique_run_seat'),
+        ),
+        migrations.AddConstraint(
+            model_name='runplayers',
+            constraint=models.UniqueConstraint(fields=('run', 'player'), name='unique_run_player'),
+        ),
+        migrations.RunPython(backfill_run_players, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0014_run_players'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='runs',
+            name='srl_runs_game_runtype_idx',
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:45
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_seat_dates(apps, schema_editor):
+    """Copies the `date` of every existing run to its seats."""
+    Runs = apps.get_model("srl", "Runs")
+    RunPlayers = apps.get_model("srl", "RunPlayers")
+
+    RunPlayers.objects.update(
+        date=Subquery(Runs.objects.filter(id=OuterRef("run_id")).values("date")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srl', '0015_drop_runs_game_runtype_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='runplayers',
+            name='srl_runplayers_player_idx',
+        ),
+        migrations.AddField(
+            model_name='runplayers',
+            name='date',
+            field=models.DateTimeField(blank=True, editable=False, help_text="Copy of the `date` of the run, so a player's runs can be read by date.", null=True, verbose_name='Submitted Date'),
+        ),
+        migrations.RunPython(backfill_seat_dates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='runplayers',
+            index=models.Index(fields=['player', '-date', '-run'], include=('seat',), name='srl_runplayers_player_idx'),
+        ),
+    ]
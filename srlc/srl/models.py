@@ -1,7 +1,11 @@
+from django.contrib.postgres.indexes import OpClass
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django_resized import ResizedImageField
 
+from srl.cache import bump_version, game_scope, player_scope
+
 
 # VALIDATORS
 def validate_image(image):
@@ -141,10 +145,28 @@ class Games(models.Model):
             "from the admin panel."
         ),
     )
+    il_records = models.BooleanField(
+        verbose_name="IL Record Panels",
+        default=False,
+        help_text=(
+            "When checked, the IL leaderboard of this game shows the record count of every "
+            "player and its oldest records. These are rebuilt with the standings."
+        ),
+    )
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs) -> None:
+        """Saves the game and invalidates the cached pages of the game."""
+        super().save(*args, **kwargs)
+        transaction.on_commit(lambda: bump_version("games", game_scope(self.id)))
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """Deletes the game and invalidates the cached pages of the game."""
+        transaction.on_commit(lambda: bump_version("games", game_scope(self.id)))
+        return super().delete(*args, **kwargs)
+
 
 class Categories(models.Model):
     class Meta:
@@ -189,6 +211,16 @@ class Categories(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs) -> None:
+        """Saves the category and invalidates the cached game metadata."""
+        super().save(*args, **kwargs)
+        transaction.on_commit(lambda: bump_version("games"))
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """Deletes the category and invalidates the cached game metadata."""
+        transaction.on_commit(lambda: bump_version("games"))
+        return super().delete(*args, **kwargs)
+
 
 class Levels(models.Model):
     class Meta:
@@ -219,10 +251,28 @@ class Levels(models.Model):
         blank=True,
         null=True,
     )
+    records_exempt = models.BooleanField(
+        verbose_name="Exempt From Oldest Records",
+        default=False,
+        help_text=(
+            "When checked, records of this level are not listed in the oldest records of the "
+            "game's IL leaderboard (they still count towards record counts)."
+        ),
+    )
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs) -> None:
+        """Saves the level and invalidates the cached game metadata."""
+        super().save(*args, **kwargs)
+        transaction.on_commit(lambda: bump_version("games"))
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """Deletes the level and invalidates the cached game metadata."""
+        transaction.on_commit(lambda: bump_version("games"))
+        return super().delete(*args, **kwargs)
+
 
 class Variables(models.Model):
     class Meta:
@@ -307,6 +357,16 @@ class Variables(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs) -> None:
+        """Saves the variable and invalidates the cached game metadata."""
+        super().save(*args, **kwargs)
+        transaction.on_commit(lambda: bump_version("games"))
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """Deletes the variable and invalidates the cached game metadata."""
+        transaction.on_commit(lambda: bump_version("games"))
+        return super().delete(*args, **kwargs)
+
 
 class VariableValues(models.Model):
     class Meta:
@@ -341,6 +401,16 @@ class VariableValues(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs) -> None:
+        """Saves the value and invalidates the cached game metadata."""
+        super().save(*args, **kwargs)
+        transaction.on_commit(lambda: bump_version("games"))
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """Deletes the value and invalidates the cached game metadata."""
+        transaction.on_commit(lambda: bump_version("games"))
+        return super().delete(*args, **kwargs)
+
 
 class Awards(models.Model):
     class Meta:
@@ -397,6 +467,17 @@ class Players(models.Model):
     class Meta:
         verbose_name_plural = "Players"
         ordering = ["name"]
+        indexes = [
+            # Case-insensitive prefix search of players (`search_standings`).
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="srl_players_name_search_idx",
+            ),
+            models.Index(
+                OpClass(Upper("nickname"), name="text_pattern_ops"),
+                name="srl_players_nick_search_idx",
+            ),
+        ]
 
     id = models.CharField(
         max_length=10,
@@ -481,10 +562,195 @@ class Players(models.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        player = super().from_db(db, field_names, values)
+        player._loaded_fields = player.field_values()
+        return player
+
+    def field_values(self) -> dict:
+        """Returns the value of every field set on the instance, without loading deferred ones."""
+        return {
+            field.attname: self.__dict__.get(field.attname, models.DEFERRED)
+            for field in self._meta.concrete_fields
+        }
+
+    def save(self, *args, **kwargs) -> None:
+        """Saves the player and invalidates the cached pages of the player.
+
+        The `players` scope covers anything built from every player (e.g. the names and flags on
+        game pages, the pages of players that did not exist yet, or the list of streamers in the
+        API). It is only bumped when a field of the player changed, since imports save every player
+        they see whether or not anything changed.
+        """
+        changed = (
+            self._state.adding
+            or getattr(self, "_loaded_fields", None) != self.field_values()
+        )
+
+        super().save(*args, **kwargs)
+        self._loaded_fields = self.field_values()
+
+        scopes = (
+            ["players", player_scope(self.id)] if changed else [player_scope(self.id)]
+        )
+        transaction.on_commit(lambda: bump_version(*scopes))
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """Deletes the player and invalidates the cached pages of the player."""
+        transaction.on_commit(lambda: bump_version("players", player_scope(self.id)))
+        return super().delete(*args, **kwargs)
+
+
+class Boards(models.Model):
+    class Meta:
+        verbose_name_plural = "Boards"
+        ordering = ["subcategory"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["game", "category", "level", "values_key"],
+                name="unique_board",
+                nulls_distinct=False,
+            )
+        ]
+
+    runtype_choices = [
+        ("main", "Full Game"),
+        ("il", "Individual Level"),
+    ]
+
+    runtype = models.CharField(
+        max_length=5,
+        choices=runtype_choices,
+        verbose_name="Full-Game or IL",
+    )
+    game = models.ForeignKey(
+        Games,
+        verbose_name="Game",
+        on_delete=models.CASCADE,
+    )
+    category = models.ForeignKey(
+        Categories,
+        verbose_name="Category",
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+    )
+    level = models.ForeignKey(
+        Levels,
+        verbose_name="Level",
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+    )
+    values = models.ManyToManyField(
+        VariableValues,
+        verbose_name="Variable Values",
+        blank=True,
+    )
+    values_key = models.CharField(
+        max_length=255,
+        verbose_name="Variable Values Key",
+        blank=True,
+        default="",
+        help_text=(
+            "Sorted, comma-separated list of the value IDs that make up this board. Together "
+            "with the game, category, and level, this is what makes a board unique."
+        ),
+    )
+    subcategory = models.CharField(
+        max_length=100,
+        verbose_name="Subcategory Name",
+    )
+    defaulttime = models.CharField(
+        verbose_name="Default Time",
+        choices=Games.leaderboard_choices,
+        default="realtime",
+        help_text=(
+            "Timing method used to rank this board. This is copied from the game whenever "
+            "a run is imported into the board."
+        ),
+    )
+    max_points = models.IntegerField(
+        verbose_name="WR Point Maximum",
+        default=0,
+    )
+    coop = models.BooleanField(
+        verbose_name="Co-Op",
+        default=False,
+        help_text=(
+            'Set by every import from the subcategory name (any name containing "Co-Op"); runs '
+            "on a co-op board have two or more runners. Only the best run of a player on a co-op "
+            "board (in any seat) counts towards their points."
+        ),
+    )
+    wr = models.ForeignKey(
+        "Runs",
+        verbose_name="World Record",
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    run_count = models.IntegerField(
+        verbose_name="Run Count",
+        default=0,
+        help_text="Number of non-obsolete runs on this board.",
+    )
+
+    def __str__(self):
+        return f"{self.game.name}: {self.subcategory}"
+
+    def refresh(self) -> None:
+        """Re-caches the world record and run count of the board from its runs.
+
+        Once the current transaction commits, leaderboard snapshots built from this board's run
+        type or game are invalidated and the `Standings` are queued to be rebuilt.
+        """
+        runs = self.runs.filter(obsolete=False)
+
+        self.wr = runs.only("id").filter(place=1).order_by("id").first()
+        self.run_count = runs.count()
+        self.save(update_fields=["wr", "run_count"])
+
+        from srl.tasks import queue_standings  # Done to prevent issues with loops.
+
+        transaction.on_commit(
+            lambda: bump_version(self.runtype, game_scope(self.game_id))
+        )
+        transaction.on_commit(queue_standings)
+
 
 class Runs(models.Model):
     class Meta:
         verbose_name_plural = "Runs"
+        indexes = [
+            # Placings and points of a single board (`update_points`, `Boards.refresh`).
+            models.Index(
+                fields=["board", "place"],
+                condition=models.Q(obsolete=False),
+                name="srl_runs_board_place_idx",
+            ),
+            # Newest world records and personal bests on the main page.
+            models.Index(
+                fields=["-v_date"],
+                condition=models.Q(place=1, obsolete=False, v_date__isnull=False)
+                & ~models.Q(vid_status__in=["new", "rejected"]),
+                name="srl_runs_new_wrs_idx",
+            ),
+            models.Index(
+                fields=["-v_date"],
+                condition=models.Q(place__gt=1, obsolete=False, v_date__isnull=False)
+                & ~models.Q(vid_status__in=["new", "rejected"]),
+                name="srl_runs_new_pbs_idx",
+            ),
+            # Runs awaiting verification (`/api/runs/all?query=status`).
+            models.Index(
+                fields=["vid_status"],
+                condition=models.Q(vid_status="new"),
+                name="srl_runs_unverified_idx",
+            ),
+        ]
 
     statuschoices = [
         ("verified", "Verified"),
@@ -532,6 +798,14 @@ class Runs(models.Model):
         blank=True,
         null=True,
     )
+    board = models.ForeignKey(
+        Boards,
+        verbose_name="Board",
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="runs",
+    )
     variables = models.ManyToManyField(
         Variables,
         verbose_name="Variables",
@@ -668,6 +942,164 @@ class Runs(models.Model):
     def __str__(self):
         return self.id
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        run = super().from_db(db, field_names, values)
+        run._loaded_seats = run.seated_players()
+        run._loaded_date = run.__dict__.get("date", models.DEFERRED)
+        return run
+
+    def seated_players(self) -> tuple:
+        """Returns `player` and `player2` as loaded on the instance, without loading them."""
+        return tuple(
+            self.__dict__.get(field, models.DEFERRED)
+            for field in ["player_id", "player2_id"]
+        )
+
+    def data_scopes(self) -> list[str]:
+        """Returns the scope of every player seated in the run, along with its run type."""
+        players = dict.fromkeys(
+            [
+                self.player_id,
+                self.player2_id,
+                *self.run_players.values_list("player_id", flat=True),
+            ]
+        )
+
+        return [self.runtype] + [
+            player_scope(player) for player in players if player is not None
+        ]
+
+    @classmethod
+    def invalidate(
+        cls,
+        runs: list[str],
+    ) -> None:
+        """Invalidates the data of the run types and players of runs changed in bulk.
+
+        `bulk_update` and `update` skip `save`, so anything changing runs that way has to call
+        this for them (one query) within the same transaction.
+
+        Args:
+            runs (list[str]): IDs of the changed runs.
+        """
+        if not runs:
+            return
+
+        scopes = {}
+        for runtype, player in cls.objects.filter(id__in=runs).values_list(
+            "runtype", "run_players__player_id"
+        ):
+            scopes[runtype] = None
+            if player is not None:
+                scopes[player_scope(player)] = None
+
+        transaction.on_commit(lambda: bump_version(*scopes))
+
+    def save(self, *args, **kwargs) -> None:
+        """Saves the run and invalidates the data of its run type and players.
+
+        The seats of the run and the data of its previous players are only touched when `player`
+        or `player2` changed since the run was loaded, and the date of its seats when `date` did.
+        """
+        update_fields = kwargs.get("update_fields")
+        reseated = self._state.adding or (
+            (update_fields is None or {"player", "player2"} & set(update_fields))
+            and getattr(self, "_loaded_seats", None) != self.seated_players()
+        )
+        redated = not self._state.adding and (
+            (update_fields is None or "date" in update_fields)
+            and getattr(self, "_loaded_date", None)
+            != self.__dict__.get("date", models.DEFERRED)
+        )
+        if not reseated:
+            super().save(*args, **kwargs)
+            if redated:
+                self.redate_seats()
+            self._loaded_date = self.__dict__.get("date", models.DEFERRED)
+            Runs.invalidate([self.pk])
+            return
+
+        old_scopes = self.data_scopes() if self.pk else []
+
+        super().save(*args, **kwargs)
+
+        self.sync_seats()
+        if redated:
+            self.redate_seats()
+        self._loaded_seats = self.seated_players()
+        self._loaded_date = self.__dict__.get("date", models.DEFERRED)
+
+        scopes = list(dict.fromkeys(old_scopes + self.data_scopes()))
+        transaction.on_commit(lambda: bump_version(*scopes))
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """Deletes the run and invalidates the data of its run type and of its players."""
+        scopes = self.data_scopes()
+        transaction.on_commit(lambda: bump_version(*scopes))
+        return super().delete(*args, **kwargs)
+
+    def sync_seats(self) -> None:
+        """Keeps the first two seats of the run in sync with `player` and `player2`.
+
+        A player can only have one seat in a run, so a player moved into the first two seats
+        from a later one (see `set_extra_players`) loses their later seat, and a run with the
+        same player twice only seats them first.
+        """
+        seats = {
+            seat: player
+            for seat, player in enumerate((self.player_id, self.player2_id), 1)
+            if player is not None and (seat == 1 or player != self.player_id)
+        }
+
+        self.run_players.filter(
+            models.Q(seat__in=[1, 2]) | models.Q(player_id__in=seats.values())
+        ).delete()
+        RunPlayers.objects.bulk_create(
+            [
+                RunPlayers(run=self, player_id=player, seat=seat, date=self.date)
+                for seat, player in seats.items()
+            ]
+        )
+
+    def redate_seats(self) -> None:
+        """Copies the `date` of the run to all of its seats (see `RunPlayers.date`)."""
+        self.run_players.update(date=self.date)
+
+    def set_extra_players(
+        self,
+        players: list[str | None],
+    ) -> None:
+        """Seats the players of the run after the first two (e.g. a 3 or 4 player co-op run).
+
+        The first two seats are always `player` and `player2` (see `sync_seats`).
+
+        Args:
+            players (list[str | None]): IDs of every player of the run from speedrun.com, in
+                order. Guests are `None`; they and players that are not imported are left out.
+        """
+        extra = {
+            seat: player
+            for seat, player in enumerate(players[2:], 3)
+            if player is not None
+        }
+        existing = set(
+            Players.objects.filter(id__in=extra.values()).values_list("id", flat=True)
+        )
+
+        self.run_players.filter(seat__gt=2).delete()
+        RunPlayers.objects.bulk_create(
+            [
+                RunPlayers(run=self, player_id=player, seat=seat, date=self.date)
+                for seat, player in extra.items()
+                if player in existing
+            ],
+            ignore_conflicts=True,
+        )
+
+        scopes = [player_scope(player) for player in existing]
+        transaction.on_commit(lambda: bump_version(*scopes))
+
     def set_variables(self, variable_value_map: dict):
         for variable, value in variable_value_map.items():
             VariableValues.objects.create(
@@ -677,6 +1109,65 @@ class Runs(models.Model):
             )
 
 
+class RunPlayers(models.Model):
+    class Meta:
+        verbose_name_plural = "Run Players"
+        ordering = ["run", "seat"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["run", "seat"],
+                name="unique_run_seat",
+            ),
+            models.UniqueConstraint(
+                fields=["run", "player"],
+                name="unique_run_player",
+            ),
+        ]
+        indexes = [
+            # Every run of a player, whatever their seat (profiles and the API), newest first for
+            # their history (`player_history`).
+            models.Index(
+                fields=["player", "-date", "-run"],
+                include=["seat"],
+                name="srl_runplayers_player_idx",
+            ),
+        ]
+
+    run = models.ForeignKey(
+        Runs,
+        verbose_name="Run",
+        on_delete=models.CASCADE,
+        related_name="run_players",
+        db_index=False,  # Covered by `unique_run_seat`.
+    )
+    player = models.ForeignKey(
+        Players,
+        verbose_name="Player",
+        on_delete=models.CASCADE,
+        related_name="player_runs",
+        db_index=False,  # Covered by `srl_runplayers_player_idx`.
+    )
+    seat = models.PositiveSmallIntegerField(
+        verbose_name="Seat",
+        help_text="Position of the player in the run, starting from 1 (`player`).",
+    )
+    date = models.DateTimeField(
+        verbose_name="Submitted Date",
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Copy of the `date` of the run, so a player's runs can be read by date.",
+    )
+
+    def __str__(self):
+        return f"{self.run_id} ({self.seat})"
+
+    def save(self, *args, **kwargs) -> None:
+        """Saves the seat with the date of its run."""
+        self.date = self.run.date
+        super().save(*args, **kwargs)
+
+
 class RunVariableValues(models.Model):
     class Meta:
         verbose_name_plural = "Run Variable Values"
@@ -704,6 +1195,206 @@ class RunVariableValues(models.Model):
         return f"{self.run} - {self.variable.name}: {self.value.name}"
 
 
+class Standings(models.Model):
+    class Meta:
+        verbose_name_plural = "Standings"
+        ordering = ["runtype", "game_id", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["runtype", "game", "player"],
+                name="unique_standing",
+                nulls_distinct=False,
+            ),
+            models.UniqueConstraint(
+                fields=["runtype", "game", "rank"],
+                name="unique_standing_rank",
+                nulls_distinct=False,
+            ),
+        ]
+        indexes = [
+            # Top members of every country (`country_standings`).
+            models.Index(
+                fields=["runtype", "game", "countrycode", "country_rank"],
+                name="srl_standings_country_idx",
+            ),
+        ]
+
+    runtype_choices = [
+        ("all", "Overall"),
+        ("main", "Full Game"),
+        ("il", "Individual Level"),
+    ]
+
+    runtype = models.CharField(
+        max_length=5,
+        choices=runtype_choices,
+        verbose_name="Leaderboard",
+    )
+    game = models.ForeignKey(
+        Games,
+        verbose_name="Game",
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+        help_text="Only set for the IL leaderboard of a game.",
+    )
+    player = models.ForeignKey(
+        Players,
+        verbose_name="Player",
+        on_delete=models.CASCADE,
+    )
+    points = models.IntegerField(
+        verbose_name="Points",
+    )
+    rank = models.IntegerField(
+        verbose_name="Rank",
+        help_text="Position of the player, ordered by points and then by player ID.",
+    )
+    countrycode = models.ForeignKey(
+        CountryCodes,
+        verbose_name="Country",
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        help_text="Copy of the country of the player when the standings were built.",
+    )
+    country_rank = models.IntegerField(
+        verbose_name="Country Rank",
+        blank=True,
+        null=True,
+        help_text="Position of the player among the players of their country.",
+    )
+
+    def __str__(self):
+        return f"{self.get_runtype_display()} #{self.rank}: {self.player.name}"
+
+
+class CountryStandings(models.Model):
+    class Meta:
+        verbose_name_plural = "Country Standings"
+        ordering = ["runtype", "game_id", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["runtype", "game", "countrycode"],
+                name="unique_country_standing",
+                nulls_distinct=False,
+            ),
+            models.UniqueConstraint(
+                fields=["runtype", "game", "rank"],
+                name="unique_country_standing_rank",
+                nulls_distinct=False,
+            ),
+        ]
+
+    runtype = models.CharField(
+        max_length=5,
+        choices=Standings.runtype_choices,
+        verbose_name="Leaderboard",
+    )
+    game = models.ForeignKey(
+        Games,
+        verbose_name="Game",
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+        help_text="Only set for the IL leaderboard of a game.",
+    )
+    countrycode = models.ForeignKey(
+        CountryCodes,
+        verbose_name="Country",
+        on_delete=models.CASCADE,
+    )
+    points = models.IntegerField(
+        verbose_name="Points",
+        help_text="Combined points of every ranked player from the country.",
+    )
+    players = models.IntegerField(
+        verbose_name="Players",
+        help_text="Number of ranked players from the country.",
+    )
+    rank = models.IntegerField(
+        verbose_name="Rank",
+        help_text="Position of the country, ordered by points and then by country code.",
+    )
+
+    def __str__(self):
+        return f"{self.get_runtype_display()} #{self.rank}: {self.countrycode.name}"
+
+
+class WorldRecords(models.Model):
+    class Meta:
+        verbose_name = "World Record"
+        verbose_name_plural = "World Records"
+        ordering = ["game", "date"]
+        indexes = [
+            models.Index(
+                fields=["game", "player"],
+                name="srl_wrs_game_player_idx",
+            ),
+            models.Index(
+                fields=["game", "date"],
+                name="srl_wrs_game_date_idx",
+            ),
+        ]
+
+    game = models.ForeignKey(
+        Games,
+        verbose_name="Game",
+        on_delete=models.CASCADE,
+    )
+    run = models.OneToOneField(
+        Runs,
+        verbose_name="Run",
+        on_delete=models.CASCADE,
+    )
+    player = models.ForeignKey(
+        Players,
+        verbose_name="Player",
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+    )
+    exempt = models.BooleanField(
+        verbose_name="Exempt From Oldest Records",
+        default=False,
+    )
+    date = models.DateTimeField(
+        verbose_name="Submitted Date",
+        blank=True,
+        null=True,
+    )
+
+    def __str__(self):
+        return f"{self.game.name}: {self.run.subcategory}"
+
+
+class FeaturedBoards(models.Model):
+    class Meta:
+        verbose_name = "Featured Board"
+        verbose_name_plural = "Featured Boards"
+
+    board = models.OneToOneField(
+        Boards,
+        verbose_name="Board",
+        related_name="featured",
+        on_delete=models.CASCADE,
+        help_text="Board whose world record is shown on the main page.",
+    )
+
+    def __str__(self):
+        return str(self.board)
+
+    def save(self, *args, **kwargs) -> None:
+        """Saves the featured board and invalidates the featured records of the main page."""
+        super().save(*args, **kwargs)
+        transaction.on_commit(lambda: bump_version("featured"))
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """Deletes the featured board and invalidates the featured records of the main page."""
+        transaction.on_commit(lambda: bump_version("featured"))
+        return super().delete(*args, **kwargs)
+
+
 class NowStreaming(models.Model):
     class Meta:
         verbose_name = "Stream"
@@ -740,3 +1431,13 @@ class NowStreaming(models.Model):
 
     def __str__(self):
         return f"Streaming: {self.streamer.name}"
+
+    def save(self, *args, **kwargs) -> None:
+        """Saves the stream and invalidates the "Currently Streaming" section of the main page."""
+        super().save(*args, **kwargs)
+        transaction.on_commit(lambda: bump_version("streams"))
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        """Deletes the stream and invalidates the "Currently Streaming" section of the main page."""
+        transaction.on_commit(lambda: bump_version("streams"))
+        return super().delete(*args, **kwargs)
@@ -1,15 +1,47 @@
+// IL pages only ship the runs of the first subcategory; the others are loaded (once) from the
+// board URL of the table when they are selected.
+var loadedBoards = {};
+
 function updateLeaderboard(selectedSubcategory) {
+    if (selectedSubcategory === undefined) {
+        return;
+    }
+
     var runsData = JSON.parse(document.getElementById("runs-data").textContent);
     var runs = runsData;
 
     var leaderboardTable = document.getElementById("leaderboard-table");
-    var leaderboardBody = leaderboardTable.getElementsByTagName("tbody")[0];
-    leaderboardBody.innerHTML = '';
+    var boardUrl = leaderboardTable.dataset.boardUrl;
 
     var filteredRuns = runs.filter(function (run) {
         return run.subcategory === selectedSubcategory;
     });
 
+    if (!boardUrl || filteredRuns.length > 0) {
+        renderLeaderboard(filteredRuns);
+    } else if (selectedSubcategory in loadedBoards) {
+        renderLeaderboard(loadedBoards[selectedSubcategory]);
+    } else {
+        fetch(boardUrl + "?subcategory=" + encodeURIComponent(selectedSubcategory))
+            .then(function (response) {
+                return response.json();
+            })
+            .then(function (data) {
+                loadedBoards[selectedSubcategory] = data.runs;
+
+                // Another subcategory may have been selected while this one was loading.
+                if (document.getElementById("subcategory-dropdown").value === selectedSubcategory) {
+                    renderLeaderboard(data.runs);
+                }
+            });
+    }
+}
+
+function renderLeaderboard(filteredRuns) {
+    var leaderboardTable = document.getElementById("leaderboard-table");
+    var leaderboardBody = leaderboardTable.getElementsByTagName("tbody")[0];
+    leaderboardBody.innerHTML = '';
+
     filteredRuns.forEach(function (run, index) {
         var row = leaderboardBody.insertRow();
         var rankCell = row.insertCell();
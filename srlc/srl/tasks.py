@@ -5,13 +5,33 @@ from itertools import product
 
 import requests
 from celery import chain, shared_task
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from langcodes import standardize_tag
 
-from srl.m_tasks import points_formula, src_api, time_conversion
+from srl.cache import (
+    SNAPSHOT_TIMEOUT,
+    bump_version,
+    game_scope,
+    get_versions,
+    player_scope,
+    snapshot_key,
+)
+from srl.leaderboard_view import (
+    EMPTY_BOARD,
+    board_key,
+    board_payloads,
+    player_points,
+    ranked_runs,
+)
+from srl.m_tasks import get_board, points_formula, src_api, time_conversion
 from srl.models import (
+    Boards,
     Categories,
     CountryCodes,
+    CountryStandings,
     Games,
     Levels,
     Platforms,
@@ -19,10 +39,18 @@ from srl.models import (
     Runs,
     RunVariableValues,
     Series,
+    Standings,
     Variables,
     VariableValues,
+    WorldRecords,
 )
 
+STANDINGS_QUEUED = "standings:queued"
+STANDINGS_LOCK = "standings:lock"
+STANDINGS_DELAY = 30
+# Seconds after which the lock of a rebuild that never finished (e.g. a killed worker) expires.
+STANDINGS_LOCK_TIMEOUT = 60 * 30
+
 
 @shared_task
 def update_game(
@@ -559,6 +587,7 @@ def invoke_runs(
             to include the world record and subsequent speedruns.
 
     Called Functions:
+        - `get_board`
         - `invoke_players`
         - `points_formula`
         - `time_conversion`
@@ -585,8 +614,10 @@ def invoke_runs(
         pb_records = leaderboard["runs"][1:]
         wr_players = wr_records["run"]["players"]
         game_get = Games.objects.only(
-            "id", "pointsmax", "ipointsmax", "defaulttime", "idefaulttime"
+            "id", "name", "pointsmax", "ipointsmax", "defaulttime", "idefaulttime"
         ).get(id=game_id)
+        category_get = Categories.objects.only("id").get(id=category["id"])
+        boards = set()
 
         if "category extension" in wr_records["run"]["game"].lower():
             wr_points = game_get.pointsmax
@@ -689,15 +720,22 @@ def invoke_runs(
                     var_level = f"{level.name}"
                 var_name = build_var_name(var_level, wr_records["run"]["values"])
             else:
+                level = None
                 base_name = category["name"]
                 var_name = build_var_name(base_name, wr_records["run"]["values"])
 
+            board = get_board(
+                game_get, category_get, level, wr_records["run"]["values"], var_name
+            )
+            boards.add(board)
+
             default = {
                 "runtype": "main" if category["type"] == "per-game" else "il",
                 "player": player_get,
                 "game": game_get,
-                "category": Categories.objects.only("id").get(id=category["id"]),
+                "category": category_get,
                 "subcategory": var_name,
+                "board": board,
                 "place": 1,
                 "url": wr_records["run"]["weblink"],
                 "video": wr_video,
@@ -748,6 +786,12 @@ def invoke_runs(
 
             with transaction.atomic():
                 run_obj, _ = Runs.objects.update_or_create(id=run_id, defaults=default)
+                run_obj.set_extra_players(
+                    [
+                        player.get("id") if player["rel"] == "user" else None
+                        for player in wr_players
+                    ]
+                )
 
             # If the world record has specific variable:value pairs, this will get them and
             # place them into a special RunsVariableValues model that is linked back to the
@@ -839,17 +883,22 @@ def invoke_runs(
                             var_level = f"{level.name}"
                         var_name = build_var_name(var_level, pb["run"]["values"])
                     else:
+                        level = None
                         base_name = category["name"]
                         var_name = build_var_name(base_name, pb["run"]["values"])
 
+                    board = get_board(
+                        game_get, category_get, level, pb["run"]["values"], var_name
+                    )
+                    boards.add(board)
+
                     default = {
                         "runtype": "main" if category["type"] == "per-game" else "il",
                         "player": player_get,
                         "game": game_get,
-                        "category": Categories.objects.only("id").get(
-                            id=category["id"]
-                        ),
+                        "category": category_get,
                         "subcategory": var_name,
+                        "board": board,
                         "place": pb["place"],
                         "url": pb["run"]["weblink"],
                         "video": pb_video,
@@ -905,6 +954,12 @@ def invoke_runs(
                         run_obj, _ = Runs.objects.update_or_create(
                             id=run_id, defaults=default
                         )
+                        run_obj.set_extra_players(
+                            [
+                                player.get("id") if player["rel"] == "user" else None
+                                for player in pb_players
+                            ]
+                        )
 
                     # If the speedrun has specific variable:value pairs, this will get them and
                     # place them into a special RunsVariableValues model that is linked back to the
@@ -918,6 +973,11 @@ def invoke_runs(
                                 run=run_obj, variable=variable, value=value
                             )
 
+        # Once the entire leaderboard is imported, the world record and run count of every board
+        # that was touched is re-cached.
+        for board in boards:
+            board.refresh()
+
 
 @shared_task
 def invoke_players(
@@ -1117,3 +1177,266 @@ def import_obsolete(
                                 points_reset,
                                 download_pfp,
                             )
+
+
+def build_standings(
+    runtype: str,
+    game_id: str = None,
+) -> set[str]:
+    """Replaces one leaderboard of the `Standings` model with the current points of every player.
+
+    The `CountryStandings` of the same leaderboard are maintained from the same rows: every
+    country gets the combined points and the number of its ranked players, and every player their
+    rank within their country. Only the countries whose totals or rank changed are rewritten.
+
+    Args:
+        runtype (str): `all`, `main`, or `il`.
+        game_id (str): None by default. ID of the game for IL leaderboards.
+
+    Returns:
+        set[str]: IDs of the players whose points or rank changed. Every player on the leaderboard
+            is included when the number of ranked players changed.
+
+    Called Functions:
+        - `ranked_runs`
+        - `player_points`
+    """
+    points = {"all": "total_points", "main": "main_points", "il": "il_points"}[runtype]
+
+    runs = ranked_runs()
+    if game_id:
+        runs = runs.filter(game_id=game_id)
+
+    standings = (
+        player_points(runs)
+        .filter(**{f"{points}__gt": 0})
+        .annotate(
+            rank=Window(
+                RowNumber(),
+                order_by=[F(points).desc(), F("id").asc()],
+            )
+        )
+        .values_list("id", "countrycode_id", points, "rank")
+        .order_by("rank")
+    )
+
+    rows = []
+    countries = {}
+    for player_id, countrycode, total, rank in standings:
+        country_rank = None
+        if countrycode:
+            country = countries.setdefault(countrycode, {"points": 0, "players": 0})
+            country["points"] += total
+            country["players"] += 1
+            country_rank = country["players"]
+
+        rows.append(
+            Standings(
+                runtype=runtype,
+                game_id=game_id,
+                player_id=player_id,
+                points=total,
+                rank=rank,
+                countrycode_id=countrycode,
+                country_rank=country_rank,
+            )
+        )
+
+    totals = {
+        countrycode: (country["points"], country["players"], rank)
+        for rank, (countrycode, country) in enumerate(
+            sorted(countries.items(), key=lambda item: (-item[1]["points"], item[0])),
+            start=1,
+        )
+    }
+
+    with transaction.atomic():
+        leaderboard = Standings.objects.filter(runtype=runtype, game_id=game_id)
+        before = set(leaderboard.values_list("player_id", "points", "rank"))
+        leaderboard.delete()
+        Standings.objects.bulk_create(rows, batch_size=1000)
+
+        country_standings = CountryStandings.objects.filter(
+            runtype=runtype, game_id=game_id
+        )
+        current = {
+            countrycode: (total, players, rank)
+            for countrycode, total, players, rank in country_standings.values_list(
+                "countrycode_id", "points", "players", "rank"
+            )
+        }
+        changed = {
+            countrycode
+            for countrycode, total in totals.items()
+            if current.get(countrycode) != total
+        }
+
+        # Changed rows are replaced rather than updated, so two countries can swap ranks.
+        country_standings.filter(
+            countrycode__in=changed | (current.keys() - totals.keys())
+        ).delete()
+        CountryStandings.objects.bulk_create(
+            [
+                CountryStandings(
+                    runtype=runtype,
+                    game_id=game_id,
+                    countrycode_id=countrycode,
+                    points=totals[countrycode][0],
+                    players=totals[countrycode][1],
+                    rank=totals[countrycode][2],
+                )
+                for countrycode in changed
+            ]
+        )
+
+    after = {(row.player_id, row.points, row.rank) for row in rows}
+    if len(before) != len(after):
+        return {player for player, _, _ in before | after}
+
+    return {player for player, _, _ in before ^ after}
+
+
+def build_records(
+    game: Games,
+) -> bool:
+    """Replaces the `WorldRecords` of a game with its current IL world records.
+
+    Args:
+        game (Games): The game being rebuilt.
+
+    Returns:
+        bool: True if the world records of the game changed.
+
+    Called Functions:
+        - `ranked_runs`
+    """
+    exempt = set(
+        Levels.objects.filter(game=game, records_exempt=True).values_list(
+            "id", flat=True
+        )
+    )
+    records = (
+        ranked_runs()
+        .filter(game=game, runtype="il", place=1)
+        .values_list("id", "player_id", "level_id", "date")
+    )
+
+    rows = [
+        WorldRecords(
+            game=game,
+            run_id=run_id,
+            player_id=player_id,
+            exempt=level_id in exempt,
+            date=date,
+        )
+        for run_id, player_id, level_id, date in records
+    ]
+
+    with transaction.atomic():
+        current = WorldRecords.objects.filter(game=game)
+        before = set(current.values_list("run_id", "player_id", "exempt", "date"))
+        current.delete()
+        WorldRecords.objects.bulk_create(rows)
+
+    return before != {(row.run_id, row.player_id, row.exempt, row.date) for row in rows}
+
+
+def build_boards() -> None:
+    """Stores the full-game and IL page payload of every game as a snapshot of that game.
+
+    Every payload is built from one pass over `Runs`; games without runs of a type get an empty
+    payload. The versions are read before the runs, so a game changed in between is simply rebuilt
+    by its next page view.
+
+    Called Functions:
+        - `board_payloads`
+    """
+    games = list(Games.objects.values_list("id", flat=True))
+    *versions, players_version = get_versions(
+        [game_scope(game_id) for game_id in games] + ["players"]
+    )
+
+    payloads = board_payloads()
+
+    cache.set_many(
+        {
+            snapshot_key(
+                board_key(game_id, runtype), [version, players_version]
+            ): payloads.get((game_id, runtype), EMPTY_BOARD)
+            for game_id, version in zip(games, versions)
+            for runtype in ["main", "il"]
+        },
+        SNAPSHOT_TIMEOUT,
+    )
+
+
+@shared_task
+def update_standings() -> None:
+    """Rebuilds the overall, full-game, and every per-game IL leaderboard of `Standings`.
+
+    The `WorldRecords` of every game with IL record panels (`Games.il_records`) are rebuilt along
+    with them, followed by the game page payloads. Only the games whose IL standings or records
+    changed and the players whose overall standing changed have their scopes bumped, so the pages
+    of everyone else stay cached. The `standings` version is bumped last, so anything cached from
+    the standings (e.g. the leaderboards API) is only rebuilt once they are complete.
+
+    Only one rebuild runs at a time (`STANDINGS_LOCK`); a rebuild queued while another is running
+    is queued again instead of replacing the same rows alongside it.
+
+    Called Functions:
+        - `build_standings`
+        - `build_records`
+        - `build_boards`
+    """
+    if not cache.add(STANDINGS_LOCK, True, STANDINGS_LOCK_TIMEOUT):
+        # Another rebuild is running; this one runs after it instead of alongside it.
+        update_standings.apply_async(countdown=STANDINGS_DELAY)
+        return
+
+    try:
+        cache.delete(STANDINGS_QUEUED)
+
+        players = build_standings("all")
+        build_standings("main")
+
+        il_games = list(
+            Boards.objects.filter(runtype="il")
+            .values_list("game_id", flat=True)
+            .distinct()
+        )
+        games = {game_id for game_id in il_games if build_standings("il", game_id)}
+
+        stale = Standings.objects.filter(runtype="il").exclude(game_id__in=il_games)
+        games.update(stale.values_list("game_id", flat=True))
+        stale.delete()
+        CountryStandings.objects.filter(runtype="il").exclude(
+            game_id__in=il_games
+        ).delete()
+
+        for game in Games.objects.filter(il_records=True):
+            if build_records(game):
+                games.add(game.id)
+
+        stale = WorldRecords.objects.exclude(game__il_records=True)
+        games.update(stale.values_list("game_id", flat=True))
+        stale.delete()
+
+        bump_version(
+            *[game_scope(game_id) for game_id in games],
+            *[player_scope(player_id) for player_id in players],
+        )
+
+        build_boards()
+        bump_version("standings")
+    finally:
+        cache.delete(STANDINGS_LOCK)
+
+
+def queue_standings() -> None:
+    """Queues `update_standings`, unless it is already queued.
+
+    Imports refresh many boards at once, so every refresh within `STANDINGS_DELAY` seconds is
+    folded into a single rebuild.
+    """
+    if cache.add(STANDINGS_QUEUED, True, STANDINGS_DELAY * 10):
+        update_standings.apply_async(countdown=STANDINGS_DELAY)
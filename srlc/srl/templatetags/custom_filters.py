@@ -1,11 +1,8 @@
 import re
 
 from django import template
-from django.db.models import Sum
 from django.utils.timezone import now
 
-from srl.models import Games, Players, Runs
-
 register = template.Library()
 
 
@@ -37,12 +34,12 @@ def filter_game_name(
     game_runs,
     game_name,
 ) -> str:
-    """Filters game names."""
-    return [
-        game
-        for game in game_runs
-        if Games.objects.only("id", "name").get(id=game.game.id).name == game_name
-    ]
+    """Filters runs by the name of their game.
+
+    The game of every run is read from the run itself, so `game_runs` should come from a queryset
+    with `select_related("game")`.
+    """
+    return [run for run in game_runs if run.game.name == game_name]
 
 
 @register.filter
@@ -71,38 +68,6 @@ def trim(
     return value.strip()
 
 
-@register.filter
-def get_rank(
-    game_name,
-    player_name,
-) -> str:
-    """Gets the current rank of a specific speedrun versus other runners."""
-    players = Players.objects.only("id").all()
-    leaderboard = []
-
-    game_id = Games.objects.get(name=game_name).id
-    il_board = Runs.objects.only("id").filter(runtype="il", gameid=game_id).all()
-
-    for player in players:
-        il_points = (
-            il_board.only("id", "points")
-            .filter(playerid=player.id)
-            .aggregate(total_points=Sum("points"))["total_points"]
-            or 0
-        )
-        leaderboard.append({"player": player, "total_points": il_points})
-
-    il_leaderboard = sorted(leaderboard, key=lambda x: x["total_points"], reverse=True)
-
-    rank_start = 1
-    for rank, item in enumerate(il_leaderboard, start=rank_start):
-        item["rank"] = rank
-
-    for entry in il_leaderboard:
-        if entry["player"] == player_name:
-            return entry
-
-
 @register.filter
 def time_since(
     value,
@@ -1,31 +1,65 @@
 from django.urls import path
 
+from srl.cache import cached_page, conditional_page
 from srl.complex_views import (
+    HOME_TIMEOUTS,
+    CountryLeaderboard,
     FG_Leaderboard,
     GameLeaderboard,
     IL_Leaderboard,
+    ILBoard,
     ILGameLeaderboard,
-    Leaderboard,
     MainPage,
     PlayerHistory,
+    PlayerHistoryJSON,
     PlayerProfile,
+    game_page_scopes,
+    player_history_scopes,
+    player_page_scopes,
     search_leaderboard,
 )
+from srl.leaderboard_view import Leaderboard
 from srl.static_views import FAQ, Changelog, PrivacyPolicy
 
+# Pages are cached for anonymous visitors until the data they are built from changes; see
+# `cached_page` for the surrogate keys (scopes) of every page.
+home_page = cached_page(
+    lambda: ["main", "il", "featured", "streams"], HOME_TIMEOUTS["streams"]
+)
+standings_page = cached_page(lambda: ["standings"])
+game_page = cached_page(game_page_scopes)
+player_page = cached_page(player_page_scopes)
+# Streamed responses cannot be stored, but are still answered with `304 Not Modified`.
+history_json = conditional_page(player_history_scopes)
+
 urlpatterns = [
-    path("", MainPage, name="Leaderboard"),
+    path("", home_page(MainPage), name="Leaderboard"),
     path("privacy", PrivacyPolicy, name="PrivacyPolicy"),
     path("changelog", Changelog, name="Changelog"),
     path("faq", FAQ, name="FAQ"),
-    path("overall", Leaderboard, name="Leaderboard"),
+    path("overall", standings_page(Leaderboard), name="Leaderboard"),
     # path("overall/<int:year>/", MonthlyLeaderboard, name="YearlyLeaderboard"),
     # path("overall/<int:year>/<int:month>", MonthlyLeaderboard, name="MonthlyLeaderboard"),
-    path("fullgame", FG_Leaderboard, name="FullGameLeaderboard"),
-    path("player/<str:name>", PlayerProfile, name="PlayerProfile"),
-    path("player/<str:name>/history", PlayerHistory, name="PlayerHistory"),
-    path("<str:slug>/", GameLeaderboard, name="CategorySelection"),
-    path("<str:slug>/all", IL_Leaderboard, name="GameLeaderboard"),
-    path("<str:slug>/ils", ILGameLeaderboard, name="CategorySelection"),
-    path("lbs/search", search_leaderboard, name="search_leaderboard"),
+    path("fullgame", standings_page(FG_Leaderboard), name="FullGameLeaderboard"),
+    path("countries", standings_page(CountryLeaderboard), name="CountryLeaderboard"),
+    path("player/<str:name>", player_page(PlayerProfile), name="PlayerProfile"),
+    path(
+        "player/<str:name>/history",
+        player_page(PlayerHistory),
+        name="PlayerHistory",
+    ),
+    path(
+        "player/<str:name>/history/json",
+        history_json(PlayerHistoryJSON),
+        name="PlayerHistoryJSON",
+    ),
+    path("<str:slug>/", game_page(GameLeaderboard), name="CategorySelection"),
+    path("<str:slug>/all", game_page(IL_Leaderboard), name="GameLeaderboard"),
+    path("<str:slug>/ils", game_page(ILGameLeaderboard), name="CategorySelection"),
+    path("<str:slug>/ils/board", game_page(ILBoard), name="ILBoard"),
+    path(
+        "lbs/search",
+        standings_page(search_leaderboard),
+        name="search_leaderboard",
+    ),
 ]
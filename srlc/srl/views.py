@@ -1,8 +1,10 @@
 import asyncio
 import time
 
+from api.tasks import audit_boards
+from django.contrib import admin
 from django.http import HttpRequest, HttpResponse
-from django.shortcuts import redirect
+from django.shortcuts import redirect, render
 from django.views.generic import ListView, View
 
 from srl.init_series import init_series
@@ -94,3 +96,38 @@ class ImportObsoleteView(ListView):
             time.sleep(10)
 
         return redirect("/illiad/srl/players/")
+
+
+class AuditBoardsView(View):
+    """Displays the drift between the stored and expected rankings of all selected boards.
+
+    The report is read-only; fixing the drift is only done from the form of the report (POST).
+    """
+
+    def get(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse:
+        board_ids = [
+            int(id) for id in request.GET.get("board_ids", "").split(",") if id
+        ]
+
+        context = {
+            **admin.site.each_context(request),
+            "title": "Audit Boards",
+            "report": audit_boards(board_ids or None),
+            "board_ids": ",".join(str(id) for id in board_ids),
+        }
+
+        return render(request, "admin/srl/audit_boards.html", context)
+
+    def post(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse:
+        board_ids = [
+            int(id) for id in request.POST.get("board_ids", "").split(",") if id
+        ]
+        audit_boards.delay(board_ids or None, None, True)
+
+        return redirect("/illiad/srl/boards/")
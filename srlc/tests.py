@@ -1,35 +1,124 @@
 import datetime
+import json
+from unittest.mock import patch
 
+from api.serializers import PlayerSerializer, RunSerializer
+from api.tasks import audit_boards, remove_obsolete, update_points
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.template import engines
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils import timezone
+from rest_framework_api_key.models import APIKey
+from srl.cache import get_versions, player_scope
+from srl.leaderboard_view import (
+    StandingsPaginator,
+    board_payloads,
+    board_runs,
+    counted_runs,
+    country_standings,
+    featured_records,
+    get_player_rank,
+    player_history,
+    player_points,
+    player_summary,
+    ranked_runs,
+    record_panels,
+    search_standings,
+)
+from srl.m_tasks import get_board, points_formula
+from srl.tasks import STANDINGS_LOCK, update_standings
 from srl.models import (
     Awards,
+    Boards,
     Categories,
     CountryCodes,
+    CountryStandings,
+    FeaturedBoards,
     Games,
     Levels,
     NowStreaming,
     Platforms,
     Players,
+    RunPlayers,
     Runs,
     RunVariableValues,
+    Standings,
     Series,
     Variables,
     VariableValues,
 )
 
 
-class HomepageTestCase(TestCase):
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tests",
+        }
+    }
+)
+class LocalTestCase(TestCase):
+    """Keeps every test away from the Redis cache and Celery broker of a deployment.
+
+    Versions and snapshots are kept in a cache local to the test run (emptied before every test),
+    and queued standings rebuilds are never sent to the broker.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+        queued = patch.object(update_standings, "apply_async")
+        queued.start()
+        self.addCleanup(queued.stop)
+
+
+class HomepageTestCase(LocalTestCase):
     def setUp(self):
+        super().setUp()
         self.client = Client()
 
     def test_homepage_200(self):
         response = self.client.get("/")
         self.assertEqual(response.status_code, 200)
 
+    def test_homepage_fragments(self):
+        self.client.get("/")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/").status_code, 200)
+
+        # Only the stream section is rebuilt when a stream starts.
+        player = Players.objects.create(
+            id="streamer", name="Streamer", url="https://speedrun.com/"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            NowStreaming.objects.create(
+                streamer=player,
+                title="WR attempts",
+                offline_ct=0,
+                stream_time=timezone.now(),
+            )
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/")
+        self.assertContains(response, "WR attempts")
+
+    def test_render_guard(self):
+        with self.assertNoLogs("website.template_backend", "WARNING"):
+            self.client.get("/")
+
+        template = engines["django"].from_string("{{ players.count }}")
+        with self.assertLogs("website.template_backend", "WARNING"):
+            self.assertEqual(template.render({"players": Players.objects.all()}), "0")
 
-class ModelTestCase(TestCase):
+
+class ModelTestCase(LocalTestCase):
     def setUp(self):
+        super().setUp()
         self.client = Client()
 
     @classmethod
@@ -206,3 +295,997 @@ class ModelTestCase(TestCase):
 
     def test_streaming(self):
         self.assertEqual(NowStreaming.objects.all().exists(), True)
+
+
+class BoardTestCase(LocalTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.game = Games.objects.create(
+            id="brdgame",
+            name="Tony Hank's Underground",
+            slug="thug1",
+            release="2003-10-28",
+            boxart="https://speedrun.com/",
+            defaulttime="realtime",
+            pointsmax=1000,
+        )
+        cls.category = Categories.objects.create(
+            id="anypct",
+            game=cls.game,
+            name="Any%",
+            type="per-game",
+            url="https://speedrun.com/thug1",
+        )
+        cls.variable = Variables.objects.create(
+            id="diff",
+            name="Difficulty",
+            game=cls.game,
+            cat=cls.category,
+            scope="full-game",
+        )
+        cls.value = VariableValues.objects.create(
+            var=cls.variable,
+            name="Beginner",
+            value="beg",
+        )
+
+        cls.board = get_board(cls.game, cls.category, None, {}, "Any%")
+
+        for player_id in ["p1", "p2", "p3"]:
+            Players.objects.create(
+                id=player_id, name=player_id, url="https://speedrun.com/"
+            )
+
+        for run_id, player_id, secs in [
+            ("r1", "p1", 100.0),
+            ("r2", "p2", 110.0),
+            ("r3", "p3", 110.0),
+            ("r4", "p1", 120.0),
+        ]:
+            Runs.objects.create(
+                id=run_id,
+                runtype="main",
+                game=cls.game,
+                category=cls.category,
+                subcategory="Any%",
+                board=cls.board,
+                player_id=player_id,
+                place=0,
+                url="https://speedrun.com/",
+                time_secs=secs,
+                timenl_secs=0.0,
+                timeigt_secs=0.0,
+            )
+
+    def test_get_board(self):
+        self.assertEqual(
+            get_board(self.game, self.category, None, {}, "Any%"), self.board
+        )
+        self.assertEqual(self.board.max_points, 1000)
+        self.assertEqual(self.board.defaulttime, "realtime")
+
+        beginner = get_board(
+            self.game, self.category, None, {"diff": "beg"}, "Any% (Beginner)"
+        )
+        self.assertNotEqual(beginner, self.board)
+        self.assertEqual(beginner.values_key, "beg")
+        self.assertEqual(Boards.objects.filter(game=self.game).count(), 2)
+
+    def test_update_points(self):
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+                update_points(self.board.id)
+
+        # `Boards.refresh` reads no deferred fields of the boards loaded by the tasks.
+        board_reads = [q for q in queries if 'FROM "srl_boards"' in q["sql"]]
+        self.assertEqual(len(board_reads), 2)
+
+        self.assertTrue(Runs.objects.get(id="r4").obsolete)
+        self.assertEqual(
+            list(
+                Runs.objects.filter(board=self.board, obsolete=False)
+                .order_by("id")
+                .values_list("place", "points")
+            ),
+            [
+                (1, 1000),
+                (2, points_formula(100.0, 110.0, 1000)),
+                (2, points_formula(100.0, 110.0, 1000)),
+            ],
+        )
+
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.wr_id, "r1")
+        self.assertEqual(self.board.run_count, 3)
+
+    def test_audit_boards(self):
+        report = audit_boards()
+        self.assertEqual(len(report), 1)
+        self.assertEqual(report[0]["obsolete"], 1)
+        self.assertEqual(report[0]["place"], 3)
+        self.assertTrue(report[0]["stale"])
+
+        audit_boards(fix=True)
+        self.assertEqual(audit_boards(), [])
+
+        fixed = list(
+            Runs.objects.order_by("id").values_list("obsolete", "place", "points")
+        )
+        remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+        update_points(self.board.id)
+        self.assertEqual(
+            fixed,
+            list(
+                Runs.objects.order_by("id").values_list("obsolete", "place", "points")
+            ),
+        )
+
+    def test_audit_boards_view(self):
+        client = Client()
+        client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+        url = f"/illiad/srl/boards/audit-boards/?board_ids={self.board.id}"
+
+        # The report never writes to the database, even when asked to fix the drift.
+        with patch("srl.views.audit_boards.delay") as delay:
+            self.assertEqual(client.get(f"{url}&fix=1").status_code, 200)
+            delay.assert_not_called()
+
+            response = client.post(url, {"board_ids": str(self.board.id)})
+            self.assertEqual(response.status_code, 302)
+            delay.assert_called_once_with([self.board.id], None, True)
+
+    def test_insert_run(self):
+        remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+        update_points(self.board.id)
+
+        def board_state():
+            return list(
+                Runs.objects.filter(board=self.board, obsolete=False)
+                .order_by("id")
+                .values_list("id", "place", "points")
+            )
+
+        for run_id, player_id, secs in [("r5", "p3", 105.0), ("r6", "p2", 95.0)]:
+            Runs.objects.create(
+                id=run_id,
+                runtype="main",
+                game=self.game,
+                category=self.category,
+                subcategory="Any%",
+                board=self.board,
+                player_id=player_id,
+                place=0,
+                url="https://speedrun.com/",
+                time_secs=secs,
+                timenl_secs=0.0,
+                timeigt_secs=0.0,
+            )
+            remove_obsolete(self.board.id, [{"rel": "user", "id": player_id}])
+
+            with CaptureQueriesContext(connection) as queries:
+                update_points(self.board.id, run_id)
+
+            incremental = board_state()
+            update_points(self.board.id)
+            self.assertEqual(incremental, board_state())
+
+            if run_id == "r5":
+                updates = [q for q in queries if q["sql"].startswith("UPDATE")]
+                self.assertEqual(len(updates), 3)  # new run, r2, and the board
+
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.wr_id, "r6")
+
+    def test_coop_points(self):
+        coop = get_board(self.game, self.category, None, {"diff": "beg"}, "Co-Op")
+        self.assertTrue(coop.coop)
+
+        for run_id, player_id, player2_id, points in [
+            ("c1", "p1", "p2", 500),
+            ("c2", "p3", "p1", 400),
+        ]:
+            Runs.objects.create(
+                id=run_id,
+                runtype="main",
+                game=self.game,
+                category=self.category,
+                subcategory="Co-Op",
+                board=coop,
+                player_id=player_id,
+                player2_id=player2_id,
+                place=1,
+                points=points,
+                url="https://speedrun.com/",
+            )
+
+        for player_id, counted in [("p1", ["c1"]), ("p2", ["c1"]), ("p3", ["c2"])]:
+            self.assertEqual(
+                list(
+                    Runs.objects.filter(board=coop)
+                    .filter(counted_runs(player_id))
+                    .filter(run_players__player_id=player_id)
+                    .values_list("id", flat=True)
+                ),
+                counted,
+            )
+
+        points = {
+            player.id: player.main_points for player in player_points(ranked_runs())
+        }
+        self.assertEqual(points["p1"], 500)
+        self.assertEqual(points["p3"], 400)
+
+    def test_coop_obsolete(self):
+        coop = get_board(self.game, self.category, None, {"diff": "beg"}, "Co-Op")
+
+        def add_run(run_id, player_id, player2_id, secs):
+            Runs.objects.create(
+                id=run_id,
+                runtype="main",
+                game=self.game,
+                category=self.category,
+                subcategory="Co-Op",
+                board=coop,
+                player_id=player_id,
+                player2_id=player2_id,
+                place=0,
+                url="https://speedrun.com/",
+                time_secs=secs,
+                timenl_secs=0.0,
+                timeigt_secs=0.0,
+            )
+            remove_obsolete(
+                coop.id,
+                [{"rel": "user", "id": player} for player in [player_id, player2_id]],
+            )
+            update_points(coop.id)
+
+        def current():
+            return list(
+                Runs.objects.filter(board=coop, obsolete=False)
+                .order_by("id")
+                .values_list("id", flat=True)
+            )
+
+        # A faster run by p2 with someone else keeps the only run of p1.
+        add_run("c1", "p1", "p2", 120.0)
+        add_run("c2", "p3", "p2", 100.0)
+        self.assertEqual(current(), ["c1", "c2"])
+        self.assertEqual(audit_boards([coop.id]), [])
+
+        # Only the runs submitted by p1 (the first seat) obsolete each other.
+        add_run("c3", "p1", "p3", 90.0)
+        self.assertEqual(current(), ["c2", "c3"])
+        self.assertEqual(audit_boards([coop.id]), [])
+
+    def test_run_players(self):
+        coop = get_board(self.game, self.category, None, {"diff": "beg"}, "Co-Op")
+        run = Runs.objects.create(
+            id="c1",
+            runtype="main",
+            game=self.game,
+            category=self.category,
+            subcategory="Co-Op",
+            board=coop,
+            player_id="p1",
+            player2_id="p2",
+            place=1,
+            points=500,
+            url="https://speedrun.com/",
+        )
+        run.set_extra_players(["p1", "p2", None, "p3", "unknown"])
+
+        self.assertEqual(
+            list(run.run_players.values_list("seat", "player_id")),
+            [(1, "p1"), (2, "p2"), (4, "p3")],
+        )
+        self.assertEqual(
+            RunSerializer().get_players(run), ("p1", "p2", "Anonymous", "p3")
+        )
+        self.assertIn("c1", [run.id for run in player_history("p3")])
+
+        points = {
+            player.id: player.main_points for player in player_points(ranked_runs())
+        }
+        self.assertEqual(points["p3"], 500)
+
+        # The first two seats follow `player` and `player2`.
+        run.player2_id = None
+        run.save()
+        self.assertEqual(
+            list(run.run_players.values_list("seat", "player_id")),
+            [(1, "p1"), (4, "p3")],
+        )
+
+        # A player moved up from a later seat gives it up.
+        run.player2_id = "p3"
+        run.save()
+        self.assertEqual(
+            list(run.run_players.values_list("seat", "player_id")),
+            [(1, "p1"), (2, "p3")],
+        )
+
+        # Every seat keeps the date of the run, for `player_history`.
+        run.set_extra_players(["p1", "p3", "p2"])
+        run.date = timezone.now()
+        run.save()
+        self.assertEqual(
+            set(run.run_players.values_list("date", flat=True)), {run.date}
+        )
+
+    def test_counted_seats(self):
+        # Outside of co-op boards, only `player` earns IL points (and `player2` full-game ones).
+        for run_id, runtype, points in [("n1", "main", 100), ("n2", "il", 50)]:
+            Runs.objects.create(
+                id=run_id,
+                runtype=runtype,
+                game=self.game,
+                category=self.category,
+                subcategory="Any%",
+                player_id="p1",
+                player2_id="p2",
+                place=1,
+                points=points,
+                url="https://speedrun.com/",
+            )
+
+        points = player_points(Runs.objects.filter(id__in=["n1", "n2"]))
+        self.assertEqual(
+            {
+                player.id: (player.main_points, player.il_points)
+                for player in points.filter(id__in=["p1", "p2"])
+            },
+            {"p1": (100, 50), "p2": (100, 0)},
+        )
+
+        stats = PlayerSerializer(Players.objects.get(id="p2")).data["stats"]
+        self.assertEqual(
+            (stats["main_pts"], stats["il_pts"], stats["total_runs"]), (100, 0, 2)
+        )
+
+        self.assertEqual(RunSerializer().get_players(Runs.objects.get(id="n2")), "p1")
+        players = RunSerializer(context={"embed": ["players"]}).get_players(
+            Runs.objects.get(id="n1")
+        )
+        self.assertEqual([player["id"] for player in players], ["p1", "p2"])
+
+    def test_run_scopes(self):
+        scopes = [player_scope(player) for player in ["p1", "p2", "p3"]]
+        versions = get_versions(scopes)
+
+        # Saves that keep the players leave the seats alone.
+        run = Runs.objects.get(id="r2")
+        run.url = "https://speedrun.com/r2"
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(2):
+                run.save()
+
+        self.assertEqual(
+            [old == new for old, new in zip(versions, get_versions(scopes))],
+            [True, False, True],
+        )
+
+        # Runs changed in bulk invalidate their players too.
+        versions = get_versions(scopes)
+        with self.captureOnCommitCallbacks(execute=True):
+            remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+
+        self.assertEqual(
+            [old == new for old, new in zip(versions, get_versions(scopes))],
+            [False, True, True],
+        )
+
+        versions = get_versions(scopes)
+        with self.captureOnCommitCallbacks(execute=True):
+            update_points(self.board.id)
+
+        self.assertEqual(
+            [old == new for old, new in zip(versions, get_versions(scopes))],
+            [False, False, False],
+        )
+
+    def test_run_serializer_batch(self):
+        update_points(self.board.id)
+        RunVariableValues.objects.create(
+            run_id="r2", variable=self.variable, value=self.value
+        )
+        context = {"embed": ["game", "players", "variables", "record"]}
+
+        single = [
+            RunSerializer(run, context=context).data
+            for run in Runs.objects.order_by("id")
+        ]
+        with self.assertNumQueries(8):
+            batch = RunSerializer(
+                Runs.objects.order_by("id"), many=True, context=context
+            ).data
+
+        self.assertEqual(batch, single)
+        self.assertEqual(list(context), ["embed"])
+        self.assertEqual(batch[1]["variables"]["diff"]["values"]["value"], "beg")
+        self.assertEqual(batch[0]["record"]["id"], "r1")
+
+    def test_leaderboard(self):
+        remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+        update_points(self.board.id)
+        points = points_formula(100.0, 110.0, 1000)
+
+        with self.assertNumQueries(1):
+            leaderboard = list(
+                player_points(ranked_runs())
+                .order_by("-total_points", "name")
+                .values_list("name", "total_points")
+            )
+        self.assertEqual(leaderboard, [("p1", 1000), ("p2", points), ("p3", points)])
+
+        update_standings()
+        response = Client().get("/overall")
+        self.assertEqual(
+            [
+                (entry["player"], entry["total_points"], entry["rank"])
+                for entry in response.context["leaderboard"]
+            ],
+            [("p1", 1000, 1), ("p2", points, 2), ("p3", points, 3)],
+        )
+
+    def test_standings(self):
+        Players.objects.create(id="p4", name="p4", url="https://speedrun.com/")
+        remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+        update_points(self.board.id)
+        update_standings()
+
+        player = Players.objects.get(id="p1")
+        with self.assertNumQueries(2):
+            self.assertEqual(get_player_rank(player), (1, 3))
+
+        self.assertEqual(get_player_rank(Players.objects.get(id="p3")), (3, 3))
+        self.assertEqual(get_player_rank(Players.objects.get(id="p4")), (0, 3))
+        self.assertEqual(get_player_rank(player, "il"), (0, 0))
+        self.assertEqual(
+            [(entry["player"], entry["rank"]) for entry in search_standings("P", 2)],
+            [("p1", 1), ("p2", 2)],
+        )
+
+    def test_standings_lock(self):
+        update_points(self.board.id)
+
+        # A rebuild queued while another one runs is queued again instead.
+        cache.add(STANDINGS_LOCK, True)
+        update_standings()
+        self.assertFalse(Standings.objects.exists())
+        update_standings.apply_async.assert_called_once()
+
+        cache.delete(STANDINGS_LOCK)
+        update_standings()
+        self.assertTrue(Standings.objects.exists())
+        self.assertIsNone(cache.get(STANDINGS_LOCK))
+
+    def test_standings_scopes(self):
+        remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+        update_points(self.board.id)
+        update_standings()
+
+        scopes = [player_scope(player) for player in ["p1", "p2", "p3"]]
+        versions = get_versions(scopes)
+        update_standings()
+        self.assertEqual(get_versions(scopes), versions)
+
+        # p3 overtakes p2, so only their overall standings change.
+        Runs.objects.filter(id="r3").update(points=F("points") + 1)
+        update_standings()
+        self.assertEqual(
+            [old == new for old, new in zip(versions, get_versions(scopes))],
+            [True, False, False],
+        )
+
+    def test_country_standings(self):
+        for countrycode, name in [("us", "United States"), ("ca", "Canada")]:
+            CountryCodes.objects.create(id=countrycode, name=name)
+        Players.objects.filter(id__in=["p1", "p2"]).update(countrycode="us")
+        Players.objects.filter(id="p3").update(countrycode="ca")
+        remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+        update_points(self.board.id)
+        update_standings()
+
+        points = points_formula(100.0, 110.0, 1000)
+        with self.assertNumQueries(2):
+            countries = country_standings(members=1)
+
+        self.assertEqual(
+            [
+                (country["countrycode"], country["total_points"], country["players"])
+                for country in countries
+            ],
+            [("us", 1000 + points, 2), ("ca", points, 1)],
+        )
+        self.assertEqual(
+            [[item["player"] for item in country["members"]] for country in countries],
+            [["p1"], ["p3"]],
+        )
+        self.assertEqual(
+            Standings.objects.get(runtype="main", player_id="p2").country_rank, 2
+        )
+
+        # Unchanged countries are left alone; countries that swap ranks are rewritten.
+        main = CountryStandings.objects.filter(runtype="main")
+        rows = dict(main.values_list("countrycode_id", "id"))
+        update_standings()
+        self.assertEqual(dict(main.values_list("countrycode_id", "id")), rows)
+
+        Runs.objects.filter(id="r3").update(points=5000)
+        update_standings()
+        self.assertEqual(
+            list(main.order_by("rank").values_list("countrycode_id", "points")),
+            [("ca", 5000), ("us", 1000 + points)],
+        )
+
+    def test_leaderboards_api(self):
+        _, key = APIKey.objects.create_key(name="tests")
+        client = Client(headers={"Authorization": f"Api-Key {key}"})
+        remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+        update_points(self.board.id)
+        update_standings()
+
+        response = client.get("/api/leaderboards/fullgame?limit=2&fields=rank,player")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "count": 3,
+                "next": 2,
+                "results": [{"rank": 1, "player": "p1"}, {"rank": 2, "player": "p2"}],
+            },
+        )
+
+        response = client.get(
+            "/api/leaderboards/fullgame?limit=2&fields=rank,player",
+            headers={"If-None-Match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+        response = client.get("/api/leaderboards/fullgame?cursor=2")
+        self.assertEqual(response.json()["next"], None)
+        self.assertEqual(response.json()["results"][0]["player"], "p3")
+
+        self.assertEqual(client.get("/api/leaderboards/il").status_code, 400)
+        self.assertEqual(client.get("/api/leaderboards/il/thug1").json()["count"], 0)
+        self.assertEqual(client.get("/api/leaderboards/il/thug9").status_code, 404)
+
+    def test_standings_paginator(self):
+        remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+        update_points(self.board.id)
+        update_standings()
+
+        paginator = StandingsPaginator("main", per_page=2)
+        with self.assertNumQueries(2):
+            page = paginator.get_page(2)
+            self.assertEqual(
+                [(entry["player"], entry["rank"]) for entry in page], [("p3", 3)]
+            )
+
+        self.assertEqual(paginator.num_pages, 2)
+        self.assertEqual(page.start_index(), 3)
+        self.assertFalse(page.has_next())
+
+    def test_board_runs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+            update_points(self.board.id)
+        update_standings()
+
+        with self.assertNumQueries(0):
+            subcategories, runs = board_runs(self.game.id, "main")
+
+        self.assertEqual(subcategories, ["Any%"])
+        self.assertEqual(
+            [(run["player"], run["place"], run["defaulttime"]) for run in runs],
+            [("p1", 1, "realtime"), ("p2", 2, "realtime"), ("p3", 2, "realtime")],
+        )
+        self.assertEqual(board_runs(self.game.id, "il"), ([], []))
+        self.assertEqual(board_runs(self.game.id, "main", "100%"), (["Any%"], []))
+
+        # Refreshing a board of the game rebuilds its payload with a single query.
+        with self.captureOnCommitCallbacks(execute=True):
+            Runs.objects.filter(id="r3").update(time_secs=90.0)
+            update_points(self.board.id)
+
+        with self.assertNumQueries(1):
+            subcategories, runs = board_runs(self.game.id, "main", "Any%")
+        self.assertEqual([run["player"] for run in runs], ["p3", "p1", "p2"])
+
+    def test_player_summary(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+            update_points(self.board.id)
+        update_standings()
+
+        self.assertEqual(
+            player_summary("p1"),
+            {"total_runs": 2, "player_rank": 1, "player_count": 3},
+        )
+        player_summary("p2")
+        with self.assertNumQueries(0):
+            player_summary("p1")
+
+        # A new run only invalidates the summary of its own players.
+        with self.captureOnCommitCallbacks(execute=True):
+            Runs.objects.create(
+                id="r5",
+                runtype="main",
+                game=self.game,
+                category=self.category,
+                subcategory="Any%",
+                board=self.board,
+                player_id="p1",
+                player2_id="p3",
+                place=0,
+                url="https://speedrun.com/",
+                time_secs=130.0,
+                timenl_secs=0.0,
+                timeigt_secs=0.0,
+            )
+
+        with self.assertNumQueries(0):
+            player_summary("p2")
+        self.assertEqual(player_summary("p1")["total_runs"], 3)
+        self.assertEqual(player_summary("p3")["total_runs"], 2)
+
+        response = Client().get("/player/p1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["total_runs"], 3)
+        self.assertEqual(response.context["player_rank"], 1)
+
+    def test_player_history(self):
+        remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+        update_points(self.board.id)
+
+        with patch("srl.complex_views.HISTORY_PAGE_SIZE", 1):
+            response = Client().get("/player/p1/history?type=fullgame&page=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["history_page"].paginator.num_pages, 2)
+        self.assertEqual([run.id for run in response.context["main_runs"]], ["r1"])
+        self.assertEqual(response.context["history_games"][0][1], "thug1")
+
+        response = Client().get("/player/p1/history?type=il")
+        self.assertEqual(response.context["main_runs"], [])
+
+        response = Client().get("/player/p1/history/json?game=thug1")
+        runs = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([run["id"] for run in runs], ["r4", "r1"])
+        self.assertTrue(runs[0]["obsolete"])
+
+        self.assertEqual(Client().get("/player/nobody/history/json").status_code, 404)
+
+        etag = response["ETag"]
+        with self.assertNumQueries(0):
+            response = Client().get(
+                "/player/p1/history/json?game=thug1", headers={"If-None-Match": etag}
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_page_cache(self):
+        update_points(self.board.id)
+        update_standings()
+        client = Client()
+
+        response = client.get("/thug1/")
+        self.assertEqual(response["Surrogate-Key"], "game:brdgame players")
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get("/thug1/").content, response.content)
+
+        # A rebuild that leaves the game's standings unchanged keeps its pages cached.
+        update_standings()
+        with self.assertNumQueries(0):
+            client.get("/thug1/")
+
+        # Renaming a player purges the game pages that show them; saving them unchanged does not.
+        player = Players.objects.get(id="p1")
+        with self.captureOnCommitCallbacks(execute=True):
+            player.save()
+        with self.assertNumQueries(0):
+            client.get("/thug1/")
+
+        player.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            player.save()
+        self.assertContains(client.get("/thug1/"), "Renamed")
+
+        # Only the pages of the players of a deleted run are purged.
+        client.get("/player/p2")
+        client.get("/player/p3")
+        with self.captureOnCommitCallbacks(execute=True):
+            Runs.objects.get(id="r2").delete()
+
+        with self.assertNumQueries(0):
+            client.get("/player/p3")
+        self.assertEqual(client.get("/player/p2").context["total_runs"], 0)
+
+    def test_conditional_get(self):
+        client = Client()
+        etag = client.get("/thug1/")["ETag"]
+
+        with self.assertNumQueries(0):
+            response = client.get("/thug1/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        # Versions restart from a fresh token after a cache flush, so old ETags never match.
+        cache.clear()
+        response = client.get("/thug1/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        _, key = APIKey.objects.create_key(name="tests")
+        api = Client(headers={"Authorization": f"Api-Key {key}"})
+        etag = api.get("/api/players/p2")["ETag"]
+        self.assertEqual(
+            api.get("/api/players/p2", headers={"If-None-Match": etag}).status_code, 304
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Runs.objects.get(id="r2").delete()
+        self.assertEqual(
+            api.get("/api/players/p2", headers={"If-None-Match": etag}).status_code, 200
+        )
+
+    def test_featured_records(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            FeaturedBoards.objects.create(board=self.board)
+            Runs.objects.filter(id="r2").update(time_secs=100.0)
+            remove_obsolete(self.board.id, [{"rel": "user", "id": "p1"}])
+            update_points(self.board.id)
+
+        with self.assertNumQueries(1):
+            records = featured_records()
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["game"]["slug"], "thug1")
+        self.assertEqual(
+            [player["player"]["name"] for player in records[0]["players"]],
+            ["p1", "p2"],
+        )
+
+    def test_il_board(self):
+        category = Categories.objects.create(
+            id="ilcat",
+            game=self.game,
+            name="Score",
+            type="per-level",
+            url="https://speedrun.com/thug1",
+        )
+        for level_id, player_id in [("lvl1", "p1"), ("lvl2", "p2"), ("lvl2", "p3")]:
+            Runs.objects.create(
+                id=f"il_{level_id}_{player_id}",
+                runtype="il",
+                game=self.game,
+                category=category,
+                subcategory=level_id,
+                player_id=player_id,
+                place=1,
+                points=100,
+                url="https://speedrun.com/",
+            )
+
+        response = self.client.get("/thug1/ils")
+        self.assertEqual(response.context["subcategories"], ["lvl1", "lvl2"])
+        self.assertEqual([run["player"] for run in response.context["runs"]], ["p1"])
+
+        response = self.client.get("/thug1/ils", {"subcategory": "lvl2"})
+        self.assertEqual(response.context["selected_subcategory"], "lvl2")
+
+        response = self.client.get("/thug1/ils/board", {"subcategory": "lvl2"})
+        self.assertEqual(
+            [run["player"] for run in response.json()["runs"]], ["p2", "p3"]
+        )
+        self.assertEqual(
+            self.client.get("/thug9/ils/board", {"subcategory": "lvl2"}).status_code,
+            404,
+        )
+
+    def test_record_panels(self):
+        Games.objects.filter(id=self.game.id).update(il_records=True)
+        category = Categories.objects.create(
+            id="ilcat",
+            game=self.game,
+            name="Score",
+            type="per-level",
+            url="https://speedrun.com/thug1",
+        )
+        for level_id, exempt, days in [
+            ("lvl1", False, 10),
+            ("lvl2", True, 30),
+            ("lvl3", False, 20),
+        ]:
+            level = Levels.objects.create(
+                id=level_id,
+                game=self.game,
+                name=level_id,
+                url="https://speedrun.com/",
+                records_exempt=exempt,
+            )
+            Runs.objects.create(
+                id=f"il_{level_id}",
+                runtype="il",
+                game=self.game,
+                category=category,
+                level=level,
+                subcategory=level_id,
+                player_id="p2",
+                place=1,
+                points=100,
+                url="https://speedrun.com/",
+                date=timezone.now() - datetime.timedelta(days=days),
+            )
+
+        update_standings()
+
+        il_wr_counts, il_runs_old = record_panels(self.game.id)
+        self.assertEqual(
+            [(entry["player"], entry["il_wrs"]) for entry in il_wr_counts],
+            [("p2", 3)],
+        )
+        self.assertEqual(
+            [subcategory for subcategory, _, _ in il_runs_old], ["lvl3", "lvl1"]
+        )
+
+
+class ExplainTestCase(LocalTestCase):
+    """Makes sure the hot queries of the website use the indexes that were added for them.
+
+    Every query issued by a view, serializer, or task is captured and explained, so the plans
+    follow the production querysets as they change.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        players = Players.objects.bulk_create(
+            Players(id=f"p{i}", name=f"player{i}", url="https://speedrun.com/")
+            for i in range(200)
+        )
+
+        runs = []
+        for g in range(5):
+            game = Games.objects.create(
+                id=f"g{g}",
+                name=f"Tony Hank's Pro Skater {g}",
+                slug=f"thps{g}",
+                release="1999-09-29",
+                boxart="https://speedrun.com/",
+            )
+            category = Categories.objects.create(
+                id=f"c{g}",
+                game=game,
+                name="Any%",
+                type="per-game",
+                url="https://speedrun.com/",
+            )
+
+            for b in range(10):
+                runtype = "main" if b < 2 else "il"
+                board = Boards.objects.create(
+                    runtype=runtype,
+                    game=game,
+                    category=category,
+                    values_key=str(b),
+                    subcategory=f"Any% ({b})",
+                )
+
+                for place in range(1, 101):
+                    runs.append(
+                        Runs(
+                            id=f"r{g}-{b}-{place}",
+                            runtype=runtype,
+                            game=game,
+                            category=category,
+                            subcategory=board.subcategory,
+                            board=board,
+                            player=players[(place * 7 + b) % len(players)],
+                            place=place,
+                            url="https://speedrun.com/",
+                            date=now
+                            - datetime.timedelta(hours=place * b + g, minutes=1),
+                            v_date=now - datetime.timedelta(hours=place * b + g),
+                            time_secs=60.0 + place,
+                            points=1000 - place,
+                            vid_status="new" if place % 50 == 0 else "verified",
+                            obsolete=place % 10 == 0,
+                        )
+                    )
+
+        Runs.objects.bulk_create(runs)
+        RunPlayers.objects.bulk_create(
+            RunPlayers(run=run, player=run.player, seat=1, date=run.date)
+            for run in runs
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE srl_runs, srl_runplayers")
+
+    def setUp(self):
+        super().setUp()
+        _, key = APIKey.objects.create_key(name="tests")
+        self.api = Client(headers={"Authorization": f"Api-Key {key}"})
+
+    def plans(self, func, *args) -> str:
+        """Calls `func` and returns the query plan of every `SELECT` it issued, as one string."""
+        with CaptureQueriesContext(connection) as queries:
+            func(*args)
+
+        plans = []
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            for query in queries.captured_queries:
+                sql = query["sql"]
+                # Server-side cursors (`iterator()`) are declared for the query.
+                if sql.startswith("DECLARE"):
+                    sql = sql[sql.index(" FOR SELECT") + len(" FOR ") :]
+
+                if sql.startswith("SELECT"):
+                    cursor.execute(f"EXPLAIN {sql}")
+                    plans.extend(row[0] for row in cursor.fetchall())
+
+        return "\n".join(plans)
+
+    def assertUsesIndex(self, index, func, *args):
+        plan = self.plans(func, *args)
+        self.assertIn(index, plan)
+        self.assertNotIn("Seq Scan on srl_runs ", plan)
+
+    def test_player_search(self):
+        update_standings()
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE srl_players, srl_standings")
+
+        plan = self.plans(search_standings, "player12")
+        self.assertIn("srl_players_name_search_idx", plan)
+        self.assertNotIn("Seq Scan", plan)
+
+    def test_game_leaderboard(self):
+        # Nearly every run of a game is read, so the index of the `game` foreign key is enough.
+        self.assertUsesIndex("srl_runs_game_id_", board_payloads, "g1")
+
+    def test_board(self):
+        board = Boards.objects.filter(game_id="g2").first()
+        self.assertUsesIndex("srl_runs_board_place_idx", update_points, board.id)
+        self.assertUsesIndex("srl_runs_board_place_idx", board.refresh)
+
+    def test_main_page(self):
+        FeaturedBoards.objects.bulk_create(
+            FeaturedBoards(board=board)
+            for board in Boards.objects.filter(runtype="main", game_id="g1")
+        )
+        self.assertUsesIndex("srl_runs_board_place_idx", featured_records)
+
+        plan = self.plans(Client().get, "/")
+        self.assertIn("srl_runs_new_wrs_idx", plan)
+        self.assertIn("srl_runs_new_pbs_idx", plan)
+        self.assertNotIn("Seq Scan on srl_runs ", plan)
+
+    def test_player_runs(self):
+        self.assertUsesIndex(
+            "srl_runplayers_player_idx", self.api.get, "/api/players/p3/pbs"
+        )
+        self.assertUsesIndex("srl_runplayers_player_idx", player_summary, "p3")
+        self.assertUsesIndex(
+            "srl_runplayers_player_idx", Client().get, "/player/player3"
+        )
+
+        # Sorting the few runs of these players is cheaper, but the history of a player with
+        # thousands of runs has to be read in order from the index.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_sort = off")
+
+        for args in [["p3"], ["p3", "g1", "main"]]:
+            plan = self.plans(lambda: list(player_history(*args)[:100]))
+            self.assertIn("Scan using srl_runplayers_player_idx", plan)
+            self.assertNotIn("Sort Key", plan)
+            self.assertNotIn("Seq Scan on srl_runs ", plan)
+
+    def test_unverified_runs(self):
+        self.assertUsesIndex(
+            "srl_runs_unverified_idx", self.api.get, "/api/runs/all?query=status"
+        )
@@ -1,8 +1,11 @@
 import os
 
 import environ
+from srl.cache import snapshot
 from srl.models import Games
 
+from website.template_backend import allow_queries
+
 env = environ.Env()
 environ.Env.read_env()
 
@@ -30,22 +33,34 @@ def global_social_media(request):
 
 
 def navbar_docs(request):
-    """If the `/srlc/docs/` directory is used, renders guides list to the navbar."""
+    """If the `/srlc/docs/` directory is used, renders guides list to the navbar.
+
+    The list is cached until a game is changed or a game folder is added to or removed from the
+    docs (which changes the modification time of the directory), so rendering a page does not
+    query the games.
+    """
     base_docs_path = "/srlc/docs/"
-    navbar_docs = []
-    game_list = Games.objects.only("name", "slug", "release").all().order_by("release")
 
     if not os.path.exists(base_docs_path):
         return {"navbar_docs": []}
 
-    for game in game_list:
-        if game.slug in (os.listdir(base_docs_path)):
-            full_game_path = os.path.join(base_docs_path, game.slug)
-            if os.path.isdir(full_game_path):
-                navbar_docs.append(
-                    {
-                        "game": game.slug,
-                    }
-                )
-
-    return {"navbar_docs": navbar_docs}
+    def build() -> list[dict[str, str]]:
+        navbar_docs = []
+        game_list = Games.objects.only("name", "slug", "release").order_by("release")
+        doc_folders = os.listdir(base_docs_path)
+
+        for game in game_list:
+            if game.slug in doc_folders:
+                full_game_path = os.path.join(base_docs_path, game.slug)
+                if os.path.isdir(full_game_path):
+                    navbar_docs.append(
+                        {
+                            "game": game.slug,
+                        }
+                    )
+
+        return navbar_docs
+
+    name = f"navbar_docs:{os.stat(base_docs_path).st_mtime_ns}"
+
+    return {"navbar_docs": snapshot(name, ["games"], allow_queries(build))}
@@ -0,0 +1,96 @@
+import logging
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable
+
+from django.db import connection
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+logger = logging.getLogger(__name__)
+
+# Name of the template being rendered, or None when no template is being rendered.
+rendering: ContextVar[str | None] = ContextVar("rendering", default=None)
+# Set while a section that is expected to query (see `allow_queries`) is being built.
+queries_allowed: ContextVar[bool] = ContextVar("queries_allowed", default=False)
+
+
+def allow_queries(
+    func: Callable[[], Any],
+) -> Callable[[], Any]:
+    """Marks a callable passed to a template as allowed to query the database.
+
+    Used for sections that are only built when their cached fragment is missing (e.g. the sections
+    of the main page); every other query issued while a template renders is flagged.
+
+    Args:
+        func (Callable): Builds the data of the section when the template calls it.
+
+    Returns:
+        Callable: `func`, which no longer gets flagged by the render guard.
+    """
+
+    @wraps(func)
+    def wrapper() -> Any:
+        token = queries_allowed.set(True)
+        try:
+            return func()
+        finally:
+            queries_allowed.reset(token)
+
+    return wrapper
+
+
+def render_guard(
+    execute: Callable,
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict,
+) -> Any:
+    """Flags a query issued while a template renders (e.g. from a filter or a lazy relation)."""
+    if not queries_allowed.get():
+        logger.warning("Query issued while rendering %s: %s", rendering.get(), sql)
+
+    return execute(sql, params, many, context)
+
+
+class GuardedTemplate(Template):
+    def render(
+        self,
+        context: dict = None,
+        request=None,
+    ) -> str:
+        """Renders the template while flagging every database query issued by it."""
+        if rendering.get() is not None:
+            return super().render(context, request)
+
+        token = rendering.set(self.origin.template_name)
+        try:
+            with connection.execute_wrapper(render_guard):
+                return super().render(context, request)
+        finally:
+            rendering.reset(token)
+
+
+class GuardedDjangoTemplates(DjangoTemplates):
+    """Django template backend whose templates flag any query issued while they render.
+
+    Templates should only read the data handed to them by the view; queries issued from filters,
+    context processors, or lazy relations are logged as warnings along with their SQL.
+    """
+
+    def from_string(
+        self,
+        template_code: str,
+    ) -> GuardedTemplate:
+        return GuardedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(
+        self,
+        template_name: str,
+    ) -> GuardedTemplate:
+        try:
+            return GuardedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)